@@ -1,161 +1,48 @@
-import re
-from sqlalchemy import create_engine, MetaData, Table, select, update
-from sqlalchemy.dialects.mysql import insert
-
+import argparse
+import functools
 import os
+import queue
 import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import column, create_engine, func, select, table, text
+from sqlalchemy.dialects.mysql import insert
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(project_root)
 from backend.config.config import Config
+from backend.models.language_local_model import LanguageLocale
+from backend.models.language_strings_model import LanguageString, NON_FLAG_COLUMNS
+from backend.models.sync_version_model import SyncVersion
+from backend.utils.po_catalog import IncrementalPOCatalog, entry_key
+from backend.utils.po_file import POEntry, read_po, write_po
 
 from datetime import datetime
 
-# def safe_unescape(s):
-#     """Safely unescape string while handling empty strings and special cases"""
-#     if not s:
-#         return s
-        
-#     try:
-#         # Handle escaped characters
-#         return s.encode('utf-8').decode('unicode_escape')
-#     except UnicodeDecodeError:
-#         # Fallback for problematic escape sequences
-#         return s.replace('\\', '\\\\')
-
-# def parse_po_content(po_content):
-#     """Parse PO content and extract msgid/msgstr pairs"""
-#     entries = []
-#     # Improved regex to handle multi-line strings and various quoting styles
-#     pattern = re.compile(
-#         r'msgid\s+(?:"(.*?)"|\'(.*?)\')\s+msgstr\s+(?:"(.*?)"|\'(.*?)\')',
-#         re.DOTALL
-#     )
-    
-#     for match in pattern.finditer(po_content):
-#         # Extract msgid from either double or single quoted group
-#         msgid = match.group(1) or match.group(2) or ""
-#         # Extract msgstr from either double or single quoted group
-#         msgstr = match.group(3) or match.group(4) or ""
-        
-#         # Unescape special characters safely
-#         msgid = safe_unescape(msgid)
-#         msgstr = safe_unescape(msgstr)
-        
-#         # Skip header entry (empty msgid)
-#         if not msgid:
-#             continue
-            
-#         # Truncate msgid if too long
-#         if len(msgid) > 512:
-#             msgid = msgid[:512]
-            
-#         entries.append((msgid, msgstr))
-    
-#     return entries
-
-def safe_unescape(s):
-    """Return the string as-is without unescaping"""
-    return s
-
-# def parse_po_content(po_content):
-#     """Parse PO content and extract msgid/msgstr pairs"""
-#     entries = []
-#     pattern = re.compile(
-#         r'msgid\s+(?:"(.*?)"|\'(.*?)\')\s+msgstr\s+(?:"(.*?)"|\'(.*?)\')',
-#         re.DOTALL
-#     )
-    
-#     for match in pattern.finditer(po_content):
-#         msgid = match.group(1) or match.group(2) or ""
-#         msgstr = match.group(3) or match.group(4) or ""
-        
-#         # Use the raw captured strings without unescaping
-#         msgid = safe_unescape(msgid)
-#         msgstr = safe_unescape(msgstr)
-        
-#         if not msgid:
-#             continue
-            
-#         if len(msgid) > 512:
-#             msgid = msgid[:512]
-            
-#         entries.append((msgid, msgstr))
-    
-#     return entries
-
-
-def parse_po_content(po_content):
-    """Parse PO content handling multi-line strings and empty entries correctly"""
-    entries = []
-    raw_entries = [e.strip() for e in po_content.split('\n\n') if e.strip()]
-    
-    for entry in raw_entries:
-        lines = entry.splitlines()
-        msgid_parts = []
-        msgstr_parts = []
-        state = None  
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-                
-            if stripped.startswith('msgid '):
-                state = 'msgid'
-                content = stripped[6:].strip()
-                if len(content) > 1 and content[0] == '"' and content[-1] == '"':
-                    msgid_parts.append(content[1:-1])
-            
-            elif stripped.startswith('msgstr '):
-                state = 'msgstr'
-                content = stripped[7:].strip()
-                if len(content) > 1 and content[0] == '"' and content[-1] == '"':
-                    msgstr_parts.append(content[1:-1])
-            
-            elif state and (stripped.startswith('"') or stripped.startswith("'")):
-                if len(stripped) > 1 and stripped[-1] == stripped[0]:
-                    content = stripped[1:-1]
-                    if state == 'msgid':
-                        msgid_parts.append(content)
-                    else:
-                        msgstr_parts.append(content)
-        
-        msgid_str = ''.join(msgid_parts)
-        msgstr_str = ''.join(msgstr_parts)
-        
-        if not msgid_str:
-            continue
-            
-        if len(msgid_str) > 512:
-            msgid_str = msgid_str[:512]
-            
-        entries.append((msgid_str, msgstr_str))
-    
-    return entries
-
-
-def process_po_entries(entries):
-    """Identify duplicates and separate unique entries"""
-    seen = {}
-    unique_entries = []
-    duplicates = []
-    duplicate_count = 0
-    
-    for idx, (msgid, msgstr) in enumerate(entries):
-        if msgid in seen:
-            duplicates.append({
-                "original_index": seen[msgid],
-                "duplicate_index": idx + 1,
-                "msgid": msgid,
-                "msgstr": msgstr
-            })
-            duplicate_count += 1
-        else:
-            seen[msgid] = idx + 1
-            unique_entries.append((msgid, msgstr))
-    
-    return unique_entries, duplicates, duplicate_count
+# Rows per multi-row INSERT; keeps statements well below max_allowed_packet
+DEFAULT_CHUNK_SIZE = 1000
+# Parsed chunks buffered between the parser thread and the writer
+QUEUE_DEPTH = 8
+MSGID_MAX_LENGTH = 512
+LOCALES_DIR = os.path.join(project_root, 'backend', Config.LOCALES_DIR)
+language_strings = LanguageString.__table__
+
+
+def _importable(entry: POEntry) -> bool:
+    # Skip the header, obsolete entries and context-qualified duplicates of a msgid
+    return bool(entry.msgid) and not entry.obsolete and entry.msgctxt is None
+
+
+def _translation(entry: POEntry) -> str:
+    """The entry's usable translation, or "" for untranslated and fuzzy entries"""
+    if entry.fuzzy or entry.msgid_plural is not None:
+        return ""
+    return entry.msgstr
+
 
 def write_duplicates_report(duplicates, filename):
     """Write duplicates information to a text file"""
@@ -185,99 +72,330 @@ def write_summary_report(total_records, unique_count, duplicate_count, filename)
         f.write("NOTE: Only the first occurrence of each msgid was inserted into the database.\n")
         f.write("Duplicates were skipped but preserved in a separate report file.\n")
 
-def upsert_language_strings(entries):
-    """Upsert entries into database using SQLAlchemy"""
-    # Create database engine from config
-    engine = create_engine(
-        Config.SQLALCHEMY_DATABASE_URL,
-        pool_pre_ping=True,
-        connect_args={
-            "charset": "utf8mb4",
-            "collation": "utf8mb4_general_ci"
-        }
-    )
-    
-    metadata = MetaData()
-    # Reflect language_strings table structure
-    language_strings = Table(
-        'language_strings',
-        metadata,
-        autoload_with=engine
-    )
-    
-    with engine.connect() as connection:
-        # Start transaction
-        trans = connection.begin()
+
+@dataclass
+class ImportStats:
+    total: int = 0
+    unique: int = 0
+    translated: int = 0
+    written: int = 0
+    duplicates: List[dict] = field(default_factory=list)
+    header: Optional[POEntry] = None
+
+
+def iter_unique_chunks(paths: Sequence[str], chunk_size: int, stats: ImportStats) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Stream (msgid, translation) chunks from the PO files, keeping the first
+    occurrence of every msgid across all of them. translation is "" for
+    untranslated and fuzzy entries.
+    """
+    seen: Dict[str, int] = {}
+    chunk = []
+    for path in paths:
+        for entry in read_po(path):
+            if entry.is_header and stats.header is None:
+                stats.header = entry
+            if not _importable(entry):
+                continue
+            stats.total += 1
+            msgid = entry.msgid[:MSGID_MAX_LENGTH]
+            if msgid in seen:
+                stats.duplicates.append({
+                    "original_index": seen[msgid],
+                    "duplicate_index": stats.total,
+                    "msgid": msgid,
+                    "msgstr": entry.msgstr
+                })
+                continue
+            seen[msgid] = stats.total
+            translation = _translation(entry)
+            stats.unique += 1
+            stats.translated += bool(translation)
+            chunk.append((msgid, translation))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_in_background(chunks: Iterable[List[Tuple[str, str]]]) -> Iterator[List[Tuple[str, str]]]:
+    """Run the parser in a thread so the next chunks are parsed while one is being written"""
+    buffer: queue.Queue = queue.Queue(maxsize=QUEUE_DEPTH)
+    done = object()
+    errors = []
+    cancelled = threading.Event()
+
+    def produce():
         try:
-            for msgid, msgstr in entries:
-                # Create upsert statement
-                stmt = insert(language_strings).values(
-                    msgid=msgid,
-                    msgstr=msgid
-                )
-                
-                # Update on duplicate key
-                update_stmt = stmt.on_duplicate_key_update(
-                    msgid=stmt.inserted.msgid
-                )
-                
-                # Execute the statement
-                connection.execute(update_stmt)
-            
-            # Commit transaction
-            trans.commit()
-            print(f"Successfully processed {len(entries)} records")
-            
+            for chunk in chunks:
+                if cancelled.is_set():
+                    return
+                buffer.put(chunk)
         except Exception as e:
-            trans.rollback()
-            print(f"Database operation failed: {e}")
-            raise
+            errors.append(e)
+        finally:
+            buffer.put(done)
 
+    worker = threading.Thread(target=produce, name="po-parser", daemon=True)
+    worker.start()
+    try:
+        while True:
+            chunk = buffer.get()
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        # Unblock the producer if it is waiting on a full queue
+        while worker.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                worker.join(0.05)
+    if errors:
+        raise errors[0]
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(local_infile: bool = False):
+    """One engine per process; LOAD DATA LOCAL needs local_infile on the connection"""
+    connect_args = {
+        "charset": "utf8mb4",
+        "collation": "utf8mb4_general_ci"
+    }
+    if local_infile:
+        connect_args["local_infile"] = True
+    return create_engine(Config.SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+
+
+def _upsert_statement(rows: List[dict], lang_code: Optional[str] = None):
+    # A bare table keeps the statement to the columns we send; the model's
+    # Python-side defaults would add every language flag to every row
+    columns = [column("msgid"), column("msgstr")] + ([column(lang_code)] if lang_code else [])
+    target = table(language_strings.name, *columns)
+    stmt = insert(target).values(rows)
+    if lang_code is None:
+        return stmt.on_duplicate_key_update(msgid=stmt.inserted.msgid)
+    # Never clear a flag that is already set
+    return stmt.on_duplicate_key_update({lang_code: func.greatest(target.c[lang_code], stmt.inserted[lang_code])})
+
+
+def upsert_language_strings(entries, chunk_size=DEFAULT_CHUNK_SIZE, lang_code=None, connection=None):
+    """
+    Upsert (msgid, msgstr) entries with one multi-row INSERT ... ON DUPLICATE
+    KEY UPDATE per chunk. With lang_code, entries with a msgstr also get
+    that language's flag set. Returns the number of entries sent.
+    """
+    if connection is None:
+        with get_engine().begin() as connection:
+            return upsert_language_strings(entries, chunk_size, lang_code, connection)
+
+    entries = list(entries)
+    for i in range(0, len(entries), chunk_size):
+        rows = [
+            {"msgid": msgid, "msgstr": msgid, **({lang_code: int(bool(msgstr))} if lang_code else {})}
+            for msgid, msgstr in entries[i:i + chunk_size]
+        ]
+        connection.execute(_upsert_statement(rows, lang_code))
+    return len(entries)
+
+
+def _tsv_field(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def load_data_language_strings(connection, tsv_path: str, lang_code: Optional[str] = None) -> int:
+    """
+    Bulk load a (msgid, translated) TSV file through a temporary staging table
+    with LOAD DATA LOCAL INFILE, then upsert from it in one statement.
+    The server must allow local_infile.
+    """
+    connection.execute(text(
+        "CREATE TEMPORARY TABLE language_strings_import ("
+        " msgid VARCHAR(512) COLLATE utf8mb4_bin NOT NULL,"
+        " translated TINYINT NOT NULL DEFAULT 0"
+        ") CHARACTER SET utf8mb4"
+    ))
+    try:
+        loaded = connection.execute(
+            text(
+                "LOAD DATA LOCAL INFILE :path INTO TABLE language_strings_import "
+                "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                "LINES TERMINATED BY '\\n' (msgid, translated)"
+            ),
+            {"path": tsv_path}
+        ).rowcount
+        if lang_code is None:
+            connection.execute(text(
+                "INSERT INTO language_strings (msgid, msgstr) "
+                "SELECT msgid, msgid FROM language_strings_import "
+                "ON DUPLICATE KEY UPDATE msgid = VALUES(msgid)"
+            ))
+        else:
+            # lang_code is validated against the model's columns by the caller
+            connection.execute(text(
+                f"INSERT INTO language_strings (msgid, msgstr, `{lang_code}`) "
+                f"SELECT msgid, msgid, translated FROM language_strings_import "
+                f"ON DUPLICATE KEY UPDATE `{lang_code}` = GREATEST(`{lang_code}`, VALUES(`{lang_code}`))"
+            ))
+    finally:
+        connection.execute(text("DROP TEMPORARY TABLE IF EXISTS language_strings_import"))
+    return loaded
+
+
+def import_catalog_translations(po_path: str, translations: Dict[str, str], header: Optional[POEntry]) -> Tuple[int, int]:
+    """
+    Write imported translations into a locale catalog: existing entries get
+    the new msgstr, the rest are appended. Returns (updated, appended).
+    """
+    if not os.path.exists(po_path):
+        os.makedirs(os.path.dirname(po_path), exist_ok=True)
+        with open(po_path, "w", encoding="utf-8") as f:
+            write_po(f, [header or POEntry(msgid="")])
+
+    catalog = IncrementalPOCatalog(po_path)
+    try:
+        pending = dict(translations)
+        updated = 0
+
+        def replace(entry: POEntry) -> POEntry:
+            nonlocal updated
+            if not entry.is_header and not entry.obsolete and entry.msgctxt is None:
+                msgstr = pending.pop(entry.msgid, None)
+                if msgstr is not None and msgstr != entry.msgstr:
+                    entry.msgstr = msgstr
+                    updated += 1
+            return entry
+
+        # The catalog is only rewritten when some of the msgids are already in it
+        if any(entry_key(msgid) in catalog.index for msgid in translations):
+            catalog.compact(replace)
+        appended = catalog.append(POEntry(msgid=msgid, msgstr=msgstr) for msgid, msgstr in pending.items())
+        return updated, appended
+    finally:
+        catalog.close()
+
+
+def reset_sync_version(connection, lang_code: str) -> Optional[int]:
+    """
+    Bump the locale's catalog version (see backend/controllers/change_log.py)
+    so that clients synced before the import fetch the whole catalog again.
+    Returns the new version, or None when the locale has no row.
+    """
+    locales = LanguageLocale.__table__
+    counters = SyncVersion.__table__
+    locale_id = connection.execute(select(locales.c.id).where(locales.c.language_code == lang_code)).scalar()
+    if locale_id is None:
+        return None
+    current = connection.execute(
+        select(counters.c.version).where(counters.c.locale_id == locale_id).with_for_update()
+    ).scalar()
+    version = (current or 0) + 1
+    if current is None:
+        connection.execute(counters.insert().values(
+            locale_id=locale_id, version=version, reset_version=version, catalog_version=version
+        ))
+    else:
+        connection.execute(
+            counters.update().where(counters.c.locale_id == locale_id)
+            .values(version=version, reset_version=version, catalog_version=version)
+        )
+    return version
+
+
+def import_po_files(
+    paths: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    load_data: bool = False,
+    lang_code: Optional[str] = None,
+    locales_dir: str = LOCALES_DIR
+) -> ImportStats:
+    """Parse the PO files in a background thread and write each chunk as it arrives"""
+    if lang_code is not None and (lang_code not in language_strings.c or lang_code in NON_FLAG_COLUMNS):
+        raise ValueError(f"Invalid language column: {lang_code}")
+
+    stats = ImportStats()
+    translations: Dict[str, str] = {}
+    chunks = parse_in_background(iter_unique_chunks(paths, chunk_size, stats))
+
+    def collect(chunk):
+        if lang_code is not None:
+            translations.update((msgid, msgstr) for msgid, msgstr in chunk if msgstr)
+
+    if dry_run:
+        for chunk in chunks:
+            collect(chunk)
+    elif load_data:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".tsv", delete=False) as tsv:
+            for chunk in chunks:
+                collect(chunk)
+                tsv.writelines(f"{_tsv_field(msgid)}\t{int(bool(msgstr))}\n" for msgid, msgstr in chunk)
+        try:
+            with get_engine(local_infile=True).begin() as connection:
+                stats.written = load_data_language_strings(connection, tsv.name, lang_code)
+        finally:
+            os.remove(tsv.name)
+    else:
+        with get_engine().begin() as connection:
+            for chunk in chunks:
+                collect(chunk)
+                stats.written += upsert_language_strings(chunk, chunk_size, lang_code, connection)
+
+    if lang_code is not None and not dry_run:
+        po_path = os.path.join(locales_dir, lang_code, "LC_MESSAGES", "salesplaypos.po")
+        updated, appended = import_catalog_translations(po_path, translations, stats.header)
+        print(f"{po_path}: {updated} translations updated, {appended} added")
+        if updated or appended:
+            with get_engine().begin() as connection:
+                version = reset_sync_version(connection, lang_code)
+            if version is not None:
+                print(f"{lang_code} catalog version is now {version}; synced clients will reload it")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import msgids (and optionally translations) from PO files.")
+    parser.add_argument("files", nargs="*", default=["salesplaypos.po"], help="PO files to import (default: salesplaypos.po)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per INSERT statement")
+    parser.add_argument("--dry-run", action="store_true", help="parse and report without touching the database")
+    parser.add_argument("--load-data", action="store_true", help="use LOAD DATA LOCAL INFILE (server must allow local_infile)")
+    parser.add_argument("--language", metavar="LANG_CODE", help="also import the translations into this locale, e.g. km_KH")
+    parser.add_argument("--locales-dir", default=LOCALES_DIR, help="locale catalogs updated by --language")
+    parser.add_argument("--report-dir", default="po_processing_reports", help="where the summary reports are written")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = import_po_files(args.files, args.chunk_size, args.dry_run, args.load_data, args.language, args.locales_dir)
+    elapsed = time.perf_counter() - started
 
-if __name__ == "__main__":
-    # Read PO file content
-    # po_file_path = '600/600.po' 
-    po_file_path ='salesplaypos.po'
-    with open(po_file_path, 'r', encoding='utf-8') as f:
-        po_content = f.read()
-    
-    # Parse PO content
-    all_entries = parse_po_content(po_content)
-    total_records = len(all_entries)
-    
-    # Process entries to identify duplicates
-    unique_entries, duplicates, duplicate_count = process_po_entries(all_entries)
-    unique_count = len(unique_entries)
-    
     # Generate report filenames with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_dir = "po_processing_reports"
-    os.makedirs(report_dir, exist_ok=True)
-    
-    duplicates_report = os.path.join(report_dir, f"duplicates_report_{timestamp}.txt")
-    summary_report = os.path.join(report_dir, f"processing_summary_{timestamp}.txt")
-    
-    # Write reports if duplicates found
+    os.makedirs(args.report_dir, exist_ok=True)
+    duplicates_report = os.path.join(args.report_dir, f"duplicates_report_{timestamp}.txt")
+    summary_report = os.path.join(args.report_dir, f"processing_summary_{timestamp}.txt")
+
+    duplicate_count = len(stats.duplicates)
     if duplicate_count > 0:
-        write_duplicates_report(duplicates, duplicates_report)
+        write_duplicates_report(stats.duplicates, duplicates_report)
         print(f"Found {duplicate_count} duplicates. Report saved to: {duplicates_report}")
-    
-    # Write summary report
-    write_summary_report(total_records, unique_count, duplicate_count, summary_report)
+    write_summary_report(stats.total, stats.unique, duplicate_count, summary_report)
     print(f"Processing summary saved to: {summary_report}")
-    
-    # Upsert unique entries to database
-    if unique_count > 0:
-        upsert_language_strings(unique_entries)
-    else:
-        print("No unique records to process")
 
     # Print final summary to console
     print("\nPROCESSING SUMMARY")
     print("==================")
-    print(f"Total records in PO file: {total_records}")
+    print(f"Total records in PO files: {stats.total}")
     print(f"Duplicate records found: {duplicate_count}")
-    print(f"Unique records processed: {unique_count}")
-    print(f"Records uploaded to database: {unique_count}")
+    print(f"Unique records processed: {stats.unique}")
+    if args.language:
+        print(f"Translated records: {stats.translated}")
+    print(f"Records uploaded to database: {'0 (dry run)' if args.dry_run else stats.written}")
+    print(f"Elapsed: {elapsed:.2f}s ({stats.unique / elapsed if elapsed else 0:,.0f} rows/s)")
     if duplicate_count > 0:
-        print(f"\nNote: {duplicate_count} duplicate records were skipped. First occurrence was retained.")
\ No newline at end of file
+        print(f"\nNote: {duplicate_count} duplicate records were skipped. First occurrence was retained.")
+
+
+if __name__ == "__main__":
+    main()
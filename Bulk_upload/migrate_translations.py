@@ -0,0 +1,131 @@
+"""
+Online migration of the per-language flag columns and the locale PO files
+into the normalized `translations` table.
+
+Usage:
+    python Bulk_upload/migrate_translations.py [--locale km_KH ...] [--batch-size 5000]
+                                               [--sleep 0.05] [--skip-po] [--dry-run]
+
+The migration never alters language_strings. Flags are copied with set-based
+INSERT ... SELECT statements over short id ranges, each in its own
+transaction, and PO texts are upserted in chunks, so the application keeps
+running while it works. Every step is an idempotent upsert: an interrupted
+run can simply be started again. With NORMALIZED_TRANSLATIONS=1 the
+application keeps the table current afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects.mysql import insert
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+from Bulk_upload.DB_bulk_upload import LOCALES_DIR, MSGID_MAX_LENGTH, get_engine
+from backend.models.language_local_model import LanguageLocale
+from backend.models.language_strings_model import LanguageString
+from backend.models.translation_model import Translation, TRANSLATION_DONE
+from backend.utils.po_file import read_po
+
+DEFAULT_BATCH_SIZE = 5000
+translations = Translation.__table__
+
+
+def copy_flags(connection, locale_id, column, max_id, batch_size, pause):
+    """Copy one flag column into translations.status, one id range per transaction."""
+    quoted = connection.dialect.identifier_preparer.quote(column)
+    statement = text(
+        f"INSERT INTO translations (string_id, locale_id, status) "
+        f"SELECT id, :locale_id, COALESCE({quoted}, 0) FROM language_strings "
+        f"WHERE id > :low AND id <= :high "
+        f"ON DUPLICATE KEY UPDATE status = VALUES(status)"
+    )
+    copied = 0
+    for low in range(0, max_id, batch_size):
+        with connection.begin():
+            copied += connection.execute(
+                statement, {"locale_id": locale_id, "low": low, "high": low + batch_size}
+            ).rowcount
+        if pause:
+            time.sleep(pause)
+    return copied
+
+
+def copy_catalog(connection, locale_id, po_path, batch_size, pause):
+    """Upsert the translated entries of a PO file as translation texts."""
+    copied = 0
+
+    def flush(chunk):
+        result = connection.execute(
+            select(LanguageString.id, LanguageString.msgid).where(LanguageString.msgid.in_(list(chunk)))
+        )
+        rows = [
+            {"string_id": string_id, "locale_id": locale_id, "text": chunk[msgid], "status": TRANSLATION_DONE}
+            for string_id, msgid in result
+        ]
+        if rows:
+            stmt = insert(translations).values(rows)
+            # The flags stay authoritative for the status of existing rows
+            connection.execute(stmt.on_duplicate_key_update(text=stmt.inserted.text))
+        connection.commit()
+        if pause:
+            time.sleep(pause)
+        return len(rows)
+
+    chunk = {}
+    for entry in read_po(po_path):
+        if entry.is_header or entry.obsolete or entry.msgctxt is not None or entry.fuzzy or not entry.msgstr:
+            continue
+        chunk.setdefault(entry.msgid[:MSGID_MAX_LENGTH], entry.msgstr)
+        if len(chunk) >= batch_size:
+            copied += flush(chunk)
+            chunk = {}
+    if chunk:
+        copied += flush(chunk)
+    return copied
+
+
+def migrate(locales=None, batch_size=DEFAULT_BATCH_SIZE, pause=0.0, skip_po=False, dry_run=False):
+    engine = get_engine()
+    if not dry_run:
+        translations.create(bind=engine, checkfirst=True)
+    flag_columns = {column["name"] for column in inspect(engine).get_columns(LanguageString.__tablename__)}
+
+    with engine.connect() as connection:
+        query = select(LanguageLocale.id, LanguageLocale.language, LanguageLocale.language_code).order_by(LanguageLocale.id)
+        if locales:
+            query = query.where(LanguageLocale.language_code.in_(locales))
+        targets = connection.execute(query).all()
+        max_id = connection.execute(select(func.max(LanguageString.id))).scalar() or 0
+        connection.commit()
+
+        for locale_id, language, code in targets:
+            started = time.perf_counter()
+            po_path = os.path.join(LOCALES_DIR, code, "LC_MESSAGES", "salesplaypos.po")
+            has_column = code in flag_columns
+            has_catalog = os.path.exists(po_path) and not skip_po
+            print(f"{language} ({code}, locale {locale_id}): flags={'yes' if has_column else 'no'}, catalog={'yes' if has_catalog else 'no'}")
+            if dry_run:
+                continue
+
+            flags = copy_flags(connection, locale_id, code, max_id, batch_size, pause) if has_column else 0
+            texts = copy_catalog(connection, locale_id, po_path, batch_size, pause) if has_catalog else 0
+            elapsed = time.perf_counter() - started
+            print(f"  {flags} flag rows, {texts} texts in {elapsed:.2f}s ({(flags + texts) / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy flag columns and PO catalogs into the translations table.")
+    parser.add_argument("--locale", action="append", dest="locales", metavar="LANG_CODE", help="only this locale (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="ids per flag copy / entries per text upsert")
+    parser.add_argument("--sleep", type=float, default=0.0, help="pause between batches to limit load on a live server")
+    parser.add_argument("--skip-po", action="store_true", help="copy the flags only")
+    parser.add_argument("--dry-run", action="store_true", help="list what would be migrated")
+    args = parser.parse_args(argv)
+    migrate(args.locales, args.batch_size, args.sleep, args.skip_po, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
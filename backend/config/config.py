@@ -19,14 +19,71 @@ class Config:
         # f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
     )
 
+    # Same database through an asyncio driver, used by the request hot paths
+    ASYNC_SQLALCHEMY_DATABASE_URL = (
+        f"mysql+aiomysql://{MYSQL_USER}:@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+
+        # Uncomment the below line if password is used
+        # f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
+    )
+
     logger.info(f"Configuring database connection to host: {MYSQL_HOST}, port: {MYSQL_PORT}, database: {MYSQL_DB}")
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+    # Limits of our OpenAI tier, shared by every request in the process
+    OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+    OPENAI_TPM = int(os.getenv("OPENAI_TPM", "30000"))
+    OPENAI_MIN_CONCURRENCY = int(os.getenv("OPENAI_MIN_CONCURRENCY", "2"))
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "20"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "6"))
+    OPENAI_MAX_BACKOFF = float(os.getenv("OPENAI_MAX_BACKOFF", "60"))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
     
-    msgfmt_path = os.getenv("MSGFMT_PATH", "msgfmt.exe")
+    # Packed translation requests: input token budget and max strings per request
+    TRANSLATION_PACK_TOKENS = int(os.getenv("TRANSLATION_PACK_TOKENS", "1500"))
+    TRANSLATION_PACK_ITEMS = int(os.getenv("TRANSLATION_PACK_ITEMS", "50"))
+
+    # Translation pipeline: worker pool size, DB page size and writer commit cadence
+    TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "20"))
+    TRANSLATION_PAGE_SIZE = int(os.getenv("TRANSLATION_PAGE_SIZE", "500"))
+    TRANSLATION_FLUSH_SIZE = int(os.getenv("TRANSLATION_FLUSH_SIZE", "200"))
+    TRANSLATION_FLUSH_SECONDS = float(os.getenv("TRANSLATION_FLUSH_SECONDS", "2"))
+    JOB_CHECKPOINT_SECONDS = float(os.getenv("JOB_CHECKPOINT_SECONDS", "5"))
+    # A job whose owner has not checkpointed for this long may be taken over by another worker
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+    # Translate msgids that differ only in whitespace, case or final punctuation
+    # once and adapt the result for the others
+    TRANSLATION_REUSE_SIBLINGS = os.getenv("TRANSLATION_REUSE_SIBLINGS", "1").lower() in ("1", "true", "yes")
+    # Minimum 3-gram Jaccard similarity for near-duplicates in GET /duplicates
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+    # Keep translation text and status in the normalized `translations` table,
+    # which then replaces the flag columns as the source of pending work, so
+    # languages are added without ALTER TABLE (see Bulk_upload/migrate_translations.py)
+    NORMALIZED_TRANSLATIONS = os.getenv("NORMALIZED_TRANSLATIONS", "0").lower() in ("1", "true", "yes")
+
+    # Seconds a worker serves its cached language_locales before reloading it
+    LOCALE_CACHE_TTL = float(os.getenv("LOCALE_CACHE_TTL", "60"))
 
     UPLOAD_DIR = "uploads"
+    # Rows applied per database round trip when ingesting an upload
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "1000"))
     LOCALES_DIR = "locales"
+
+    # Processes used by /compile-all (0 = one per CPU)
+    COMPILE_WORKERS = int(os.getenv("COMPILE_WORKERS", "0"))
+    # Where POST /qa writes one JSON report per locale
+    QA_REPORT_DIR = os.getenv("QA_REPORT_DIR", "qa_reports")
+    # Most msgids accepted by one bulk POST /t/{language} lookup
+    LOOKUP_MAX_MSGIDS = int(os.getenv("LOOKUP_MAX_MSGIDS", "1000"))
+
+    # Change-log rows read per /sync call
+    SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "5000"))
+
+    # How often a worker re-reads a locale's published artifact manifest
+    ARTIFACT_RECHECK_SECONDS = float(os.getenv("ARTIFACT_RECHECK_SECONDS", "2"))
     
     PORT = os.getenv("PORT")
 
@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from .config import Config
 from .logger import logger
 
@@ -20,8 +21,24 @@ except Exception as e:
     logger.error(f"Failed to create SQLAlchemy engine: {e}")
     raise
 
+try:
+    async_engine = create_async_engine(
+        Config.ASYNC_SQLALCHEMY_DATABASE_URL,
+        pool_size=10,
+        max_overflow=5,
+        pool_timeout=30,
+        pool_recycle=1800
+    )
+    logger.info("Async SQLAlchemy Engine successfully created with connection pooling.")
+except Exception as e:
+    logger.error(f"Failed to create async SQLAlchemy engine: {e}")
+    raise
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False so committed rows stay readable without an implicit (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     """Yield database session for FastAPI dependency injection."""
     db = SessionLocal()
@@ -29,3 +46,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Yield an asyncio database session for FastAPI dependency injection."""
+    async with AsyncSessionLocal() as db:
+        yield db
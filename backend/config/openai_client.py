@@ -0,0 +1,226 @@
+import asyncio
+import random
+import re
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+from .config import Config
+from .logger import logger
+
+T = TypeVar("T")
+
+# Errors worth retrying; anything else is a bug in the request and fails fast
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset headers such as '1s', '6m0s' or '250ms' into seconds."""
+    if not value:
+        return None
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|s|m|h)', value):
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total or None
+
+
+class _TokenBucket:
+    """Continuously refilled bucket holding at most one minute of budget."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, remaining: float, reset_seconds: Optional[float]):
+        """Trust the server's view when it is stricter than ours."""
+        self._refill()
+        if remaining < self.tokens:
+            self.tokens = remaining
+        if remaining <= 0 and reset_seconds:
+            # Empty until the server window resets
+            self.tokens = -reset_seconds * self.rate
+
+
+class RateLimiter:
+    """
+    Process-wide limiter for OpenAI calls.
+
+    Requests and tokens per minute are enforced with token buckets that are
+    corrected from the x-ratelimit-* response headers. Concurrency follows
+    AIMD: one more slot after a window of clean responses, halved on 429s,
+    timeouts and server errors.
+    """
+
+    def __init__(
+        self,
+        rpm: int = Config.OPENAI_RPM,
+        tpm: int = Config.OPENAI_TPM,
+        min_concurrency: int = Config.OPENAI_MIN_CONCURRENCY,
+        max_concurrency: int = Config.OPENAI_MAX_CONCURRENCY
+    ):
+        self.requests = _TokenBucket(rpm)
+        self.tokens = _TokenBucket(tpm)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(max(min_concurrency, max_concurrency // 2))
+        self.in_flight = 0
+        self._condition = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built at import time
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self, estimated_tokens: int):
+        async with self.condition:
+            while True:
+                if self.in_flight < int(self.limit):
+                    delay = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                    if delay <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(estimated_tokens)
+                        self.in_flight += 1
+                        return
+                    try:
+                        await asyncio.wait_for(self.condition.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await self.condition.wait()
+
+    async def release(self, estimated_tokens: int, used_tokens: Optional[int], ok: bool, throttled: bool):
+        async with self.condition:
+            self.in_flight -= 1
+            if used_tokens is not None:
+                # Charge the real usage instead of the estimate
+                self.tokens.take(used_tokens - estimated_tokens)
+            if throttled:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                logger.warning(f"OpenAI throttling, concurrency reduced to {int(self.limit)}")
+            elif ok:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def observe_headers(self, headers: httpx.Headers):
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            self.requests.sync(float(remaining_requests), _parse_reset(headers.get("x-ratelimit-reset-requests")))
+        if remaining_tokens is not None:
+            self.tokens.sync(float(remaining_tokens), _parse_reset(headers.get("x-ratelimit-reset-tokens")))
+
+    def snapshot(self) -> dict:
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "requests_available": round(self.requests.tokens, 1),
+            "tokens_available": round(self.tokens.tokens, 1),
+        }
+
+
+openai_limiter = RateLimiter()
+
+_client: Optional[AsyncOpenAI] = None
+
+
+async def _observe_response(response: httpx.Response):
+    openai_limiter.observe_headers(response.headers)
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the long-lived client shared by the whole process (keep-alive connection pool)."""
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.OPENAI_MAX_CONCURRENCY,
+                max_keepalive_connections=Config.OPENAI_MAX_CONCURRENCY,
+                keepalive_expiry=60
+            ),
+            timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=10),
+            event_hooks={"response": [_observe_response]}
+        )
+        # Retries are handled by call_openai so they go through the limiter
+        _client = AsyncOpenAI(api_key=Config.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+        logger.info("Shared OpenAI client created")
+    return _client
+
+
+async def close_openai_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def call_openai(
+    request: Callable[[AsyncOpenAI], Awaitable[T]],
+    estimated_tokens: int,
+    max_retries: int = Config.OPENAI_MAX_RETRIES
+) -> T:
+    """
+    Run one OpenAI request through the shared limiter, retrying throttling,
+    timeouts and server errors with jittered exponential backoff.
+    """
+    client = get_openai_client()
+    attempt = 0
+    while True:
+        await openai_limiter.acquire(estimated_tokens)
+        used_tokens = None
+        ok = False
+        throttled = False
+        try:
+            response = await request(client)
+            usage = getattr(response, "usage", None)
+            used_tokens = getattr(usage, "total_tokens", None)
+            ok = True
+            return response
+        except RETRYABLE_ERRORS as e:
+            throttled = True
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            # Full jitter, but never sooner than the server asked for
+            backoff = random.uniform(0, min(Config.OPENAI_MAX_BACKOFF, 2 ** attempt))
+            delay = max(backoff, _retry_after(e) or 0)
+            logger.warning(f"OpenAI {type(e).__name__}, retry {attempt}/{max_retries} in {delay:.1f}s")
+        finally:
+            await openai_limiter.release(estimated_tokens, used_tokens, ok, throttled)
+        await asyncio.sleep(delay)
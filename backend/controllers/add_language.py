@@ -1,10 +1,12 @@
 from sqlalchemy import DDL, inspect, text, insert, delete,Column, Integer
 from schemas.translation import LanguageLocaleCreate
 from sqlalchemy.orm import Session
+from config.config import Config
 from config.logger import logger
 from models.language_local_model import LanguageLocale
+from controllers.locale_registry import locale_registry
 from datetime import datetime
-from models.language_strings_model import LanguageString
+from models.language_strings_model import LanguageString, pending_index_name
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import text
 from datetime import datetime
@@ -46,6 +48,7 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
             )
             db.execute(stmt)
             db.commit()
+            locale_registry.invalidate()
             locale_id = candidate
             logger.info(f"Created language locale: ID {locale_id}")
             break 
@@ -74,6 +77,15 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
         logger.error("Failed to create language locale after all retries")
         return None
 
+    if Config.NORMALIZED_TRANSLATIONS:
+        # Status and text live in the translations table; no DDL needed
+        logger.info(f"Normalized translations enabled; no column added for {locale_data.language_code}")
+        return {
+            "id": locale_id,
+            "language_code": locale_data.language_code,
+            "column_added": False
+        }
+
     # Add new column to language_strings table
     try:
         table_name = LanguageString.__tablename__
@@ -103,6 +115,12 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
         column_name_quoted = preparer.quote(column_name)
         escaped_comment = locale_data.language_name.replace("'", "''")
         
+        # The pending-work (flag, id) index is added in the same ALTER
+        index_clause = (
+            f", ADD INDEX {preparer.quote(pending_index_name(column_name))} "
+            f"({column_name_quoted}, {preparer.quote('id')})"
+        )
+
         # Build ALTER TABLE statement with position
         if after_column:
             after_column_quoted = preparer.quote(after_column)
@@ -110,14 +128,14 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
                 f"ALTER TABLE {table_name_quoted} "
                 f"ADD COLUMN {column_name_quoted} INTEGER DEFAULT 0 "
                 f"COMMENT '{escaped_comment}' "
-                f"AFTER {after_column_quoted}"
+                f"AFTER {after_column_quoted}{index_clause}"
             )
         else:
             # If last_update is first column (unlikely but safe)
             sql = text(
                 f"ALTER TABLE {table_name_quoted} "
                 f"ADD COLUMN {column_name_quoted} INTEGER DEFAULT 0 "
-                f"COMMENT '{escaped_comment}' FIRST"
+                f"COMMENT '{escaped_comment}' FIRST{index_clause}"
             )
         
         # Execute DDL statement
@@ -135,6 +153,7 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
             )
             db.execute(delete_stmt)
             db.commit()
+            locale_registry.invalidate()
             logger.warning(f"Rolled back locale creation for ID {locale_id}")
         except Exception as rollback_error:
             logger.critical(f"Failed to rollback locale creation: {str(rollback_error)}")
@@ -145,5 +164,6 @@ def add_language_locale(db: Session, locale_data: LanguageLocaleCreate):
     
     return {
         "id": locale_id,
-        "language_code": locale_data.language_code
+        "language_code": locale_data.language_code,
+        "column_added": True
     }
\ No newline at end of file
@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from config.config import Config
+from utils.artifacts import ENCODING_SUFFIXES, load_manifest, publish
+from utils.mo_file import compile_mo
+from utils.po_file import iter_po, translation_map
+
+PO_FILE = "salesplaypos.po"
+MO_FILE = "salesplaypos.mo"
+JSON_FILE = "salesplaypos.json"
+DIST_DIR = "dist"
+
+ARTIFACT_FORMS = {
+    "po": (PO_FILE, "text/x-gettext-translation; charset=utf-8"),
+    "mo": (MO_FILE, "application/octet-stream"),
+    "json": (JSON_FILE, "application/json"),
+}
+
+# lang_code -> (monotonic time read, manifest)
+_manifests: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+
+
+@dataclass(frozen=True)
+class Artifact:
+    path: str
+    filename: str
+    media_type: str
+    encoding: Optional[str]
+    # ETag of the selected representation, and those of all representations of the same content
+    etag: str
+    etags: Tuple[str, ...]
+
+
+def dist_dir(lang_code: str) -> str:
+    return os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES", DIST_DIR)
+
+
+def compile_and_publish(po_path: str, mo_path: str) -> int:
+    """
+    Compile a PO file to MO and publish the PO, MO and JSON forms of the
+    catalog for download. All three come from one read of the PO file, so
+    they always agree. Returns the MO size.
+    """
+    with open(po_path, "rb") as f:
+        po_bytes = f.read()
+    entries = list(iter_po(io.TextIOWrapper(io.BytesIO(po_bytes), encoding="utf-8")))
+    mo_bytes = compile_mo(entries)
+
+    tmp_path = mo_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(mo_bytes)
+    os.replace(tmp_path, mo_path)
+
+    json_bytes = json.dumps(translation_map(entries), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    publish(
+        os.path.join(os.path.dirname(mo_path), DIST_DIR),
+        {PO_FILE: po_bytes, MO_FILE: mo_bytes, JSON_FILE: json_bytes}
+    )
+    return len(mo_bytes)
+
+
+def forget_manifests():
+    """Drop cached manifests after a compile in this process."""
+    _manifests.clear()
+
+
+def get_manifest(lang_code: str, refresh: bool = False) -> Dict[str, dict]:
+    """The locale's manifest, re-read from disk at most every ARTIFACT_RECHECK_SECONDS."""
+    now = time.monotonic()
+    cached = _manifests.get(lang_code)
+    if cached is not None and not refresh and now - cached[0] < Config.ARTIFACT_RECHECK_SECONDS:
+        return cached[1]
+    manifest = load_manifest(dist_dir(lang_code))
+    _manifests[lang_code] = (now, manifest)
+    return manifest
+
+
+def resolve_artifact(lang_code: str, form: str, accepted: Set[str], refresh: bool = False) -> Optional[Artifact]:
+    """Pick the best published representation of a catalog form for the accepted encodings."""
+    name, media_type = ARTIFACT_FORMS[form]
+    entry = get_manifest(lang_code, refresh).get(name)
+    if entry is None:
+        return None
+
+    available = entry["encodings"]
+    encoding = next(
+        (encoding for encoding in ENCODING_SUFFIXES if encoding in available and (encoding in accepted or "*" in accepted)),
+        None
+    )
+    etags = (f'"{entry["etag"]}"',) + tuple(f'"{entry["etag"]}-{encoding}"' for encoding in available)
+    path = os.path.join(dist_dir(lang_code), entry["file"] + (ENCODING_SUFFIXES[encoding] if encoding else ""))
+    return Artifact(
+        path=path,
+        filename=f"{lang_code}_{name}",
+        media_type=media_type,
+        encoding=encoding,
+        etag=f'"{entry["etag"]}-{encoding}"' if encoding else f'"{entry["etag"]}"',
+        etags=etags
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etags: Tuple[str, ...]) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
@@ -0,0 +1,178 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.logger import logger
+from controllers.locale_registry import locale_registry
+from models.language_local_model import LanguageLocale
+from models.string_change_model import StringChange
+from models.sync_version_model import SyncVersion
+
+# Rows per multi-row INSERT
+CHANGE_CHUNK_SIZE = 1000
+
+
+def ensure_sync_schema(engine: Engine):
+    """
+    Create the version counters and bring a string_changes table from before
+    them up to date: old rows keep their seq as version, and each locale's
+    counter starts at its highest logged version, so clients keep syncing.
+    """
+    SyncVersion.__table__.create(bind=engine, checkfirst=True)
+    inspector = inspect(engine)
+    table_name = StringChange.__tablename__
+    preparer = engine.dialect.identifier_preparer
+    quoted = preparer.quote(table_name)
+    with engine.begin() as connection:
+        counters_name = preparer.quote(SyncVersion.__tablename__)
+        if "catalog_version" not in {column["name"] for column in inspector.get_columns(SyncVersion.__tablename__)}:
+            connection.execute(text(f"ALTER TABLE {counters_name} ADD COLUMN catalog_version BIGINT NOT NULL DEFAULT 0"))
+            connection.execute(text(f"UPDATE {counters_name} SET catalog_version = version"))
+            logger.info(f"Added catalog_version to {SyncVersion.__tablename__}")
+        if "version" not in {column["name"] for column in inspector.get_columns(table_name)}:
+            connection.execute(text(f"ALTER TABLE {quoted} ADD COLUMN version BIGINT NOT NULL DEFAULT 0"))
+            connection.execute(text(f"UPDATE {quoted} SET version = seq"))
+            logger.info(f"Added version to {table_name}")
+        indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        if "idx_locale_version" not in indexes:
+            connection.execute(text(f"CREATE INDEX idx_locale_version ON {quoted} (locale_id, version, seq)"))
+        if "idx_locale_seq" in indexes:
+            on_table = f" ON {quoted}" if engine.dialect.name == "mysql" else ""
+            connection.execute(text(f"DROP INDEX idx_locale_seq{on_table}"))
+
+        changes = StringChange.__table__
+        counters = SyncVersion.__table__
+        locales = LanguageLocale.__table__
+        logged = (
+            select(func.coalesce(func.max(changes.c.version), 0))
+            .where(changes.c.locale_id == locales.c.id)
+            .scalar_subquery()
+        )
+        connection.execute(insert(counters).from_select(
+            ["locale_id", "version", "reset_version", "catalog_version"],
+            select(locales.c.id, logged, 0, logged).where(~select(counters.c.locale_id).where(counters.c.locale_id == locales.c.id).exists())
+        ))
+
+
+async def _locked_counter(db: AsyncSession, locale_id: int) -> Tuple[int, int]:
+    """(version, reset_version) of a locale, row-locked until the caller's transaction ends."""
+    query = (
+        select(SyncVersion.version, SyncVersion.reset_version)
+        .where(SyncVersion.locale_id == locale_id)
+        .with_for_update()
+    )
+    row = (await db.execute(query)).first()
+    if row is None:
+        # A locale added since startup (ensure_sync_schema seeds the others)
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(SyncVersion.__table__).values(
+                    locale_id=locale_id, version=0, reset_version=0, catalog_version=0
+                ))
+        except IntegrityError:
+            pass
+        row = (await db.execute(query)).first()
+    return row[0], row[1]
+
+
+async def bump_version(db: AsyncSession, locale_id: int, reset: bool = False) -> int:
+    """
+    Next catalog version of a locale. The counter row stays locked until the
+    caller commits, so versions become visible in the order they were handed
+    out. With reset, clients at an older version get the whole catalog.
+    """
+    version, reset_version = await _locked_counter(db, locale_id)
+    version += 1
+    values = {"version": version}
+    if reset:
+        values["reset_version"] = version
+    await db.execute(
+        update(SyncVersion).where(SyncVersion.locale_id == locale_id).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return version
+
+
+async def record_changes(db: AsyncSession, lang_code: str, changes: Dict[str, Optional[str]]) -> int:
+    """
+    Append catalog changes (msgid -> new msgstr, None when removed) to the
+    change log under one new version, and return that version (0 when
+    nothing was logged). Call it last before the commit: it holds the
+    locale's counter lock until then.
+    """
+    if not changes:
+        return 0
+    locale = await locale_registry.get_by_code(lang_code)
+    if locale is None:
+        logger.warning(f"No locale row for {lang_code}; changes not logged")
+        return 0
+
+    version = await bump_version(db, locale.id)
+    rows = [
+        {"locale_id": locale.id, "version": version, "msgid": msgid, "msgstr": msgstr}
+        for msgid, msgstr in changes.items()
+    ]
+    for i in range(0, len(rows), CHANGE_CHUNK_SIZE):
+        await db.execute(insert(StringChange.__table__), rows[i:i + CHANGE_CHUNK_SIZE])
+    logger.info(f"Logged {len(rows)} {lang_code} changes as version {version}")
+    return version
+
+
+async def record_catalog_rewrite(db: AsyncSession, lang_code: str) -> int:
+    """For catalog rewrites that are not logged entry by entry: every client resyncs in full."""
+    locale = await locale_registry.get_by_code(lang_code)
+    if locale is None:
+        logger.warning(f"No locale row for {lang_code}; catalog rewrite not logged")
+        return 0
+    version = await bump_version(db, locale.id, reset=True)
+    logger.info(f"{lang_code} catalog rewritten; clients reset at version {version}")
+    return version
+
+
+async def mark_catalog_written(db: AsyncSession, lang_code: str, version: int):
+    """
+    Record that the locale's PO file now holds every change up to `version`.
+    Writers call it once the file is written: in the logging transaction when
+    the file is swapped in before the commit, or right after appending. The
+    caller commits.
+    """
+    locale = await locale_registry.get_by_code(lang_code)
+    if locale is None or not version:
+        return
+    await db.execute(
+        update(SyncVersion)
+        .where(SyncVersion.locale_id == locale.id, SyncVersion.catalog_version < version)
+        .values(catalog_version=version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def latest_version(db: AsyncSession, locale_id: int) -> Tuple[int, int, int]:
+    """
+    (committed version, reset version, catalog version) of a locale; all 0
+    before its first change. The PO file holds every change up to the
+    catalog version, and possibly some after it.
+    """
+    row = (await db.execute(
+        select(SyncVersion.version, SyncVersion.reset_version, SyncVersion.catalog_version)
+        .where(SyncVersion.locale_id == locale_id)
+    )).first()
+    return (row[0], row[1], row[2]) if row else (0, 0, 0)
+
+
+async def read_changes(
+    db: AsyncSession,
+    locale_id: int,
+    since: int,
+    until: int,
+    limit: int
+) -> List[Tuple[int, str, Optional[str]]]:
+    """(version, msgid, msgstr) for since < version <= until, oldest first; one index range scan."""
+    result = await db.execute(
+        select(StringChange.version, StringChange.msgid, StringChange.msgstr)
+        .where(StringChange.locale_id == locale_id, StringChange.version > since, StringChange.version <= until)
+        .order_by(StringChange.version, StringChange.seq)
+        .limit(limit)
+    )
+    return result.all()
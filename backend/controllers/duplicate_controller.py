@@ -0,0 +1,58 @@
+import time
+from typing import Dict, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from config.config import Config
+from config.logger import logger
+from controllers.translation_controller import catalog_path, load_catalog_translations
+from models.language_strings_model import LanguageString
+from utils.near_duplicates import NearDuplicateIndex, surface_key
+
+# Rows fetched per round trip while reading the msgids
+DUPLICATE_FETCH_SIZE = 5000
+
+
+def _build_report(msgids, threshold: float) -> dict:
+    started = time.perf_counter()
+    index = NearDuplicateIndex(threshold).add_all(msgids)
+    clusters = index.clusters()
+    return {
+        "strings": len(index),
+        "distinct_keys": len(index.groups),
+        # Strings that could take a sibling's translation instead of a request of their own
+        "redundant_strings": len(index) - len(index.groups),
+        "exact_clusters": sum(cluster["kind"] == "exact" for cluster in clusters),
+        "near_clusters": sum(cluster["kind"] == "near" for cluster in clusters),
+        "threshold": threshold,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "clusters": clusters,
+    }
+
+
+async def duplicate_report(db: AsyncSession, threshold: float = Config.NEAR_DUPLICATE_THRESHOLD) -> dict:
+    """
+    Clusters of msgids in language_strings that are the same up to
+    whitespace, case and final punctuation (`exact`) or merely similar
+    (`near`), for cleaning up the source strings.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be in (0, 1]")
+    result = await db.stream(
+        select(LanguageString.msgid).execution_options(yield_per=DUPLICATE_FETCH_SIZE)
+    )
+    msgids = [msgid async for msgid in result.scalars()]
+    report = await run_in_threadpool(_build_report, msgids, threshold)
+    logger.info(
+        f"Duplicate report: {report['redundant_strings']} redundant strings, "
+        f"{report['near_clusters']} near clusters in {report['elapsed_ms']} ms"
+    )
+    return report
+
+
+def load_siblings(lang_code: str) -> Dict[str, Tuple[str, str]]:
+    """surface_key -> (msgid, msgstr) over a locale's translated catalog entries."""
+    siblings = {}
+    for msgid, msgstr in load_catalog_translations(catalog_path(lang_code)).items():
+        siblings.setdefault(surface_key(msgid), (msgid, msgstr))
+    return siblings
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence, Tuple
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from config.database import AsyncSessionLocal
+from config.logger import logger
+from controllers.string_status import status_source
+from controllers.translation_controller import catalog_path, load_catalog_translations, po_header_entry
+from models.language_strings_model import LanguageString
+from utils.po_file import POEntry, format_entry
+from utils.xlsx_stream import CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE, stream_csv, stream_xlsx
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_FETCH_SIZE = 1000
+
+PO_MEDIA_TYPE = "text/x-gettext-translation; charset=utf-8"
+
+EXPORT_FORMATS = {
+    "xlsx": XLSX_MEDIA_TYPE,
+    "csv": CSV_MEDIA_TYPE,
+}
+
+PACK_FORMATS = dict(EXPORT_FORMATS, po=PO_MEDIA_TYPE)
+PACK_STATUSES = ("pending", "done", "all")
+PACK_COLUMNS = ("msgid", "msgstr", "status", "last_update")
+
+
+
+async def stream_msgid_rows() -> AsyncIterator[Sequence[str]]:
+    """
+    Yield a header row and then (msgid, "") for every string, straight from a
+    server-side cursor. Opens its own session because it outlives the request
+    handler that starts the response.
+    """
+    yield ("msgid", "msgstr")
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            select(LanguageString.msgid)
+            .order_by(LanguageString.id)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+        count = 0
+        async for msgid in result.scalars():
+            count += 1
+            yield (msgid, "")
+    logger.info(f"Exported {count} strings")
+
+
+def encode_rows(rows, export_format: str, sheet_name: str = "Translations") -> AsyncIterator[bytes]:
+    """Turn streamed rows into response body chunks for the given format."""
+    if export_format == "csv":
+        return stream_csv(rows)
+    if export_format == "xlsx":
+        return stream_xlsx(rows, sheet_name)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+async def stream_translator_pack(
+    lang_code: str,
+    status: str = "pending",
+    since: Optional[datetime] = None
+) -> AsyncIterator[Tuple[str, str, str, Optional[str]]]:
+    """
+    Yield (msgid, msgstr, status, last_update) for one language, filtered by
+    the language flag and optionally by last_update >= since. msgstr is
+    pre-filled from the locale's catalog; the rows themselves come from a
+    single pass over a server-side cursor.
+    """
+    if status not in PACK_STATUSES:
+        raise ValueError(f"Invalid status: {status}")
+    source, column = await status_source(lang_code)
+    translations = await run_in_threadpool(load_catalog_translations, catalog_path(lang_code))
+
+    table = LanguageString.__table__
+    query = select(table.c.msgid, column, table.c.last_update).select_from(source)
+    if status == "pending":
+        query = query.where(column == 0)
+    elif status == "done":
+        query = query.where(column == 1)
+    if since is not None:
+        query = query.where(table.c.last_update >= since)
+    query = query.order_by(table.c.id).execution_options(yield_per=EXPORT_FETCH_SIZE)
+
+    count = 0
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for msgid, flag, last_update in result:
+            count += 1
+            yield (
+                msgid,
+                translations.get(msgid, ""),
+                "done" if flag else "pending",
+                last_update.isoformat(sep=" ") if last_update else None,
+            )
+    logger.info(f"Exported {count} {status} strings for {lang_code}")
+
+
+async def stream_po_pack(rows, language: str, lang_code: str) -> AsyncIterator[bytes]:
+    """Encode pack rows as a PO catalog; untranslated strings get an empty msgstr."""
+    yield format_entry(po_header_entry(language, lang_code)).encode("utf-8")
+    batch = []
+    async for msgid, msgstr, _, _ in rows:
+        batch.append("\n" + format_entry(POEntry(msgid=msgid, msgstr=msgstr)))
+        if len(batch) >= 500:
+            yield "".join(batch).encode("utf-8")
+            batch = []
+    if batch:
+        yield "".join(batch).encode("utf-8")
+
+
+def encode_pack(rows, export_format: str, language: str, lang_code: str) -> AsyncIterator[bytes]:
+    """Response body for a translator pack in csv, xlsx or po."""
+    if export_format == "po":
+        return stream_po_pack(rows, language, lang_code)
+
+    async def with_header():
+        yield PACK_COLUMNS
+        async for row in rows:
+            yield row
+
+    return encode_rows(with_header(), export_format, sheet_name=lang_code)
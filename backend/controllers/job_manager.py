@@ -0,0 +1,324 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import inspect, or_, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.config import Config
+from config.database import AsyncSessionLocal
+from config.logger import logger
+from models.language_local_model import LanguageLocale
+from models.translation_job_model import TranslationJob
+from controllers.string_status import count_pending as count_language_pending
+from controllers.translation_pipeline import TranslationPipeline
+
+ACTIVE_STATUSES = ("queued", "running")
+
+LEASE_COLUMNS = {
+    "owner": "VARCHAR(64) NULL",
+    "lease_expires_at": "TIMESTAMP NULL",
+}
+
+
+class ActiveJobError(RuntimeError):
+    """A job for some of the requested languages is already queued or running."""
+
+    def __init__(self, job_id: str, codes: List[str]):
+        super().__init__(f"Translation job {job_id} is already active for {', '.join(codes)}")
+        self.job_id = job_id
+        self.codes = codes
+
+
+def ensure_lease_columns(engine: Engine) -> List[str]:
+    """Add the owner/lease columns to a translation_jobs table created before them."""
+    table_name = TranslationJob.__tablename__
+    existing = {column["name"] for column in inspect(engine).get_columns(table_name)}
+    missing = [name for name in LEASE_COLUMNS if name not in existing]
+    if missing:
+        preparer = engine.dialect.identifier_preparer
+        with engine.begin() as connection:
+            for name in missing:
+                connection.execute(text(
+                    f"ALTER TABLE {preparer.quote(table_name)} ADD COLUMN {preparer.quote(name)} {LEASE_COLUMNS[name]}"
+                ))
+        logger.info(f"Added {', '.join(missing)} to {table_name}")
+    return missing
+
+
+async def count_pending(db: AsyncSession, targets: List[Tuple[str, str]]) -> int:
+    """Number of (msgid, language) pairs still pending for the given targets."""
+    total = 0
+    for _, code in targets:
+        total += await count_language_pending(db, code)
+    return total
+
+
+class JobManager:
+    """
+    Runs /generate-po translations as background jobs.
+
+    Job rows are the checkpoint: counters are written every
+    JOB_CHECKPOINT_SECONDS and the translation state itself lives in the
+    status flags the pipeline commits, so an interrupted job resumes by
+    re-running the pipeline over whatever is still pending.
+
+    Every process (e.g. each uvicorn worker) has its own JobManager. A job
+    runs in the process that claims it: the claim sets the row's owner and
+    a lease that each checkpoint renews, and only an unowned job or one
+    whose lease has expired can be claimed. A checkpoint that finds the row
+    cancelled, or owned by someone else, stops the local pipeline.
+    """
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # job id -> (pipeline, counters carried over from earlier attempts)
+        self.running: Dict[str, Tuple[TranslationPipeline, dict]] = {}
+        self.watcher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _lease() -> datetime:
+        return datetime.now() + timedelta(seconds=Config.JOB_LEASE_SECONDS)
+
+    async def active_job_for(self, db: AsyncSession, codes: List[str]) -> Optional[Tuple[str, List[str]]]:
+        """(job id, overlapping language codes) of an active job sharing a target with `codes`."""
+        result = await db.execute(
+            select(TranslationJob.id, TranslationJob.targets)
+            .where(TranslationJob.status.in_(ACTIVE_STATUSES))
+            .order_by(TranslationJob.created_at)
+        )
+        for job_id, targets in result:
+            overlap = [code for _, code in json.loads(targets) if code in codes]
+            if overlap:
+                return job_id, overlap
+        return None
+
+    async def lock_languages(self, db: AsyncSession, codes: List[str]):
+        """
+        Lock the languages' locale rows until db's transaction ends, and raise
+        ActiveJobError if a job is active for one of them. Job submissions and
+        catalog rewrites (uploads, reconcile, regenerate) both go through it,
+        so a rewrite never swaps a PO file a job is appending to.
+        """
+        await db.execute(
+            select(LanguageLocale.id)
+            .where(LanguageLocale.language_code.in_(codes))
+            .order_by(LanguageLocale.id)
+            .with_for_update()
+        )
+        active = await self.active_job_for(db, codes)
+        if active is not None:
+            await db.rollback()
+            raise ActiveJobError(*active)
+
+    async def submit(self, db: AsyncSession, targets: List[Tuple[str, str]], packed: bool = True) -> str:
+        """
+        Queue a job and start it. Raises ActiveJobError when an active job
+        already covers one of the languages: both would translate and append
+        the same pending strings.
+        """
+        await self.lock_languages(db, [code for _, code in targets])
+
+        job = TranslationJob(
+            id=uuid.uuid4().hex,
+            targets=json.dumps(targets),
+            packed=1 if packed else 0,
+            status="queued",
+            total=await count_pending(db, targets)
+        )
+        db.add(job)
+        await db.commit()
+        logger.info(f"Submitted translation job {job.id} for {', '.join(code for _, code in targets)}")
+        self._start(job.id, targets, packed)
+        return job.id
+
+    def _start(self, job_id: str, targets: List[Tuple[str, str]], packed: bool):
+        task = asyncio.create_task(self._run(job_id, targets, packed))
+        self.tasks[job_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job_id, None))
+
+    async def _claim(self, job_id: str) -> bool:
+        """Take an active job that has no owner, is ours, or whose owner's lease expired."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(TranslationJob).where(
+                    TranslationJob.id == job_id,
+                    TranslationJob.status.in_(ACTIVE_STATUSES),
+                    or_(
+                        TranslationJob.owner.is_(None),
+                        TranslationJob.owner == self.owner,
+                        TranslationJob.lease_expires_at < datetime.now()
+                    )
+                ).values(owner=self.owner, lease_expires_at=self._lease(), status="running")
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            return bool(result.rowcount)
+
+    async def _update(self, job_id: str, *conditions, **values) -> Optional[int]:
+        """Update a job this process owns; the row count, or None if the update failed."""
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(
+                    update(TranslationJob)
+                    .where(TranslationJob.id == job_id, TranslationJob.owner == self.owner, *conditions)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                return result.rowcount
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Failed to update job {job_id}: {str(e)}")
+                return None
+
+    async def _checkpoint(self, job_id: str, pipeline: TranslationPipeline, base: dict, *conditions, **values) -> Optional[int]:
+        return await self._update(
+            job_id,
+            *conditions,
+            processed=base["processed"] + pipeline.processed,
+            failed=base["failed"] + pipeline.failed,
+            from_memory=base["from_memory"] + pipeline.remembered + pipeline.reused,
+            **values
+        )
+
+    async def _run(self, job_id: str, targets: List[Tuple[str, str]], packed: bool):
+        pipeline = None
+        checkpointer = None
+        try:
+            if not await self._claim(job_id):
+                logger.info(f"Translation job {job_id} is owned by another worker")
+                return
+            async with AsyncSessionLocal() as db:
+                job = await db.get(TranslationJob, job_id)
+            # Counters of earlier attempts carry over when a job is resumed
+            base = {"processed": job.processed, "failed": job.failed, "from_memory": job.from_memory}
+            pipeline = TranslationPipeline(targets, packed=packed)
+            self.running[job_id] = (pipeline, base)
+            task = asyncio.current_task()
+
+            async def checkpoint_loop():
+                while True:
+                    await asyncio.sleep(Config.JOB_CHECKPOINT_SECONDS)
+                    # Renews the lease; no row means the job was cancelled elsewhere or taken over
+                    updated = await self._checkpoint(
+                        job_id, pipeline, base, TranslationJob.status == "running", lease_expires_at=self._lease()
+                    )
+                    if updated == 0:
+                        logger.warning(f"Translation job {job_id} was cancelled or taken over; stopping")
+                        task.cancel()
+                        return
+
+            checkpointer = asyncio.create_task(checkpoint_loop())
+            await pipeline.run()
+            checkpointer.cancel()
+            await self._checkpoint(job_id, pipeline, base, status="completed", finished_at=datetime.now())
+            logger.info(f"Translation job {job_id} completed: {pipeline.stats()}")
+        except asyncio.CancelledError:
+            if pipeline is not None:
+                await self._checkpoint(job_id, pipeline, base, status="cancelled", finished_at=datetime.now())
+            else:
+                await self._update(job_id, status="cancelled", finished_at=datetime.now())
+            logger.warning(f"Translation job {job_id} cancelled")
+        except Exception as e:
+            logger.exception(f"Translation job {job_id} failed: {str(e)}")
+            if pipeline is not None:
+                await self._checkpoint(job_id, pipeline, base, status="failed", error=str(e), finished_at=datetime.now())
+            else:
+                await self._update(job_id, status="failed", error=str(e), finished_at=datetime.now())
+        finally:
+            if checkpointer is not None:
+                checkpointer.cancel()
+            self.running.pop(job_id, None)
+
+    async def progress(self, db: AsyncSession, job_id: str) -> Optional[dict]:
+        job = await db.get(TranslationJob, job_id, populate_existing=True)
+        if job is None:
+            return None
+
+        processed, failed, from_memory = job.processed, job.failed, job.from_memory
+        per_second = None
+        if job_id in self.running and job.status == "running":
+            # Live counters are ahead of the last checkpoint
+            pipeline, base = self.running[job_id]
+            processed = base["processed"] + pipeline.processed
+            failed = base["failed"] + pipeline.failed
+            from_memory = base["from_memory"] + pipeline.remembered + pipeline.reused
+            per_second = pipeline.stats()["per_second"]
+
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "targets": [code for _, code in json.loads(job.targets)],
+            "total": job.total,
+            "processed": processed,
+            "failed": failed,
+            "from_memory": from_memory,
+            "remaining": max(0, job.total - processed - failed),
+            "per_second": per_second,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    async def cancel(self, db: AsyncSession, job_id: str) -> bool:
+        """
+        Cancel a job; in-flight OpenAI calls are cancelled with the task. A job
+        running in another process is marked cancelled and stops at its
+        owner's next checkpoint.
+        """
+        task = self.tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            return True
+
+        result = await db.execute(
+            update(TranslationJob).where(
+                TranslationJob.id == job_id,
+                TranslationJob.status.in_(ACTIVE_STATUSES)
+            ).values(status="cancelled", finished_at=datetime.now()).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return bool(result.rowcount)
+
+    async def resume_incomplete(self):
+        """Restart active jobs that no live process holds a lease on."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(TranslationJob).where(
+                TranslationJob.status.in_(ACTIVE_STATUSES),
+                or_(
+                    TranslationJob.owner.is_(None),
+                    TranslationJob.owner == self.owner,
+                    TranslationJob.lease_expires_at < datetime.now()
+                )
+            ))
+            jobs = result.scalars().all()
+        for job in jobs:
+            if job.id in self.tasks:
+                continue
+            logger.info(f"Resuming translation job {job.id}")
+            self._start(job.id, [tuple(t) for t in json.loads(job.targets)], bool(job.packed))
+
+    def start_watcher(self):
+        """Pick up the jobs of crashed processes once their leases expire."""
+        async def watch():
+            while True:
+                try:
+                    await self.resume_incomplete()
+                except Exception as e:
+                    logger.error(f"Job watcher failed: {str(e)}")
+                await asyncio.sleep(Config.JOB_LEASE_SECONDS)
+
+        self.watcher = asyncio.create_task(watch())
+
+    def stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.cancel()
+            self.watcher = None
+
+
+job_manager = JobManager()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from config.config import Config
+from config.database import AsyncSessionLocal
+from config.logger import logger
+from models.language_local_model import LanguageLocale
+
+
+@dataclass(frozen=True)
+class LocaleInfo:
+    id: int
+    language: str
+    language_code: str
+    language_name: str
+    is_enable: int
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    locales: Tuple[LocaleInfo, ...]
+    by_language: Dict[str, LocaleInfo]
+    by_code: Dict[str, LocaleInfo]
+    loaded_at: float
+
+
+class LocaleRegistry:
+    """
+    In-process copy of language_locales.
+
+    Lookups are served from an immutable snapshot. When the snapshot is older
+    than `ttl` it is still served while a background task reloads it, so
+    requests never wait on the database once the first load is done.
+    invalidate() drops the snapshot so the next lookup reloads it right away;
+    other workers pick the change up within the TTL.
+    """
+
+    def __init__(self, ttl: float = Config.LOCALE_CACHE_TTL, session_factory: Callable = AsyncSessionLocal):
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Bumped by invalidate() so a load that raced with it is not kept
+        self._generation = 0
+
+    async def load(self) -> _Snapshot:
+        """Reload from the database (one query). Concurrent callers share the load."""
+        started = time.monotonic()
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.loaded_at >= started:
+                return snapshot
+            generation = self._generation
+            async with self.session_factory() as db:
+                result = await db.execute(select(
+                    LanguageLocale.id,
+                    LanguageLocale.language,
+                    LanguageLocale.language_code,
+                    LanguageLocale.language_name,
+                    LanguageLocale.is_enable
+                ).order_by(LanguageLocale.id))
+                locales = tuple(LocaleInfo(*row) for row in result)
+
+            by_language: Dict[str, LocaleInfo] = {}
+            by_code: Dict[str, LocaleInfo] = {}
+            for locale in locales:
+                # First row wins, like the LIMIT 1 lookups this replaces
+                by_language.setdefault(locale.language, locale)
+                by_code.setdefault(locale.language_code, locale)
+            snapshot = _Snapshot(locales, by_language, by_code, time.monotonic())
+            if generation == self._generation:
+                self._snapshot = snapshot
+            logger.info(f"Loaded {len(locales)} locales")
+            return snapshot
+
+    def invalidate(self):
+        """Forget the snapshot; safe to call from worker threads."""
+        self._generation += 1
+        self._snapshot = None
+
+    async def _refresh(self):
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Locale registry refresh failed: {str(e)}")
+
+    async def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.load()
+        if time.monotonic() - snapshot.loaded_at > self.ttl and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return snapshot
+
+    async def get(self, language: str) -> Optional[LocaleInfo]:
+        return (await self._current()).by_language.get(language)
+
+    async def get_by_code(self, lang_code: str) -> Optional[LocaleInfo]:
+        return (await self._current()).by_code.get(lang_code)
+
+    async def code_for(self, language: str) -> Optional[str]:
+        locale = await self.get(language)
+        return locale.language_code if locale else None
+
+    async def name_for(self, lang_code: str) -> Optional[str]:
+        locale = await self.get_by_code(lang_code)
+        return locale.language if locale else None
+
+    async def enabled(self) -> List[LocaleInfo]:
+        return [locale for locale in (await self._current()).locales if locale.is_enable == 1]
+
+    async def languages(self) -> List[str]:
+        """Distinct language names, in id order."""
+        return list((await self._current()).by_language)
+
+
+locale_registry = LocaleRegistry()
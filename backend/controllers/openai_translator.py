@@ -0,0 +1,244 @@
+import asyncio
+import json
+from typing import Dict, List, Tuple, Union
+from pydantic import BaseModel
+from config.config import Config
+from config.logger import logger
+from config.openai_client import call_openai
+from controllers.translation_memory import prompt_version
+
+OPENAI_MODEL = "gpt-4o-2024-08-06"
+
+SYSTEM_PROMPT = (
+    "You are a professional POS translator. Translate text while EXACTLY preserving: "
+    "• Punctuation, numbers, symbols, and formatting\n"
+    "NEVER add/remove quotes or other characters.\n"
+    "Return ONLY the translated text."
+    "\nSTRICTLY DO NOT ADD ANY UNWANTED PUNCTUATION MARKS APPART FROM THE GIVEN"
+)
+
+PACKED_INSTRUCTIONS = (
+    "You will receive a JSON array of objects with an \"index\" and a \"text\". "
+    "Translate every text independently and return exactly one item per input, "
+    "with the same index. Do not merge, split, skip or reorder items."
+)
+
+MULTI_TARGET_INSTRUCTIONS = (
+    "You will receive a JSON array of objects with an \"index\" and a \"text\", and a list of "
+    "target languages with their codes. Translate every text into every target language and "
+    "return exactly one item per input with the same index, containing one translation per "
+    "language code. Do not merge, split, skip or reorder items."
+)
+
+# Translation memory entries are only reused for the same model and prompts
+PROMPT_VERSION = prompt_version(OPENAI_MODEL, SYSTEM_PROMPT, PACKED_INSTRUCTIONS, MULTI_TARGET_INSTRUCTIONS)
+
+# Rough per-item framing cost of the packed JSON payload ({"index": n, "text": "..."})
+PACKED_ITEM_OVERHEAD_TOKENS = 8
+
+
+class TranslationResult(BaseModel):
+    translated_text: str
+
+
+class PackedTranslation(BaseModel):
+    index: int
+    translated_text: str
+
+
+class PackedTranslationResult(BaseModel):
+    translations: List[PackedTranslation]
+
+
+class PackedResponseMismatch(ValueError):
+    """Raised when a packed response does not map one-to-one onto its inputs."""
+
+
+def estimate_tokens(text: str) -> int:
+    # ~3 characters per token is a conservative estimate for UI strings across our scripts
+    return len(text) // 3 + 1
+
+
+def estimate_request_tokens(system_prompt: str, user_content: str, payload: str, targets: int = 1) -> int:
+    """Prompt tokens plus the expected output (roughly the payload once per target language)."""
+    return estimate_tokens(system_prompt) + estimate_tokens(user_content) + estimate_tokens(payload) * targets
+
+
+def pack_msgids(
+    msgids: List[str],
+    max_tokens: int = Config.TRANSLATION_PACK_TOKENS,
+    max_items: int = Config.TRANSLATION_PACK_ITEMS
+) -> List[List[str]]:
+    """Group msgids into chunks that stay under the token budget and item cap."""
+    chunks = []
+    current = []
+    current_tokens = 0
+    for msgid in msgids:
+        cost = estimate_tokens(msgid) + PACKED_ITEM_OVERHEAD_TOKENS
+        if current and (current_tokens + cost > max_tokens or len(current) >= max_items):
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(msgid)
+        current_tokens += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def translate_single(text: str, lang_name: str) -> str:
+    user_content = f"Translate the following to {lang_name} exactly as requested:\n\n{text}"
+    response = await call_openai(
+        lambda client: client.responses.parse(
+            model=OPENAI_MODEL,
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            text_format=TranslationResult,
+        ),
+        estimate_request_tokens(SYSTEM_PROMPT, user_content, text)
+    )
+    return response.output_parsed.translated_text
+
+
+async def translate_packed(chunk: List[str], lang_name: str) -> List[str]:
+    """Translate a chunk in one request; raises PackedResponseMismatch if the answer is misaligned."""
+    payload = json.dumps(
+        [{"index": i, "text": text} for i, text in enumerate(chunk)],
+        ensure_ascii=False
+    )
+    system_prompt = f"{SYSTEM_PROMPT}\n{PACKED_INSTRUCTIONS}"
+    user_content = f"Translate the following to {lang_name} exactly as requested:\n\n{payload}"
+    response = await call_openai(
+        lambda client: client.responses.parse(
+            model=OPENAI_MODEL,
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
+            ],
+            text_format=PackedTranslationResult,
+        ),
+        estimate_request_tokens(system_prompt, user_content, payload)
+    )
+    parsed = response.output_parsed
+    if parsed is None:
+        raise PackedResponseMismatch("Empty packed response")
+
+    by_index = {}
+    for item in parsed.translations:
+        if item.index in by_index or not 0 <= item.index < len(chunk):
+            raise PackedResponseMismatch(f"Unexpected or duplicate index {item.index}")
+        by_index[item.index] = item.translated_text
+
+    if len(by_index) != len(chunk):
+        raise PackedResponseMismatch(f"Expected {len(chunk)} translations, got {len(by_index)}")
+    for i, text in enumerate(chunk):
+        if text.strip() and not by_index[i].strip():
+            raise PackedResponseMismatch(f"Empty translation for index {i}")
+
+    return [by_index[i] for i in range(len(chunk))]
+
+
+async def translate_chunk(chunk: List[str], lang_name: str) -> Dict[str, Union[str, Exception]]:
+    """
+    Translate a packed chunk, falling back to one request per string when the
+    packed answer cannot be trusted. Returns {msgid: translation or exception}.
+    """
+    if len(chunk) > 1:
+        try:
+            translations = await translate_packed(chunk, lang_name)
+            return dict(zip(chunk, translations))
+        except PackedResponseMismatch as e:
+            logger.warning(f"Packed response misaligned for {len(chunk)} strings, falling back: {str(e)}")
+        except Exception as e:
+            logger.error(f"Packed request failed for {len(chunk)} strings: {str(e)}")
+            return {text: e for text in chunk}
+
+    results = await asyncio.gather(*[translate_single(text, lang_name) for text in chunk], return_exceptions=True)
+    return dict(zip(chunk, results))
+
+
+class LanguageTranslation(BaseModel):
+    language_code: str
+    translated_text: str
+
+
+class MultiTargetTranslation(BaseModel):
+    index: int
+    translations: List[LanguageTranslation]
+
+
+class MultiTargetTranslationResult(BaseModel):
+    items: List[MultiTargetTranslation]
+
+
+async def translate_multi_target(chunk: List[str], targets: List[Tuple[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Translate a chunk into several languages in one request.
+    targets is a list of (language name, language code).
+    Returns {msgid: {language_code: translation}}; raises PackedResponseMismatch if misaligned.
+    """
+    payload = json.dumps(
+        [{"index": i, "text": text} for i, text in enumerate(chunk)],
+        ensure_ascii=False
+    )
+    languages = "\n".join(f"- {name} ({code})" for name, code in targets)
+    system_prompt = f"{SYSTEM_PROMPT}\n{MULTI_TARGET_INSTRUCTIONS}"
+    user_content = f"Target languages:\n{languages}\n\nTranslate the following exactly as requested:\n\n{payload}"
+    response = await call_openai(
+        lambda client: client.responses.parse(
+            model=OPENAI_MODEL,
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
+            ],
+            text_format=MultiTargetTranslationResult,
+        ),
+        estimate_request_tokens(system_prompt, user_content, payload, targets=len(targets))
+    )
+    parsed = response.output_parsed
+    if parsed is None:
+        raise PackedResponseMismatch("Empty multi-target response")
+
+    codes = {code for _, code in targets}
+    by_index = {}
+    for item in parsed.items:
+        if item.index in by_index or not 0 <= item.index < len(chunk):
+            raise PackedResponseMismatch(f"Unexpected or duplicate index {item.index}")
+        per_language = {t.language_code: t.translated_text for t in item.translations}
+        if set(per_language) != codes:
+            raise PackedResponseMismatch(f"Languages for index {item.index} do not match the request")
+        if chunk[item.index].strip() and not all(text.strip() for text in per_language.values()):
+            raise PackedResponseMismatch(f"Empty translation for index {item.index}")
+        by_index[item.index] = per_language
+
+    if len(by_index) != len(chunk):
+        raise PackedResponseMismatch(f"Expected {len(chunk)} items, got {len(by_index)}")
+
+    return {text: by_index[i] for i, text in enumerate(chunk)}
+
+
+async def translate_chunk_multi_target(
+    chunk: List[str],
+    targets: List[Tuple[str, str]]
+) -> Dict[str, Dict[str, Union[str, Exception]]]:
+    """
+    Multi-target counterpart of translate_chunk. A misaligned answer is retried
+    per language through the regular packed path.
+    Returns {language_code: {msgid: translation or exception}}.
+    """
+    if len(targets) > 1:
+        try:
+            translated = await translate_multi_target(chunk, targets)
+            return {code: {text: translated[text][code] for text in chunk} for _, code in targets}
+        except PackedResponseMismatch as e:
+            logger.warning(f"Multi-target response misaligned for {len(chunk)} strings, falling back: {str(e)}")
+        except Exception as e:
+            logger.error(f"Multi-target request failed for {len(chunk)} strings: {str(e)}")
+            return {code: {text: e for text in chunk} for _, code in targets}
+
+    results = await asyncio.gather(
+        *[translate_chunk(chunk, name) for name, _ in targets]
+    )
+    return {code: result for (_, code), result in zip(targets, results)}
@@ -1,47 +1,29 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException
-import subprocess
-import sys
-import os
+from fastapi.concurrency import run_in_threadpool
+import time
 from config.config import Config
+from config.logger import logger
+from controllers.catalog_dist import DIST_DIR, compile_and_publish, forget_manifests
+from utils.artifacts import MANIFEST_FILE as ARTIFACT_MANIFEST
+from utils.mo_file import MOCompileError
+from utils.po_file import POSyntaxError
 
 class POCompilerController:
     def __init__(self, po_dir: Path, po_file: str, mo_file: str):
         self.po_dir = po_dir
         self.po_file = po_file
         self.mo_file = mo_file
-        
-        # Set path to msgfmt based on OS
-        self.msgfmt_path = self._get_msgfmt_path()
-
-    def _get_msgfmt_path(self):
-        # Determine the correct msgfmt path based on the operating system
-        paths_to_try = []
-        
-        if sys.platform == "win32":
-            # Windows paths
-            paths_to_try = [
-                Config.msgfmt_path,
-                "msgfmt.exe"
-            ]
-        else:
-            # Linux/macOS paths
-            paths_to_try = [
-                "/usr/bin/msgfmt",
-                "/usr/local/bin/msgfmt",
-                "/opt/homebrew/bin/msgfmt",
-                "msgfmt"  
-            ]
-        
-        # Check which path exists
-        for path in paths_to_try:
-            if os.path.exists(path):
-                return path
-                
-        # Return the first option if none exist (will trigger proper error later)
-        return paths_to_try[0]
 
     def compile_po(self):
+        """Compile the PO file to MO in-process (same output as msgfmt) and publish it for download."""
         po_path = self.po_dir / self.po_file
         mo_path = self.po_dir / self.mo_file
 
@@ -52,52 +34,168 @@ class POCompilerController:
             )
 
         try:
-            # Run msgfmt command to compile PO to MO
-            cmd = [
-                self.msgfmt_path,
-                "-o", str(mo_path),
-                str(po_path)
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                cwd=str(self.po_dir),  # Execute in the PO directory
-                capture_output=True,
-                text=True,
-                check=True  # Raise exception on non-zero exit
-            )
-            
-            # Verify MO file was created
-            if not mo_path.exists():
-                raise RuntimeError("Compilation succeeded but MO file was not created")
-            
+            started = time.perf_counter()
+            size = compile_and_publish(str(po_path), str(mo_path))
+            forget_manifests()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
             return {
                 "status": "success",
                 "message": f"Compiled {po_path.name} → {mo_path.name}",
                 "mo_path": str(mo_path),
-                "output": result.stdout.strip() or "No output from msgfmt"
+                "output": f"{size} bytes written in {elapsed_ms:.1f} ms"
             }
-            
-        except subprocess.CalledProcessError as e:
-            # Extract clean error message
-            error_detail = e.stderr.strip() or f"Exit code {e.returncode}"
-            raise HTTPException(
-                status_code=500,
-                detail=f"{error_detail}"
-            )
-        except FileNotFoundError:
+
+        except (POSyntaxError, MOCompileError) as e:
             raise HTTPException(
                 status_code=500,
-                detail=(
-                    f"msgfmt not found at '{self.msgfmt_path}'. "
-                    "Please install gettext:\n"
-                    "Windows: Install from https://mlocati.github.io/articles/gettext-iconv-windows.html\n"
-                    "macOS: brew install gettext\n"
-                    "Linux: apt-get install gettext"
-                )
+                detail=f"{po_path.name}: {str(e)}"
             )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Unexpected error: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+
+PO_FILE = "salesplaypos.po"
+MO_FILE = "salesplaypos.mo"
+MANIFEST_FILE = ".compile_manifest.json"
+
+_compile_pool: Optional[ProcessPoolExecutor] = None
+_compile_lock = asyncio.Lock()
+
+
+def get_compile_pool() -> ProcessPoolExecutor:
+    global _compile_pool
+    if _compile_pool is None:
+        _compile_pool = ProcessPoolExecutor(max_workers=Config.COMPILE_WORKERS or None)
+    return _compile_pool
+
+
+def shutdown_compile_pool():
+    global _compile_pool
+    if _compile_pool is not None:
+        _compile_pool.shutdown(cancel_futures=True)
+        _compile_pool = None
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _compile_worker(po_path: str, mo_path: str) -> Tuple[int, float]:
+    """Runs in a pool process; returns (MO size, seconds)."""
+    started = time.perf_counter()
+    size = compile_and_publish(po_path, mo_path)
+    return size, time.perf_counter() - started
+
+
+def _load_manifest(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: str, manifest: Dict[str, dict]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _scan_locales(locales_dir: str, manifest: Dict[str, dict], force: bool) -> Tuple[List[dict], List[dict]]:
+    """Hash every catalog and split locales into cache hits and ones to compile."""
+    hits, misses = [], []
+    for lang_code in sorted(os.listdir(locales_dir)):
+        po_path = os.path.join(locales_dir, lang_code, "LC_MESSAGES", PO_FILE)
+        if not os.path.isfile(po_path):
+            continue
+        mo_path = os.path.join(locales_dir, lang_code, "LC_MESSAGES", MO_FILE)
+        started = time.perf_counter()
+        po_hash = file_sha256(po_path)
+        item = {
+            "lang_code": lang_code,
+            "po_path": po_path,
+            "mo_path": mo_path,
+            "po_sha256": po_hash,
+            "hash_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        previous = manifest.get(lang_code)
+        cached = (
+            not force
+            and previous is not None
+            and previous.get("po_sha256") == po_hash
+            and os.path.isfile(mo_path)
+            and os.path.getsize(mo_path) == previous.get("mo_size")
+            and os.path.isfile(os.path.join(locales_dir, lang_code, "LC_MESSAGES", DIST_DIR, ARTIFACT_MANIFEST))
+        )
+        (hits if cached else misses).append(item)
+    return hits, misses
+
+
+async def compile_all_locales(force: bool = False) -> dict:
+    """
+    Compile every locale's catalog whose content changed since its last
+    successful compile, in parallel on a process pool.
+    """
+    async with _compile_lock:
+        started = time.perf_counter()
+        locales_dir = Config.LOCALES_DIR
+        manifest_path = os.path.join(locales_dir, MANIFEST_FILE)
+        manifest = _load_manifest(manifest_path)
+        hits, misses = await run_in_threadpool(_scan_locales, locales_dir, manifest, force)
+
+        results = []
+        for item in hits:
+            results.append({
+                "lang_code": item["lang_code"],
+                "status": "cached",
+                "hash_ms": item["hash_ms"],
+                "compile_ms": 0.0,
+                "mo_path": item["mo_path"],
+            })
+
+        if misses:
+            loop = asyncio.get_running_loop()
+            pool = get_compile_pool()
+            outcomes = await asyncio.gather(
+                *[loop.run_in_executor(pool, _compile_worker, item["po_path"], item["mo_path"]) for item in misses],
+                return_exceptions=True
+            )
+            for item, outcome in zip(misses, outcomes):
+                result = {
+                    "lang_code": item["lang_code"],
+                    "hash_ms": item["hash_ms"],
+                    "mo_path": item["mo_path"],
+                }
+                if isinstance(outcome, Exception):
+                    logger.error(f"Compiling {item['po_path']} failed: {str(outcome)}")
+                    result.update(status="failed", compile_ms=None, error=str(outcome))
+                else:
+                    size, seconds = outcome
+                    result.update(status="compiled", compile_ms=round(seconds * 1000, 2), mo_size=size)
+                    manifest[item["lang_code"]] = {
+                        "po_sha256": item["po_sha256"],
+                        "mo_size": size,
+                        "compiled_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+                results.append(result)
+            await run_in_threadpool(_save_manifest, manifest_path, manifest)
+            forget_manifests()
+
+        results.sort(key=lambda r: r["lang_code"])
+        summary = {
+            "compiled": sum(r["status"] == "compiled" for r in results),
+            "cached": sum(r["status"] == "cached" for r in results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        logger.info(f"Compile-all finished: {summary}")
+        return {**summary, "locales": results}
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+from typing import List, Optional
+from config.config import Config
+from config.logger import logger
+from controllers.po_compiler import PO_FILE, get_compile_pool
+from utils.po_qa import RULES, write_qa_report
+
+
+def validate_rules(rules: Optional[List[str]]) -> Optional[List[str]]:
+    unknown = sorted(set(rules or ()) - set(RULES))
+    if unknown:
+        raise ValueError(f"Unknown QA rule(s): {', '.join(unknown)}. Available: {', '.join(RULES)}")
+    return rules or None
+
+
+def qa_report_path(lang_code: str) -> str:
+    return os.path.join(Config.QA_REPORT_DIR, f"{lang_code}.json")
+
+
+async def run_qa(lang_codes: Optional[List[str]] = None, rules: Optional[List[str]] = None) -> dict:
+    """
+    Check every locale's catalog (or the given ones) in parallel on the
+    compile process pool. Full reports go to QA_REPORT_DIR; the summary
+    has the per-rule counts of each locale.
+    """
+    rules = validate_rules(rules)
+    started = time.perf_counter()
+    os.makedirs(Config.QA_REPORT_DIR, exist_ok=True)
+
+    targets = []
+    for lang_code in sorted(lang_codes or os.listdir(Config.LOCALES_DIR)):
+        po_path = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES", PO_FILE)
+        if os.path.isfile(po_path):
+            targets.append((lang_code, po_path))
+
+    loop = asyncio.get_running_loop()
+    pool = get_compile_pool()
+    outcomes = await asyncio.gather(
+        *[loop.run_in_executor(pool, write_qa_report, po_path, rules, qa_report_path(lang_code)) for lang_code, po_path in targets],
+        return_exceptions=True
+    )
+
+    locales = []
+    for (lang_code, po_path), outcome in zip(targets, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"QA of {po_path} failed: {str(outcome)}")
+            locales.append({"lang_code": lang_code, "status": "failed", "error": str(outcome)})
+        else:
+            locales.append({"lang_code": lang_code, "status": "checked", "report": qa_report_path(lang_code), **outcome})
+
+    summary = {
+        "locales_checked": sum(item["status"] == "checked" for item in locales),
+        "failed": sum(item["status"] == "failed" for item in locales),
+        "issue_count": sum(item.get("issue_count", 0) for item in locales),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.info(f"QA finished: {summary}")
+    return {**summary, "locales": locales}
@@ -0,0 +1,98 @@
+import os
+from collections import Counter
+from typing import Iterable, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from config.logger import logger
+from controllers.change_log import mark_catalog_written, record_changes
+from controllers.translation_controller import catalog_path, refresh_po_header, upsert_uploaded_msgids
+from controllers.translations_store import forget_translations, record_translations
+from utils.po_diff import CHANGE_KINDS, POChange, apply_changes, diff_catalogs
+from utils.po_file import read_po, write_po
+
+# Removals are only applied when asked for explicitly
+DEFAULT_APPLY_KINDS = ("added", "changed", "whitespace")
+
+
+def diff_files(live_path: str, corrected_path: str) -> Tuple[List[POChange], int]:
+    return diff_catalogs(read_po(live_path), read_po(corrected_path))
+
+
+def _write_reconciled(live_path: str, tmp_path: str, changes: List[POChange]) -> int:
+    def entries():
+        for entry in apply_changes(read_po(live_path), changes):
+            if entry.is_header:
+                refresh_po_header(entry)
+            yield entry
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        return write_po(f, entries())
+
+
+async def reconcile_catalog(
+    db: AsyncSession,
+    lang_code: str,
+    corrected_path: str,
+    kinds: Iterable[str] = DEFAULT_APPLY_KINDS,
+    dry_run: bool = True
+) -> dict:
+    """
+    Diff a corrected catalog against the locale's live PO file and, unless
+    dry_run, apply the changes of the chosen kinds. The language flags, the
+    normalized translations and the change log are updated in one
+    transaction; the rewritten PO file is swapped in just before it commits.
+
+    Removed entries and the old spelling of a corrected msgid keep their
+    language flag: marking them pending would have the next translation run
+    put them back into the catalog.
+    """
+    kinds = set(kinds)
+    unknown = kinds - set(CHANGE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown change kind(s): {', '.join(sorted(unknown))}. Use {', '.join(CHANGE_KINDS)}")
+    live_path = catalog_path(lang_code)
+    if not os.path.isfile(live_path):
+        raise FileNotFoundError(f"No catalog for {lang_code}")
+
+    changes, unchanged = await run_in_threadpool(diff_files, live_path, corrected_path)
+    selected = [change for change in changes if change.kind in kinds]
+    result = {
+        "unchanged": unchanged,
+        "counts": dict(Counter(change.kind for change in changes)),
+        "applied": 0,
+        "dry_run": dry_run,
+        "changes": [change.as_dict() for change in changes],
+    }
+    if dry_run or not selected:
+        return result
+
+    # The database only knows context-free singular msgids
+    plain = [change for change in selected if change.msgctxt is None and (change.entry is None or change.entry.msgid_plural is None)]
+    translated = {change.msgid: change.new for change in plain if change.kind != "removed" and change.new}
+    cleared = [change.msgid for change in plain if change.kind == "removed" or not change.new]
+    cleared += [change.old_msgid for change in plain if change.old_msgid is not None]
+    catalog_changes = {msgid: None for msgid in cleared}
+    catalog_changes.update(translated)
+
+    tmp_path = live_path + ".reconcile"
+    try:
+        await run_in_threadpool(_write_reconciled, live_path, tmp_path, selected)
+        if translated:
+            await upsert_uploaded_msgids(db, lang_code, list(translated))
+        await forget_translations(db, lang_code, cleared)
+        await record_translations(db, lang_code, translated)
+        version = await record_changes(db, lang_code, catalog_changes)
+        # Swapped in before the commit, while the caller's locale lock still holds
+        os.replace(tmp_path, live_path)
+        await mark_catalog_written(db, lang_code, version)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    result["applied"] = len(selected)
+    logger.info(f"Reconciled {lang_code}: applied {len(selected)} of {len(changes)} changes")
+    return result
@@ -0,0 +1,43 @@
+import os
+from typing import Dict, Iterable, Optional, Tuple
+from config.config import Config
+from config.logger import logger
+from utils.mo_reader import MOCatalog
+
+MO_FILE = "salesplaypos.mo"
+
+# lang_code -> ((inode, mtime_ns, size), catalog)
+_catalogs: Dict[str, Tuple[Tuple[int, int, int], MOCatalog]] = {}
+
+
+def mo_path(lang_code: str) -> str:
+    return os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES", MO_FILE)
+
+
+def get_catalog(lang_code: str) -> Optional[MOCatalog]:
+    """
+    The mapped MO catalog of a locale, or None when it has not been compiled.
+    Compiles replace the file atomically, so a changed inode/mtime/size means
+    a new catalog; the old mapping stays valid until nothing references it.
+    """
+    path = mo_path(lang_code)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _catalogs.pop(lang_code, None)
+        return None
+
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _catalogs.get(lang_code)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    catalog = MOCatalog(path)
+    _catalogs[lang_code] = (signature, catalog)
+    logger.info(f"Mapped {path} ({catalog.count} messages)")
+    return catalog
+
+
+def lookup_many(catalog: MOCatalog, msgids: Iterable[str], msgctxt: Optional[str] = None) -> Dict[str, Optional[str]]:
+    # The empty msgid is the catalog header, not a translation
+    return {msgid: catalog.gettext(msgid, msgctxt) if msgid else None for msgid in msgids}
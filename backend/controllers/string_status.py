@@ -0,0 +1,212 @@
+"""
+Pending/translated status of every string per language.
+
+By default it is the language's 0/1 flag column in language_strings. With
+NORMALIZED_TRANSLATIONS it is the status of the string's row in
+`translations` instead, a string without a row being pending, so adding a
+language needs no schema change. Everything that reads or sets status goes
+through this module.
+"""
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
+from sqlalchemy import and_, func, inspect, select, text, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, FromClause
+from config.config import Config
+from config.logger import logger
+from controllers.locale_registry import locale_registry
+from models.language_strings_model import LanguageString, NON_FLAG_COLUMNS, pending_index_name
+from models.translation_model import Translation, TRANSLATION_PENDING
+
+# Keeps each UPDATE ... IN (...) statement small and well below MySQL packet limits
+STATUS_CHUNK_SIZE = 1000
+PENDING_PAGE_SIZE = 1000
+
+
+def flag_column(lang_code: str):
+    column = LanguageString.__table__.columns.get(lang_code)
+    if column is None or lang_code in NON_FLAG_COLUMNS:
+        raise ValueError(f"Invalid language column: {lang_code}")
+    return column
+
+
+def has_status(lang_code: str) -> bool:
+    """Whether status is tracked for a language code (any locale's, in normalized mode)."""
+    if Config.NORMALIZED_TRANSLATIONS:
+        return True
+    return lang_code not in NON_FLAG_COLUMNS and LanguageString.__table__.columns.get(lang_code) is not None
+
+
+async def _locale_id(lang_code: str) -> int:
+    locale = await locale_registry.get_by_code(lang_code)
+    if locale is None:
+        raise ValueError(f"Language code {lang_code} not found")
+    return locale.id
+
+
+async def status_source(lang_code: str) -> Tuple[FromClause, ColumnElement]:
+    """
+    (FROM clause, 0/1 status expression) for selecting language_strings rows
+    with their status in a language.
+    """
+    table = LanguageString.__table__
+    if not Config.NORMALIZED_TRANSLATIONS:
+        return table, flag_column(lang_code)
+    translations = Translation.__table__
+    source = table.outerjoin(translations, and_(
+        translations.c.string_id == table.c.id,
+        translations.c.locale_id == await _locale_id(lang_code)
+    ))
+    return source, func.coalesce(translations.c.status, TRANSLATION_PENDING)
+
+
+async def count_pending(db: AsyncSession, lang_code: str) -> int:
+    source, status = await status_source(lang_code)
+    result = await db.execute(select(func.count()).select_from(source).where(status == 0))
+    return result.scalar()
+
+
+async def iter_pending_pages(
+    db: AsyncSession,
+    lang_code: str,
+    page_size: int = PENDING_PAGE_SIZE,
+    after_id: int = 0
+) -> AsyncIterator[List[Tuple[int, str]]]:
+    """
+    Yield pages of (id, msgid) still pending (flag 0) for a language, in id
+    order. Each page is a keyset query (flag = 0 AND id > last) answered by a
+    range scan on the language's (flag, id) index, so the cost of a page does
+    not depend on how far into the table it is or on the table's size. In
+    normalized mode the scan is over the id range, with a primary key lookup
+    of each string's translations row.
+    """
+    source, status = await status_source(lang_code)
+    table = LanguageString.__table__
+    last_id = after_id
+    while True:
+        result = await db.execute(
+            select(table.c.id, table.c.msgid)
+            .select_from(source)
+            .where(status == 0, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(page_size)
+        )
+        page = [tuple(row) for row in result]
+        if not page:
+            return
+        last_id = page[-1][0]
+        yield page
+        if len(page) < page_size:
+            return
+
+
+def ensure_pending_indexes(engine: Engine) -> List[str]:
+    """
+    Create the (flag, id) index of every flag column that lacks one, including
+    columns added at runtime. On MySQL the indexes are built online
+    (ALGORITHM=INPLACE, LOCK=NONE) in a single ALTER. Returns the names created.
+    """
+    inspector = inspect(engine)
+    table_name = LanguageString.__tablename__
+    columns = [column["name"] for column in inspector.get_columns(table_name) if column["name"] not in NON_FLAG_COLUMNS]
+    indexed = {tuple(index["column_names"]) for index in inspector.get_indexes(table_name)}
+    missing = [code for code in columns if (code, "id") not in indexed]
+    if not missing:
+        return []
+
+    preparer = engine.dialect.identifier_preparer
+    clauses = [
+        f"ADD INDEX {preparer.quote(pending_index_name(code))} ({preparer.quote(code)}, {preparer.quote('id')})"
+        for code in missing
+    ]
+    with engine.begin() as connection:
+        if engine.dialect.name == "mysql":
+            connection.execute(text(
+                f"ALTER TABLE {preparer.quote(table_name)} {', '.join(clauses)}, ALGORITHM=INPLACE, LOCK=NONE"
+            ))
+        else:
+            for code in missing:
+                connection.execute(text(
+                    f"CREATE INDEX {preparer.quote(pending_index_name(code))} "
+                    f"ON {preparer.quote(table_name)} ({preparer.quote(code)}, {preparer.quote('id')})"
+                ))
+    logger.info(f"Created pending-work indexes on {', '.join(missing)}")
+    return [pending_index_name(code) for code in missing]
+
+
+async def set_language_flags(
+    db: AsyncSession,
+    lang_code: str,
+    msgids: Optional[Sequence[str]] = None,
+    ids: Optional[Sequence[int]] = None,
+    value: int = 1,
+    chunk_size: int = STATUS_CHUNK_SIZE
+) -> dict:
+    """
+    Set a language flag for many strings with chunked set-based UPDATEs.
+
+    Strings are selected either by msgid or by id; no rows are loaded.
+    Returns the number of keys requested, the number of rows matched and
+    the keys that do not exist. The caller owns the transaction.
+    """
+    if (msgids is None) == (ids is None):
+        raise ValueError("Pass either msgids or ids")
+    if Config.NORMALIZED_TRANSLATIONS:
+        return await _set_translation_status(db, lang_code, msgids, ids, value, chunk_size)
+
+    column = flag_column(lang_code)
+    key = LanguageString.__table__.c.msgid if ids is None else LanguageString.__table__.c.id
+    keys: List[Union[str, int]] = list(dict.fromkeys(msgids if ids is None else ids))
+
+    affected = 0
+    missing = []
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i:i + chunk_size]
+        result = await db.execute(
+            update(LanguageString.__table__).where(key.in_(chunk)).values({column: value})
+        )
+        # The MySQL driver reports matched rows (CLIENT_FOUND_ROWS), so rows
+        # that already had the value still count
+        matched = result.rowcount
+        affected += matched
+        if matched < len(chunk):
+            found = await db.execute(select(key).where(key.in_(chunk)))
+            existing = set(found.scalars())
+            missing.extend(k for k in chunk if k not in existing)
+
+    logger.info(f"Set {lang_code}={value} on {affected}/{len(keys)} strings")
+    return {"requested": len(keys), "affected": affected, "missing": missing}
+
+
+async def _set_translation_status(
+    db: AsyncSession,
+    lang_code: str,
+    msgids: Optional[Sequence[str]],
+    ids: Optional[Sequence[int]],
+    value: int,
+    chunk_size: int
+) -> dict:
+    """set_language_flags for normalized mode: upserts the strings' translations rows."""
+    locale_id = await _locale_id(lang_code)
+    table = LanguageString.__table__
+    key = table.c.msgid if ids is None else table.c.id
+    keys: List[Union[str, int]] = list(dict.fromkeys(msgids if ids is None else ids))
+
+    affected = 0
+    missing = []
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i:i + chunk_size]
+        found = await db.execute(select(key, table.c.id).where(key.in_(chunk)))
+        string_ids = dict(found.all())
+        missing.extend(k for k in chunk if k not in string_ids)
+        if not string_ids:
+            continue
+        stmt = insert(Translation.__table__).values([
+            {"string_id": string_id, "locale_id": locale_id, "status": value} for string_id in string_ids.values()
+        ])
+        await db.execute(stmt.on_duplicate_key_update(status=stmt.inserted.status))
+        affected += len(string_ids)
+
+    logger.info(f"Set {lang_code} status={value} on {affected}/{len(keys)} strings")
+    return {"requested": len(keys), "affected": affected, "missing": missing}
@@ -0,0 +1,94 @@
+import gzip
+import json
+from typing import Optional, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from config.config import Config
+from config.database import AsyncSessionLocal
+from controllers.change_log import latest_version, read_changes
+from controllers.locale_registry import locale_registry
+from controllers.translation_controller import catalog_path, load_catalog_translations
+
+# Payloads smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+
+
+async def build_sync_payload(lang_code: str, since: Optional[int], limit: int = Config.SYNC_PAGE_SIZE) -> dict:
+    """
+    What a client at catalog version `since` needs to catch up.
+
+    A delta lists the msgids changed or removed after `since`, collapsed to
+    their latest state, and the version to send next time. Only committed
+    versions are served and pages end on a version boundary, so a client
+    never skips part of a version. `more` tells the client to call again.
+    With no version, one from before the last catalog rewrite, one this
+    server never issued, or a single version larger than `limit`, the whole
+    catalog is sent with `reset` set, labelled with the catalog version: the
+    last one the PO file is known to hold.
+    """
+    locale = await locale_registry.get_by_code(lang_code)
+    if locale is None:
+        raise ValueError(f"Language code {lang_code} not found")
+
+    async with AsyncSessionLocal() as db:
+        version, reset_version, catalog_version = await latest_version(db, locale.id)
+        rows = []
+        more = False
+        if since is not None and reset_version <= since <= version:
+            rows = await read_changes(db, locale.id, since, version, limit + 1)
+            more = len(rows) > limit
+            if more:
+                # Drop the version the page cut through; it is sent whole next time
+                last = rows[limit][0]
+                rows = [row for row in rows[:limit] if row[0] != last]
+        if since is None or not reset_version <= since <= version or (more and not rows):
+            # The versions are read first, so the file holds everything up to
+            # catalog_version; whatever it already holds beyond that is simply
+            # sent again in the next delta
+            translations = await run_in_threadpool(load_catalog_translations, catalog_path(lang_code))
+            return {"version": catalog_version, "reset": True, "more": False, "changed": translations, "removed": []}
+
+    changed = {}
+    removed = set()
+    for _, msgid, msgstr in rows:
+        if msgstr is None:
+            changed.pop(msgid, None)
+            removed.add(msgid)
+        else:
+            removed.discard(msgid)
+            changed[msgid] = msgstr
+    return {
+        "version": rows[-1][0] if more else version,
+        "reset": False,
+        "more": more,
+        "changed": changed,
+        "removed": sorted(removed)
+    }
+
+
+def accepted_encodings(header: Optional[str]) -> Set[str]:
+    encodings = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def encode_sync_payload(payload: dict, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compact JSON, zstd- or gzip-compressed when the client accepts it. Returns (body, content encoding)."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+
+    accepted = accepted_encodings(accept_encoding)
+    if "zstd" in accepted:
+        try:
+            import zstandard
+            return zstandard.ZstdCompressor(level=10).compress(body), "zstd"
+        except ImportError:
+            pass
+    if "gzip" in accepted or "*" in accepted:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
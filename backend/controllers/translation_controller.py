@@ -1,41 +1,40 @@
 import os
 import re
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError, NoSuchTableError
+from typing import Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import NoSuchTableError
 # from openai import OpenAI
 from pydantic import BaseModel
 from config.config import Config
 from config.logger import logger
-from models.language_local_model import LanguageLocale
 from models.language_strings_model import LanguageString
+from controllers.string_status import STATUS_CHUNK_SIZE, has_status, iter_pending_pages, set_language_flags
+from controllers.translations_store import record_translations
+from controllers.change_log import mark_catalog_written, record_changes
+from controllers.locale_registry import locale_registry
+from utils.po_file import POEntry, dump_po, read_po, translation_map, write_po
+from utils.po_catalog import IncrementalPOCatalog
+from utils.po_diff import merge_translations
 from datetime import datetime
 import time
-from openai import AsyncOpenAI
-import asyncio
-from openai import AsyncOpenAI
 from typing import List, Tuple
 
 # os.environ.pop("SSL_CERT_FILE", None) 
 
-# client = OpenAI(api_key=Config.OPENAI_API_KEY)
-client = AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
-
-class TranslationResult(BaseModel):
-    translated_text: str
-
-
-def get_zero_msgids(db: Session, lang_column: str) -> List[str]:
+async def get_zero_msgids(db: AsyncSession, lang_column: str) -> List[str]:
     try:
         logger.info(f"Getting zero msgids for: {lang_column}")
-        if not hasattr(LanguageString, lang_column):
+        if not has_status(lang_column):
             error_msg = f"Invalid language column: {lang_column}"
             logger.error(error_msg)
             raise ValueError(error_msg)
             
-        column_attr = getattr(LanguageString, lang_column)
-        query = db.query(LanguageString.msgid).filter(column_attr == 0).order_by(LanguageString.id)
-        return [row.msgid for row in query.all()]
+        # Callers that can work page by page should use iter_pending_pages directly
+        msgids = []
+        async for page in iter_pending_pages(db, lang_column):
+            msgids.extend(msgid for _, msgid in page)
+        return msgids
     
 
     except NoSuchTableError:
@@ -47,165 +46,180 @@ def get_zero_msgids(db: Session, lang_column: str) -> List[str]:
         raise
 
 
-async def translate_msgids(db: Session, msgids: List[str], lang_name: str, lang_code: str) -> List[str]:
-    logger.info(f"Translating {len(msgids)} strings to {lang_name}")
-    translations = []
-    batch_size = 500  # Adjust based on your needs
-    max_concurrency = 20  # Max parallel requests
-    
-    # Define the system prompt
-    system_prompt = (
-        "You are a professional POS translator. Translate text while EXACTLY preserving: "
-        "• Punctuation, numbers, symbols, and formatting\n"
-        "NEVER add/remove quotes or other characters.\n"
-        "Return ONLY the translated text."
-        "\nSTRICTLY DO NOT ADD ANY UNWANTED PUNCTUATION MARKS APPART FROM THE GIVEN"
-    )
+async def mark_msgids_translated(
+    db: AsyncSession,
+    lang_code: str,
+    msgids: List[str],
+    changes: Optional[Dict[str, Optional[str]]] = None
+):
+    """
+    Set the language flag to 1 for the given msgids, log `changes` for
+    client sync (last, as record_changes requires) and commit. Returns the
+    change log version (0 when nothing was logged). A failed commit is
+    rolled back and re-raised, so the caller does not go on to write the
+    translations anywhere else.
+    """
+    if not msgids:
+        return 0
 
-    async def translate_text(text: str, client: AsyncOpenAI, semaphore: asyncio.Semaphore) -> str:
-        async with semaphore:
-            response = await client.responses.parse(
-                model="gpt-4o-2024-08-06",
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Translate the following to {lang_name} exactly as requested:\n\n{text}"}
-                ],
-                text_format=TranslationResult,
-            )
-            return response.output_parsed.translated_text
-
-    async def process_batch(batch_msgids: List[str]) -> Tuple[List[str], List[str]]:
-        """Translate a batch and return (translations, failed_msgids)"""
-        semaphore = asyncio.Semaphore(max_concurrency)
-        async with AsyncOpenAI() as client:
-            tasks = [translate_text(msgid, client, semaphore) for msgid in batch_msgids]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        batch_translations = []
-        failed_msgids = []
-        
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Error translating '{batch_msgids[i]}': {str(result)}")
-                batch_translations.append(batch_msgids[i])  # Use original on error
-                failed_msgids.append(batch_msgids[i])
-            else:
-                batch_translations.append(result)
-                print("###########@@@@@@@@@@@@@@@@@@@##############")
-                print(batch_translations)
-        
-        # return batch_translations, failed_msgids
-        return batch_translations
-    # Process in batches
-    for i in range(0, len(msgids), batch_size):
-        batch = msgids[i:i + batch_size]
-        logger.info(f"Processing batch {i//batch_size + 1}/{(len(msgids)-1)//batch_size + 1}")
-        
-        # batch_translations, failed_msgids = await process_batch(batch)
-        batch_translations = await process_batch(batch)
-        translations.extend(batch_translations)
-        
-        # Update database for successful translations
-        success_msgids = set(batch)
-        if success_msgids:
-            # Fetch records in bulk
-            records = db.query(LanguageString).filter(
-                LanguageString.msgid.in_(list(success_msgids))
-            ).all()
-            
-            # Create lookup dictionary
-            record_dict = {r.msgid: r for r in records}
-            not_found = []
-            
-            for msgid in success_msgids:
-                if msgid in record_dict:
-                    setattr(record_dict[msgid], lang_code, 1)
-                else:
-                    not_found.append(msgid)
-            
-            # Commit bulk updates
-            try:
-                db.commit()
-                for msgid in not_found:
-                    logger.warning(f"No record found for msgid: '{msgid}'")
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Database commit failed: {str(e)}")
-    
+    try:
+        result = await set_language_flags(db, lang_code, msgids=msgids)
+        version = await record_changes(db, lang_code, changes) if changes else 0
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Database commit failed: {str(e)}")
+        raise
+    for msgid in result["missing"]:
+        logger.warning(f"No record found for msgid: '{msgid}'")
+    return version
+
+
+async def get_enabled_targets(languages: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Return (language name, language code) for every enabled locale that has a
+    status column, optionally restricted to the given language names.
+    """
+    targets = []
+    for locale in await locale_registry.enabled():
+        language, code = locale.language, locale.language_code
+        if languages and language not in languages:
+            continue
+        if not has_status(code):
+            logger.warning(f"Skipping {language}: no status column '{code}'")
+            continue
+        targets.append((language, code))
+    return targets
+
+
+# po_path -> ((mtime_ns, size), {msgid: msgstr})
+_catalog_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+
+def catalog_path(lang_code: str) -> str:
+    return os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES", "salesplaypos.po")
+
+
+def load_catalog_translations(po_path: str) -> Dict[str, str]:
+    """
+    msgid -> msgstr for the usable translations of a catalog (no header,
+    obsolete, fuzzy or empty entries). The parsed map is cached until the
+    file's mtime or size changes, so repeated reads skip the parse.
+    """
+    try:
+        stat = os.stat(po_path)
+    except FileNotFoundError:
+        return {}
+    state = (stat.st_mtime_ns, stat.st_size)
+    cached = _catalog_cache.get(po_path)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    translations = translation_map(read_po(po_path))
+    _catalog_cache[po_path] = (state, translations)
+    logger.info(f"Loaded {len(translations)} translations from {po_path}")
     return translations
 
+
 #######################################################################################
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+import codecs
 import csv
-import os
-from io import BytesIO, StringIO
-import logging
-from typing import List
-
-def read_csv_file(content: bytes):
-    """Read CSV file with encoding detection"""
-    # Try common encodings in order
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'utf-16']
-    decoded_content = None
-    
-    for encoding in encodings:
-        try:
-            decoded_content = content.decode(encoding)
-            logger.info(f"Successfully decoded CSV using {encoding} encoding")
-            break
-        except UnicodeDecodeError:
-            continue
-    
-    if decoded_content is None:
-        raise HTTPException(
-            status_code=400,
-            detail="Unable to decode file. Supported encodings: UTF-8, Latin-1, CP1252, UTF-16"
-        )
-    
-    return decoded_content
+import tempfile
+from typing import Iterator, Sequence
+
+# Bytes copied per read while spooling an upload, and sniffed for the encoding
+UPLOAD_READ_SIZE = 1024 * 1024
+ENCODING_SNIFF_BYTES = 64 * 1024
+UPLOAD_EXTENSIONS = ("csv", "xlsx", "xls")
 
-def read_excel_file(content: bytes, file_extension: str):
-    """Read Excel file (XLSX or XLS)"""
+async def spool_upload(file: UploadFile, ext: str) -> str:
+    """Copy an upload to a temporary file under UPLOAD_DIR and return its path."""
+    os.makedirs(Config.UPLOAD_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=Config.UPLOAD_DIR, suffix=f".{ext}", delete=False) as spool:
+        while True:
+            data = await file.read(UPLOAD_READ_SIZE)
+            if not data:
+                break
+            spool.write(data)
+    return spool.name
+
+def sniff_encoding(path: str) -> str:
+    """Guess a CSV file's encoding from its first bytes"""
+    with open(path, "rb") as f:
+        prefix = f.read(ENCODING_SNIFF_BYTES)
+
+    # Our own CSV exports start with a UTF-8 BOM
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
     try:
-        if file_extension == 'xlsx':
-            from openpyxl import load_workbook
-            wb = load_workbook(filename=BytesIO(content))
-            sheet = wb.active
-            rows = sheet.iter_rows(values_only=True)
-            return list(rows)
-        
-        elif file_extension == 'xls':
-            import xlrd
-            book = xlrd.open_workbook(file_contents=content)
-            sheet = book.sheet_by_index(0)
-            return [sheet.row_values(row) for row in range(sheet.nrows)]
-        
+        # Not final: the prefix may end in the middle of a character
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        import chardet
+        guess = chardet.detect(prefix)
+        if guess["encoding"] and guess["confidence"] >= 0.5:
+            return guess["encoding"]
     except ImportError:
-        logger.error("Excel library not installed")
-        raise HTTPException(
-            status_code=500,
-            detail="Excel processing requires openpyxl for XLSX or xlrd for XLS files"
-        )
-    except Exception as e:
-        logger.error(f"Excel read error: {str(e)}")
+        pass
+    return "cp1252"
+
+def iter_upload_rows(path: str, ext: str) -> Iterator[Sequence]:
+    """Yield the rows of a spooled CSV, XLSX or XLS file one at a time"""
+    if ext == 'csv':
+        encoding = sniff_encoding(path)
+        logger.info(f"Reading CSV as {encoding}")
+        # cp1252 leaves a few bytes undefined; keep them rather than failing mid-file
+        errors = "strict" if encoding.startswith("utf") else "replace"
+        with open(path, "r", encoding=encoding, errors=errors, newline="") as f:
+            yield from csv.reader(f)
+
+    elif ext == 'xlsx':
+        from openpyxl import load_workbook
+        # Read-only mode streams the sheet XML instead of building every cell
+        wb = load_workbook(filename=path, read_only=True, data_only=True)
+        try:
+            yield from wb.active.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    elif ext == 'xls':
+        # Legacy format: xlrd has no streaming mode, sheets are loaded on demand
+        import xlrd
+        book = xlrd.open_workbook(path, on_demand=True)
+        try:
+            sheet = book.sheet_by_index(0)
+            for row in range(sheet.nrows):
+                yield sheet.row_values(row)
+        finally:
+            book.release_resources()
+
+    else:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid Excel file: {str(e)}"
+            detail="Unsupported file type. Use CSV, XLSX, or XLS"
         )
 
-def extract_translations_from_rows(rows: list):
-    """Extract translations from rows (CSV or Excel)"""
-    if len(rows) < 1:
+def iter_translation_chunks(rows: Iterator[Sequence], chunk_size: int) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Extract (msgid, msgstr) pairs from rows (CSV or Excel) in lists of
+    chunk_size. A msgid that appears again is skipped; the first row wins.
+    """
+    headers = next(rows, None)
+    if headers is None:
         raise HTTPException(
             status_code=400,
             detail="File is empty"
         )
-    
-    # Get header row
-    headers = [str(cell).lower() if cell else "" for cell in rows[0]]
-    
+
     # Find required columns
+    headers = [str(cell).lower() if cell else "" for cell in headers]
     try:
         msgid_index = headers.index("msgid")
         msgstr_index = headers.index("msgstr")
@@ -214,172 +228,280 @@ def extract_translations_from_rows(rows: list):
             status_code=400,
             detail="File must contain 'msgid' and 'msgstr' columns"
         )
-    
-    # Process data rows
-    msgids = []
-    translations = []
+
+    chunk = []
+    seen = set()
+    width = max(msgid_index, msgstr_index) + 1
     line_number = 1  # Start after header
-    
-    for row in rows[1:]:
+    for row in rows:
         line_number += 1
-        try:
-            # Handle different row formats (list vs tuple)
-            row_data = list(row) if isinstance(row, tuple) else row
-            
-            # Ensure row has enough columns
-            if len(row_data) <= max(msgid_index, msgstr_index):
-                raise ValueError(f"Missing values in row {line_number}")
-            
-            msgid = str(row_data[msgid_index]) if row_data[msgid_index] is not None else ""
-            msgstr = str(row_data[msgstr_index]) if row_data[msgstr_index] is not None else ""
-            
-            msgids.append(msgid)
-            translations.append(msgstr)
-            
-        except Exception as e:
-            logger.error(f"Error processing row {line_number}: {str(e)}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Error in row {line_number}: {str(e)}"
-            )
-    
-    return msgids, translations
+        if len(row) < width:
+            if not any(row):
+                continue
+            if len(row) <= msgid_index:
+                logger.error(f"Error processing row {line_number}: missing msgid")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Error in row {line_number}: Missing msgid in row {line_number}"
+                )
+            # Read-only XLSX and short CSV rows drop trailing empty cells
+            row = list(row) + [None] * (width - len(row))
+
+        msgid = str(row[msgid_index]) if row[msgid_index] is not None else ""
+        msgstr = str(row[msgstr_index]) if row[msgstr_index] is not None else ""
+        # Spreadsheets often end in formatted but empty rows
+        if not msgid or msgid in seen:
+            continue
+        seen.add(msgid)
+        chunk.append((msgid, msgstr))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-def process_uploaded_translations(db: Session, lang_code: str, msgids: List[str], translations: List[str]):
+async def upsert_uploaded_msgids(
+    db: AsyncSession,
+    lang_code: str,
+    msgids: List[str],
+    untranslated: Sequence[str] = ()
+) -> dict:
     """
-    Update database with uploaded translations
+    Mark uploaded msgids as translated and create the ones we do not have yet.
+    `untranslated` msgids (uploaded with an empty msgstr) keep their flag;
+    the new ones among them are created pending, for the next translation
+    run. The caller owns the transaction.
     """
-    # Verify equal length
-    if len(msgids) != len(translations):
-        raise ValueError("msgids and translations lists must have the same length")
-    
-    records = db.query(LanguageString).filter(
-        LanguageString.msgid.in_(msgids)
-    ).all()
-    
-    record_dict = {r.msgid: r for r in records}
-    not_found = []
-    
-    # Create new entries for missing msgids
-    for i, msgid in enumerate(msgids):
-        if msgid in record_dict:
-            # Update existing translation
-            setattr(record_dict[msgid], f"translation_{lang_code}", translations[i])
-        else:
-            # Create new record
-            new_record = LanguageString(
-                msgid=msgid,
-                **{f"translation_{lang_code}": translations[i]}
-            )
-            db.add(new_record)
-            not_found.append(msgid)
-    
-    try:
-        db.commit()
-        for msgid in not_found:
-            logger.info(f"Created new record for msgid: '{msgid}'")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database commit failed: {str(e)}")
-        raise
+    result = await set_language_flags(db, lang_code, msgids=msgids) if msgids else {"missing": []}
+    created = list(result["missing"])
+
+    untranslated = list(untranslated)
+    for i in range(0, len(untranslated), STATUS_CHUNK_SIZE):
+        chunk = untranslated[i:i + STATUS_CHUNK_SIZE]
+        found = await db.execute(select(LanguageString.msgid).where(LanguageString.msgid.in_(chunk)))
+        existing = set(found.scalars())
+        created += [msgid for msgid in chunk if msgid not in existing]
+
+    if created:
+        # New strings start pending; the translated ones are then flagged
+        await db.execute(insert(LanguageString.__table__), [{"msgid": msgid, "msgstr": msgid} for msgid in created])
+        logger.info(f"Created {len(created)} new records")
+        if result["missing"]:
+            await set_language_flags(db, lang_code, msgids=result["missing"])
+    return {**result, "missing": created}
+
+def _write_merged_catalog(
+    po_path: str,
+    tmp_path: str,
+    header: POEntry,
+    translations: Dict[str, str]
+) -> Dict[str, str]:
+    """Write the catalog at po_path (or a new one) with translations merged in; returns what changed."""
+    changed = {}
 
+    def entries():
+        if not os.path.exists(po_path):
+            yield header
+            return
+        for entry in read_po(po_path):
+            if entry.is_header:
+                refresh_po_header(entry)
+            yield entry
 
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        write_po(f, merge_translations(entries(), translations, changed))
+    return changed
+
+async def ingest_uploaded_translations(
+    db: AsyncSession,
+    language: str,
+    lang_code: str,
+    path: str,
+    ext: str,
+    chunk_size: int = Config.UPLOAD_CHUNK_SIZE
+) -> dict:
+    """
+    Stream a spooled upload into the database and the locale's PO file.
+
+    Rows are parsed in a worker thread and applied to the database chunk by
+    chunk; only the uploaded translations are kept until the end, never the
+    catalog. They are then merged into the PO file in one streaming pass,
+    written next to the old one and swapped in, so a bad row leaves both
+    untouched. An upload only adds and updates entries: msgids it leaves out
+    or leaves empty keep their translation. What changed goes to the change
+    log for client sync.
+    """
+    po_dir = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES")
+    os.makedirs(po_dir, exist_ok=True)
+    po_path = os.path.join(po_dir, "salesplaypos.po")
+    tmp_path = po_path + ".upload"
 
-def get_language_code_by_name(db: Session, language: str) -> Optional[str]:
+    translations = {}
+    changes = {}
+    processed = created = chunks = 0
     try:
-        logger.info(f"Getting language code for: {language}")
-        record = db.query(LanguageLocale.language_code).filter(
-            LanguageLocale.language == language
-        ).first()
-        return record[0] if record else None
-    except SQLAlchemyError as e:
-        logger.error(f"Database error: {str(e)}")
+        async for chunk in iterate_in_threadpool(iter_translation_chunks(iter_upload_rows(path, ext), chunk_size)):
+            result = await upsert_uploaded_msgids(
+                db,
+                lang_code,
+                [msgid for msgid, msgstr in chunk if msgstr],
+                [msgid for msgid, msgstr in chunk if not msgstr]
+            )
+            await record_translations(db, lang_code, {msgid: msgstr for msgid, msgstr in chunk if msgstr})
+            translations.update((msgid, msgstr) for msgid, msgstr in chunk if msgstr)
+            chunks += 1
+            processed += len(chunk)
+            created += len(result["missing"])
+            logger.info(f"Upload {language}: chunk {chunks} done, {processed} rows so far")
+
+        if not processed:
+            raise HTTPException(
+                status_code=400,
+                detail="No translations found in file"
+            )
+        changes = await run_in_threadpool(
+            _write_merged_catalog, po_path, tmp_path, po_header_entry(language, lang_code), translations
+        )
+        version = await record_changes(db, lang_code, changes)
+        # Swapped in before the commit, while the caller's locale lock still holds
+        os.replace(tmp_path, po_path)
+        await mark_catalog_written(db, lang_code, version)
+        await db.commit()
+    except UnicodeDecodeError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unable to decode file: {str(e)}"
+        )
+    except Exception:
+        await db.rollback()
         raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {"processed": processed, "created": created, "chunks": chunks, "changed": len(changes), "po_file_path": po_path}
+
+
+async def get_language_code_by_name(language: str) -> Optional[str]:
+    """Served from the in-process locale registry, without a database round trip."""
+    return await locale_registry.code_for(language)
 
 import zoneinfo
 tz = zoneinfo.ZoneInfo("Asia/Colombo")
 now = datetime.now(tz)
 ts = now.strftime("%Y-%m-%d %H:%M%z")
 
-def update_po_content(
-    existing_content: str,
-    lang_name: str,
-    new_msgids: List[str],
-    new_translations: List[str]
-) -> str:
-    # Get current date
+PO_HEADER_FIELDS = [
+    ("Project-Id-Version", "SalesPlay POS Translation-0.000"),
+    ("POT-Creation-Date", None),
+    ("PO-Revision-Date", None),
+    ("Last-Translator", "SalesPlay Team"),
+    ("Language-Team", "SalesPlay (Pvt) Ltd <support@nvision.lk>"),
+    ("Language", "en"),
+    ("MIME-Version", "1.0"),
+    ("Content-Type", "text/plain; charset=UTF-8"),
+    ("Content-Transfer-Encoding", "8bit"),
+    ("Plural-Forms", "nplurals=2; plural=n != 1;"),
+    ("X-Generator", "Poedit 3.0.1"),
+]
+
+
+def refresh_po_header(header: POEntry):
+    """Bump the comment date and PO-Revision-Date of a header entry in place."""
     current_date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Update the comment date
-    existing_content = re.sub(
-        r'(# date: )[\d-]+',
-        f'\\g<1>{current_date}',
-        existing_content
-    )
-    
-    existing_content = re.sub(
-        r'("PO-Revision-Date: )[\d:\s+-]+(?=\\n")',
-        f'\\g<1>{ts}',
-        existing_content
+    revision_date = datetime.now(tz).strftime("%Y-%m-%d %H:%M%z")
+    header.translator_comments = [
+        re.sub(r'^(date: )[\d-]+', f'\\g<1>{current_date}', comment)
+        for comment in header.translator_comments
+    ]
+    header.msgstr = re.sub(
+        r'(PO-Revision-Date: )[\d:\s+-]+?(?=\n|$)',
+        f'\\g<1>{revision_date}',
+        header.msgstr
     )
-    
-    # Extract the body (after the header)
-    header_end = existing_content.find('msgstr ""') + len('msgstr ""') + 1
-    header = existing_content[:header_end]
-    body = existing_content[header_end:]
-    
-    # Create lookup for existing translations
-    existing_translations = {}
-    for match in re.finditer(r'msgid "(.*?)"\nmsgstr "(.*?)"\n', body, re.DOTALL):
-        msgid = match.group(1).replace('\\"', '"').replace('\\n', '\n')
-        msgstr = match.group(2).replace('\\"', '"').replace('\\n', '\n')
-        existing_translations[msgid] = msgstr
-    
-    # Ensure proper spacing at end of body
-    if body and not body.endswith('\n\n'):
-        body = body.rstrip() + '\n\n'
-    
-    # Add new translations (only for missing msgids)
-    for msgid, translation in zip(new_msgids, new_translations):
-        if msgid not in existing_translations:
-            escaped_id = msgid.replace('"', '\\"').replace('\n', '\\n')
-            escaped_tr = translation.replace('"', '\\"').replace('\n', '\\n')
-            body += f'msgid "{escaped_id}"\n'
-            body += f'msgstr "{escaped_tr}"\n\n'
-    
-    return header + body
 
 
-# Original function remains for new file creation
+def po_header_entry(lang_name: str, lang_code: str) -> POEntry:
+    """The header entry we start every generated catalog with."""
+    return POEntry(
+        msgid="",
+        msgstr="".join(f"{key}: {value or ts}\n" for key, value in PO_HEADER_FIELDS),
+        translator_comments=[
+            'Autogenerated by SalesPlay Translate development',
+            '',
+            f'language: {lang_name}',
+            f'locale: {lang_code}',
+            f'date: {datetime.now().strftime("%Y-%m-%d")}',
+            '',
+        ]
+    )
+
 def generate_po_content(lang_name: str,lang_code: str, msgids: List[str], translations: List[str]) -> str:
     logger.info("Generating PO content")
-    content = [
-        '# Autogenerated by SalesPlay Translate development',
-        '#',
-        f'# language: {lang_name}',
-        f'# locale: {lang_code}',
-        f'# date: {datetime.now().strftime("%Y-%m-%d")}',
-        '#',
-        'msgid ""',
-        'msgstr ""',
-        '"Project-Id-Version: SalesPlay POS Translation-0.000\\n"',
-        f'"POT-Creation-Date: {ts}\\n"',
-        f'"PO-Revision-Date: {ts}\\n"',
-        '"Last-Translator: SalesPlay Team\\n"',
-        '"Language-Team: SalesPlay (Pvt) Ltd <support@nvision.lk>\\n"',
-        '"Language: en\\n"',
-        '"MIME-Version: 1.0\\n"',
-        '"Content-Type: text/plain; charset=UTF-8\\n"',
-        '"Content-Transfer-Encoding: 8bit\\n"',
-        '"Plural-Forms: nplurals=2; plural=n != 1;\\n"',
-        '"X-Generator: Poedit 3.0.1\\n"',
-        ''
-    ]
-    
-    for msgid, msgstr in zip(msgids, translations):
-        escaped_msgid = msgid.replace('"', '\\"').replace('\n', '\\n')
-        escaped_msgstr = msgstr.replace('"', '\\"').replace('\n', '\\n')
-        content.append(f'msgid "{escaped_msgid}"')
-        content.append(f'msgstr "{escaped_msgstr}"\n')
-    
-    return "\n".join(content)
\ No newline at end of file
+    header = po_header_entry(lang_name, lang_code)
+    entries = [POEntry(msgid=msgid, msgstr=msgstr) for msgid, msgstr in zip(msgids, translations)]
+    return dump_po([header] + entries)
+
+class PoCatalogAppender:
+    """
+    Appends entries to a locale's PO file as they are translated.
+    Known msgids are looked up in the catalog's sidecar index, so a flush
+    costs O(new entries) regardless of the catalog size.
+    """
+
+    def __init__(self, language: str, lang_code: str):
+        self.language = language
+        self.lang_code = lang_code
+        po_dir = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES")
+        os.makedirs(po_dir, exist_ok=True)
+        self.po_path = os.path.join(po_dir, "salesplaypos.po")
+        self.catalog = None
+        self.appended = 0
+        self.created = False
+
+    def append(self, msgids: List[str], translations: List[str]) -> int:
+        if self.catalog is None:
+            if not os.path.exists(self.po_path):
+                with open(self.po_path, "w", encoding="utf-8") as f:
+                    f.write(generate_po_content(self.language, self.lang_code, [], []))
+                self.created = True
+            self.catalog = IncrementalPOCatalog(self.po_path)
+
+        count = self.catalog.append(
+            POEntry(msgid=msgid, msgstr=translation)
+            for msgid, translation in zip(msgids, translations)
+            if msgid
+        )
+        self.appended += count
+        return count
+
+    def close(self) -> Optional[str]:
+        """Refresh the header dates once the run is done. Returns the action taken, if any."""
+        if self.catalog is None:
+            return None
+        try:
+            if not self.appended:
+                return None
+            if self.created:
+                return "created"
+
+            revision_date = datetime.now(tz).strftime("%Y-%m-%d %H:%M%z")
+            patched = self.catalog.patch_header(
+                {"PO-Revision-Date": revision_date},
+                comments={"date": datetime.now().strftime("%Y-%m-%d")}
+            )
+            if not patched:
+                # The old values have a different layout; rewrite the catalog once
+                logger.info(f"Rewriting {self.po_path} to refresh its header")
+
+                def refresh(entry: POEntry) -> POEntry:
+                    if entry.is_header:
+                        refresh_po_header(entry)
+                    return entry
+
+                self.catalog.compact(refresh)
+            return "updated"
+        finally:
+            self.catalog.close()
+            self.catalog = None
@@ -0,0 +1,82 @@
+import hashlib
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.mysql import insert
+from config.logger import logger
+from models.translation_memory_model import TranslationMemory
+
+# One indexed query per chunk keeps the IN-list well below MySQL packet limits
+LOOKUP_CHUNK_SIZE = 500
+
+
+def normalize_msgid(msgid: str) -> str:
+    """Canonical form used for the memory key (NFC, unix line endings)."""
+    return unicodedata.normalize("NFC", msgid.replace("\r\n", "\n"))
+
+
+def msgid_hash(msgid: str) -> str:
+    return hashlib.sha256(normalize_msgid(msgid).encode("utf-8")).hexdigest()
+
+
+def prompt_version(model: str, *prompts: str) -> str:
+    """Short fingerprint of the model and prompts; changing any of them invalidates the memory."""
+    return hashlib.sha256("\n".join((model,) + prompts).encode("utf-8")).hexdigest()[:16]
+
+
+async def lookup_translations(db: AsyncSession, msgids: List[str], lang_code: str, version: str) -> Dict[str, str]:
+    """
+    Bulk lookup of remembered translations.
+    Returns {msgid: translated_text} for every msgid that has a hit.
+    """
+    hits = {}
+    hashes = {}
+    for msgid in msgids:
+        hashes.setdefault(msgid_hash(msgid), []).append(msgid)
+
+    keys = list(hashes)
+    for i in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[i:i + LOOKUP_CHUNK_SIZE]
+        result = await db.execute(
+            select(TranslationMemory.msgid_hash, TranslationMemory.translated_text).where(
+                TranslationMemory.language_code == lang_code,
+                TranslationMemory.prompt_version == version,
+                TranslationMemory.msgid_hash.in_(chunk)
+            )
+        )
+        for row in result:
+            for msgid in hashes[row.msgid_hash]:
+                hits[msgid] = row.translated_text
+
+    logger.info(f"Translation memory: {len(hits)}/{len(msgids)} hits for {lang_code}")
+    return hits
+
+
+async def store_translations(db: AsyncSession, pairs: Iterable[Tuple[str, str]], lang_code: str, version: str) -> int:
+    """
+    Upsert (msgid, translation) pairs into the memory.
+    The caller owns the transaction and is expected to commit.
+    """
+    rows = {}
+    for msgid, translation in pairs:
+        key = msgid_hash(msgid)
+        rows[key] = {
+            "msgid_hash": key,
+            "language_code": lang_code,
+            "prompt_version": version,
+            "msgid": msgid,
+            "translated_text": translation,
+        }
+    if not rows:
+        return 0
+
+    values = list(rows.values())
+    for i in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        stmt = insert(TranslationMemory.__table__).values(values[i:i + LOOKUP_CHUNK_SIZE])
+        stmt = stmt.on_duplicate_key_update(
+            msgid=stmt.inserted.msgid,
+            translated_text=stmt.inserted.translated_text
+        )
+        await db.execute(stmt)
+    return len(values)
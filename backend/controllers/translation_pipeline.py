@@ -0,0 +1,311 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.config import Config
+from config.database import AsyncSessionLocal
+from config.logger import logger
+from controllers.translation_memory import lookup_translations, store_translations
+from controllers.openai_translator import (
+    PROMPT_VERSION,
+    pack_msgids,
+    translate_chunk,
+    translate_chunk_multi_target
+)
+from controllers.translation_controller import mark_msgids_translated, PoCatalogAppender
+from controllers.translations_store import record_translations
+from controllers.change_log import mark_catalog_written
+from controllers.string_status import iter_pending_pages
+from controllers.duplicate_controller import load_siblings
+from utils.near_duplicates import adapt_translation, surface_key
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class TranslationPipeline:
+    """
+    Bounded-queue translation pipeline.
+
+    producer -> work queue -> N workers -> result queue -> writer
+
+    The producer streams pending rows from the DB in keyset pages, serves
+    translation memory hits directly and packs the misses into request chunks.
+    Strings that differ from a translated or queued one only in whitespace,
+    case or final punctuation take its translation, adapted, instead of
+    being sent again.
+    A fixed pool of workers translates chunks and the writer commits status
+    flags, fills the translation memory and appends PO entries as results
+    arrive. Memory is bounded by the queue sizes, not by the number of
+    pending strings.
+    """
+
+    def __init__(
+        self,
+        targets: List[Tuple[str, str]],
+        packed: bool = True,
+        reuse_siblings: bool = Config.TRANSLATION_REUSE_SIBLINGS,
+        workers: int = Config.TRANSLATION_WORKERS,
+        page_size: int = Config.TRANSLATION_PAGE_SIZE,
+        flush_size: int = Config.TRANSLATION_FLUSH_SIZE,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal
+    ):
+        # The producer and the writer run concurrently, so each gets its own session
+        self.session_factory = session_factory
+        self.targets = targets
+        self.names = {code: name for name, code in targets}
+        self.packed = packed
+        self.reuse_siblings = reuse_siblings
+        # Per language: surface_key -> (msgid, translation), loaded on first use
+        self.siblings: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self.workers = workers
+        self.page_size = page_size
+        self.flush_size = flush_size
+        self.work_queue = asyncio.Queue(maxsize=workers * 2)
+        self.result_queue = asyncio.Queue(maxsize=workers * 4)
+        self.appenders = {code: PoCatalogAppender(name, code) for name, code in targets}
+
+        # Progress counters, per (msgid, language) pair
+        self.queued = 0
+        self.processed = 0
+        self.failed = 0
+        self.remembered = 0
+        self.reused = 0
+        self.started_at = None
+
+    async def _pending_pages(self, db: AsyncSession):
+        """
+        Yield pages of (id, msgid, [pending language codes]) in id order.
+        Each language is read with its own index-backed keyset scan and the
+        streams are merged by id, instead of one OR across unindexed columns.
+        """
+        codes = [code for _, code in self.targets]
+        scans = {code: iter_pending_pages(db, code, self.page_size) for code in codes}
+        buffers = {code: deque() for code in codes}
+        while True:
+            for code in codes:
+                if not buffers[code] and code in scans:
+                    page = await anext(scans[code], None)
+                    if page is None:
+                        del scans[code]
+                    else:
+                        buffers[code].extend(page)
+
+            active = [code for code in codes if buffers[code]]
+            if not active:
+                return
+            # Every id up to the smallest buffered maximum has been seen for all languages
+            bound = min(buffers[code][-1][0] for code in active)
+            merged = {}
+            for code in active:
+                buffer = buffers[code]
+                while buffer and buffer[0][0] <= bound:
+                    string_id, msgid = buffer.popleft()
+                    merged.setdefault(string_id, (msgid, []))[1].append(code)
+            yield [(string_id, msgid, pending) for string_id, (msgid, pending) in sorted(merged.items())]
+
+    async def _producer(self):
+        async with self.session_factory() as db:
+            await self._produce(db)
+
+        for _ in range(self.workers):
+            await self.work_queue.put(_DONE)
+
+    async def _produce(self, db: AsyncSession):
+        async for page in self._pending_pages(db):
+            remaining = {msgid: list(codes) for _, msgid, codes in page}
+            self.queued += sum(len(codes) for codes in remaining.values())
+
+            # Serve remembered translations without a request
+            for code in self.names:
+                msgids = [msgid for msgid, codes in remaining.items() if code in codes]
+                if not msgids:
+                    continue
+                remembered = await lookup_translations(db, msgids, code, PROMPT_VERSION)
+                if remembered:
+                    self.remembered += len(remembered)
+                    await self.result_queue.put((code, remembered, False))
+                    for msgid in remembered:
+                        remaining[msgid].remove(code)
+
+            if self.reuse_siblings:
+                await self._reuse_siblings(remaining)
+
+            # Strings with the same set of pending languages share requests
+            groups = {}
+            for msgid, codes in remaining.items():
+                if codes:
+                    groups.setdefault(tuple(codes), []).append(msgid)
+
+            for codes, msgids in groups.items():
+                # Only one string per surface form is sent; the others follow it
+                followers = {}
+                if self.reuse_siblings:
+                    leaders = {}
+                    for msgid in msgids:
+                        leader = leaders.setdefault(surface_key(msgid), msgid)
+                        if leader != msgid:
+                            followers.setdefault(leader, []).append(msgid)
+                    msgids = list(leaders.values())
+
+                max_items = max(1, Config.TRANSLATION_PACK_ITEMS // len(codes))
+                chunks = pack_msgids(msgids, max_items=max_items) if self.packed else [[m] for m in msgids]
+                for chunk in chunks:
+                    chunk_followers = {msgid: followers[msgid] for msgid in chunk if msgid in followers}
+                    await self.work_queue.put((chunk, list(codes), chunk_followers))
+
+            # Don't hold a read snapshot open while the workers are busy
+            await db.commit()
+
+    async def _reuse_siblings(self, remaining: Dict[str, List[str]]):
+        """Serve pending strings from catalog entries with the same surface_key."""
+        for code in self.names:
+            if code not in self.siblings:
+                self.siblings[code] = await run_in_threadpool(load_siblings, code)
+            siblings = self.siblings[code]
+            reused = {}
+            for msgid, codes in remaining.items():
+                if code not in codes:
+                    continue
+                sibling = siblings.get(surface_key(msgid))
+                # A string's own old entry is no sibling; it is pending for a reason
+                if sibling is not None and sibling[0] != msgid:
+                    reused[msgid] = adapt_translation(sibling[0], sibling[1], msgid)
+            if reused:
+                self.reused += len(reused)
+                await self.result_queue.put((code, reused, False))
+                for msgid in reused:
+                    remaining[msgid].remove(code)
+
+    async def _worker(self):
+        while True:
+            item = await self.work_queue.get()
+            if item is _DONE:
+                return
+            chunk, codes, followers = item
+            try:
+                if len(codes) == 1:
+                    results = {codes[0]: await translate_chunk(chunk, self.names[codes[0]])}
+                else:
+                    targets = [(self.names[code], code) for code in codes]
+                    results = await translate_chunk_multi_target(chunk, targets)
+            except Exception as e:
+                logger.error(f"Worker failed on {len(chunk)} strings: {str(e)}")
+                results = {code: {msgid: e for msgid in chunk} for code in codes}
+
+            for code, translations in results.items():
+                await self.result_queue.put((code, translations, True))
+                if followers:
+                    adapted = {}
+                    for leader, msgids in followers.items():
+                        result = translations.get(leader)
+                        for msgid in msgids:
+                            if isinstance(result, str):
+                                adapted[msgid] = adapt_translation(leader, result, msgid)
+                            elif result is not None:
+                                adapted[msgid] = result
+                    self.reused += sum(isinstance(result, str) for result in adapted.values())
+                    await self.result_queue.put((code, adapted, False))
+
+    async def _flush(self, db: AsyncSession, buffers: Dict[str, Dict[str, str]], fresh: Dict[str, Dict[str, str]]):
+        for code, translations in buffers.items():
+            if not translations:
+                continue
+            if fresh[code]:
+                await store_translations(db, fresh[code].items(), code, PROMPT_VERSION)
+            await record_translations(db, code, translations)
+            msgids = list(translations)
+            # Raises when the commit fails: nothing is appended for rolled-back flags
+            version = await mark_msgids_translated(db, code, msgids, changes=translations)
+            self.appenders[code].append(msgids, [translations[msgid] for msgid in msgids])
+            # Full resyncs are labelled with the last version the PO file holds
+            if version:
+                await mark_catalog_written(db, code, version)
+                await db.commit()
+            translations.clear()
+            fresh[code].clear()
+
+    async def _writer(self):
+        async with self.session_factory() as db:
+            await self._write(db)
+
+    async def _write(self, db: AsyncSession):
+        buffers = {code: {} for code in self.names}
+        fresh = {code: {} for code in self.names}
+        buffered = 0
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(self.result_queue.get(), timeout=Config.TRANSLATION_FLUSH_SECONDS)
+                except asyncio.TimeoutError:
+                    item = None
+
+                if item is _DONE:
+                    break
+                if item is not None:
+                    code, translations, from_api = item
+                    for msgid, result in translations.items():
+                        if isinstance(result, Exception):
+                            logger.error(f"Error translating '{msgid}' to {code}: {str(result)}")
+                            self.failed += 1
+                            continue
+                        buffers[code][msgid] = result
+                        if from_api:
+                            fresh[code][msgid] = result
+                            if code in self.siblings:
+                                self.siblings[code].setdefault(surface_key(msgid), (msgid, result))
+                        buffered += 1
+                        self.processed += 1
+
+                # Commit when the buffer is full or the stream has gone quiet
+                if buffered and (buffered >= self.flush_size or item is None):
+                    await self._flush(db, buffers, fresh)
+                    buffered = 0
+        finally:
+            # Keep what was already paid for, even when the run is cancelled
+            await self._flush(db, buffers, fresh)
+
+    async def run(self) -> dict:
+        self.started_at = time.monotonic()
+        writer = asyncio.create_task(self._writer())
+        stages = [asyncio.create_task(self._producer())]
+        stages += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+        async def finish():
+            await asyncio.gather(*stages)
+            await self.result_queue.put(_DONE)
+
+        try:
+            # Shielded so the writer is cancelled exactly once, below, and its final flush can finish
+            await asyncio.gather(finish(), asyncio.shield(writer))
+        except BaseException:
+            for task in stages + [writer]:
+                task.cancel()
+            # Let the writer commit what it already holds before giving up
+            await asyncio.gather(*stages, writer, return_exceptions=True)
+            raise
+
+        files = {}
+        for name, code in self.targets:
+            action = self.appenders[code].close()
+            if action:
+                files[name] = action
+        return self.stats(files)
+
+    def stats(self, files: Optional[dict] = None) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        result = {
+            "queued": self.queued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "from_memory": self.remembered,
+            "from_siblings": self.reused,
+            "elapsed_seconds": round(elapsed, 2),
+            "per_second": round(self.processed / elapsed, 2) if elapsed else 0.0,
+        }
+        if files is not None:
+            result["files"] = files
+        return result
+
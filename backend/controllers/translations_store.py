@@ -0,0 +1,137 @@
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.config import Config
+from config.logger import logger
+from controllers.change_log import mark_catalog_written, record_catalog_rewrite
+from controllers.locale_registry import locale_registry
+from models.language_strings_model import LanguageString
+from models.translation_model import Translation, TRANSLATION_DONE
+from utils.po_file import POEntry, write_po
+
+# Keys per IN-list / rows per multi-row INSERT
+STORE_CHUNK_SIZE = 1000
+CATALOG_FETCH_SIZE = 1000
+
+
+async def get_locale_id(lang_code: str) -> Optional[int]:
+    locale = await locale_registry.get_by_code(lang_code)
+    return locale.id if locale else None
+
+
+async def record_translations(db: AsyncSession, lang_code: str, translations: Dict[str, str]) -> int:
+    """
+    Upsert translated texts into the normalized table, marking them done.
+    A no-op unless NORMALIZED_TRANSLATIONS is enabled. The caller commits.
+    """
+    if not Config.NORMALIZED_TRANSLATIONS or not translations:
+        return 0
+
+    locale_id = await get_locale_id(lang_code)
+    if locale_id is None:
+        logger.warning(f"No locale row for {lang_code}; translations not recorded")
+        return 0
+
+    msgids = list(translations)
+    stored = 0
+    for i in range(0, len(msgids), STORE_CHUNK_SIZE):
+        chunk = msgids[i:i + STORE_CHUNK_SIZE]
+        result = await db.execute(
+            select(LanguageString.id, LanguageString.msgid).where(LanguageString.msgid.in_(chunk))
+        )
+        rows = [
+            {"string_id": string_id, "locale_id": locale_id, "text": translations[msgid], "status": TRANSLATION_DONE}
+            for string_id, msgid in result
+        ]
+        if not rows:
+            continue
+        stmt = insert(Translation.__table__).values(rows)
+        await db.execute(stmt.on_duplicate_key_update(text=stmt.inserted.text, status=stmt.inserted.status))
+        stored += len(rows)
+
+    logger.info(f"Recorded {stored} {lang_code} translations in {Translation.__tablename__}")
+    return stored
+
+
+async def forget_translations(db: AsyncSession, lang_code: str, msgids: List[str]) -> int:
+    """
+    Clear a locale's normalized text for msgids taken out of its catalog, so
+    /regenerate-po does not bring them back. Their status stays translated,
+    as their flags do in the other mode, so no translation run re-adds them.
+    A no-op unless NORMALIZED_TRANSLATIONS is enabled. The caller commits.
+    """
+    if not Config.NORMALIZED_TRANSLATIONS or not msgids:
+        return 0
+
+    locale_id = await get_locale_id(lang_code)
+    if locale_id is None:
+        return 0
+
+    removed = 0
+    for i in range(0, len(msgids), STORE_CHUNK_SIZE):
+        string_ids = select(LanguageString.id).where(LanguageString.msgid.in_(msgids[i:i + STORE_CHUNK_SIZE]))
+        result = await db.execute(
+            update(Translation.__table__).where(
+                Translation.locale_id == locale_id,
+                Translation.string_id.in_(string_ids)
+            ).values(text=None)
+        )
+        removed += result.rowcount
+    logger.info(f"Cleared {removed} {lang_code} translations in {Translation.__tablename__}")
+    return removed
+
+
+async def iter_catalog_rows(db: AsyncSession, locale_id: int) -> AsyncIterator[Tuple[str, str]]:
+    """Stream (msgid, text) of a locale's translated strings in string order."""
+    result = await db.stream(
+        select(LanguageString.msgid, Translation.text)
+        .join(Translation, Translation.string_id == LanguageString.id)
+        .where(Translation.locale_id == locale_id, Translation.status == TRANSLATION_DONE)
+        .order_by(Translation.string_id)
+        .execution_options(yield_per=CATALOG_FETCH_SIZE)
+    )
+    async for msgid, text in result:
+        if text:
+            yield msgid, text
+
+
+async def regenerate_catalog(db: AsyncSession, language: str, lang_code: str, header: POEntry) -> Tuple[str, int]:
+    """
+    Rebuild a locale's PO file from the normalized table. The file is written
+    next to the old one and swapped in before the transaction commits, so
+    readers never see a partial catalog and locks the caller holds cover the
+    swap; synced clients then fetch it in full. Returns (po_path, entries written).
+    """
+    po_dir = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES")
+    os.makedirs(po_dir, exist_ok=True)
+    po_path = os.path.join(po_dir, "salesplaypos.po")
+    tmp_path = po_path + ".regen"
+
+    count = 0
+    locale_id = await get_locale_id(lang_code)
+    if locale_id is None:
+        raise ValueError(f"Language code {lang_code} not found")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            write_po(f, [header])
+            batch = []
+            async for msgid, text in iter_catalog_rows(db, locale_id):
+                batch.append(POEntry(msgid=msgid, msgstr=text))
+                if len(batch) >= CATALOG_FETCH_SIZE:
+                    count += write_po(f, batch, append=True)
+                    batch = []
+            count += write_po(f, batch, append=True)
+        os.replace(tmp_path, po_path)
+        await mark_catalog_written(db, lang_code, await record_catalog_rewrite(db, lang_code))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Regenerated {po_path} for {language} with {count} entries")
+    return po_path, count
@@ -1,7 +1,8 @@
 from fastapi import HTTPException, UploadFile
 from pathlib import Path
 from config.logger import logger
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.language_strings_model import LanguageString
 import os
 from typing import Dict, List
@@ -28,7 +29,7 @@ async def handle_file_upload(file: UploadFile):
     return {"filename": file.filename}
 
 
-def insert_new_strings_from_file(db: Session) -> Dict[str, int | List[dict]]:
+async def insert_new_strings_from_file(db: AsyncSession) -> Dict[str, int | List[dict]]:
     try:
         filename = 'strings.txt'
         file_path = os.path.join('uploads', filename)
@@ -39,7 +40,8 @@ def insert_new_strings_from_file(db: Session) -> Dict[str, int | List[dict]]:
             lines = [line.strip() for line in f if line.strip()]
         
         # Fetch existing msgids from database
-        existing_msgids = {msgid for (msgid,) in db.query(LanguageString.msgid).all()}
+        result = await db.execute(select(LanguageString.msgid))
+        existing_msgids = set(result.scalars())
         
         to_insert = []
         skipped = []
@@ -58,7 +60,7 @@ def insert_new_strings_from_file(db: Session) -> Dict[str, int | List[dict]]:
         # Batch insert new records
         if to_insert:
             db.add_all(to_insert)
-            db.commit()
+            await db.commit()
             logger.info(f"Inserted {len(to_insert)} new records")
         
         return {
@@ -68,5 +70,5 @@ def insert_new_strings_from_file(db: Session) -> Dict[str, int | List[dict]]:
     
     except Exception as e:
         logger.error(f"Error inserting strings: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise
\ No newline at end of file
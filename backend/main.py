@@ -1,10 +1,22 @@
 from fastapi import FastAPI
 from config.logger import logger
 from routes.translation_routes import router as translation_router
-from routes import upload_route, get_languages_route, add_language_route, po_compiler_route, export_excel_route
+from routes import upload_route, get_languages_route, add_language_route, po_compiler_route, export_excel_route, job_route, lookup_route, sync_route, catalog_route, qa_route, reconcile_route, duplicates_route
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from config.config import Config
+from config.database import engine
+from config.openai_client import close_openai_client
+from controllers.po_compiler import shutdown_compile_pool
+from controllers.string_status import ensure_pending_indexes
+from controllers.change_log import ensure_sync_schema
+from models.translation_memory_model import TranslationMemory
+from models.translation_job_model import TranslationJob
+from models.translation_model import Translation
+from models.string_change_model import StringChange
+from controllers.job_manager import ensure_lease_columns, job_manager
+from controllers.locale_registry import locale_registry
 
 app = FastAPI()
 
@@ -15,17 +27,43 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compresses API responses and the frontend; responses that already carry a Content-Encoding pass through
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
 
 @app.on_event("startup")
 async def startup_event():
+    # Auxiliary tables are created on demand; the core tables are managed via queries.txt
+    TranslationMemory.__table__.create(bind=engine, checkfirst=True)
+    TranslationJob.__table__.create(bind=engine, checkfirst=True)
+    ensure_lease_columns(engine)
+    StringChange.__table__.create(bind=engine, checkfirst=True)
+    ensure_sync_schema(engine)
+    if Config.NORMALIZED_TRANSLATIONS:
+        Translation.__table__.create(bind=engine, checkfirst=True)
+    ensure_pending_indexes(engine)
+    await locale_registry.load()
+    job_manager.start_watcher()
     logger.info("Application started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    job_manager.stop_watcher()
+    await close_openai_client()
+    shutdown_compile_pool()
+
 app.include_router(translation_router, prefix="/api")
 app.include_router(po_compiler_route.router, prefix="/api/localization")
 app.include_router(upload_route.router, prefix="/api")
 app.include_router(get_languages_route.router, prefix="/api")
 app.include_router(add_language_route.router, prefix="/api")
 app.include_router(export_excel_route.router, prefix="/api")
+app.include_router(job_route.router, prefix="/api")
+app.include_router(lookup_route.router, prefix="/api")
+app.include_router(sync_route.router, prefix="/api")
+app.include_router(catalog_route.router, prefix="/api")
+app.include_router(qa_route.router, prefix="/api")
+app.include_router(reconcile_route.router, prefix="/api")
+app.include_router(duplicates_route.router, prefix="/api")
 
 # Mount frontend
 app.mount("/", StaticFiles(directory="../frontend", html=True), name="frontend")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Integer, TIMESTAMP, Text,func
+from sqlalchemy import Column, BigInteger, String, Integer, TIMESTAMP, Text, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -24,4 +24,18 @@ class LanguageString(Base):
     az_AZ = Column(Integer, default=0, comment='Azerbaijani')
     uz_UZ = Column(Integer, default=0, comment='Uzbek')
     si_SI = Column(Integer, default=0, comment='Sinhala')
-    last_update = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
\ No newline at end of file
+    last_update = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
+
+
+# Everything except these is a per-language 0/1 flag column
+NON_FLAG_COLUMNS = ("id", "msgid", "msgstr", "last_update")
+FLAG_COLUMNS = [column.name for column in LanguageString.__table__.columns if column.name not in NON_FLAG_COLUMNS]
+
+
+def pending_index_name(lang_code: str) -> str:
+    return f"idx_pending_{lang_code}"
+
+
+# (flag, id) makes "pending for a language, in id order" an index range scan
+for _code in FLAG_COLUMNS:
+    Index(pending_index_name(_code), LanguageString.__table__.c[_code], LanguageString.__table__.c.id)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, BigInteger, String, TIMESTAMP, Text, Index, func
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+class StringChange(Base):
+    """Append-only log of catalog changes; version is the catalog version clients sync from."""
+    __tablename__ = 'string_changes'
+
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    locale_id = Column(BigInteger, nullable=False, comment='language_locales.id')
+    version = Column(BigInteger, nullable=False, default=0, comment='sync_versions.version of the transaction that logged it')
+    msgid = Column(String(512, collation="utf8mb4_bin"), nullable=False)
+    msgstr = Column(Text(collation="utf8mb4_general_ci"), comment='NULL when the translation was removed')
+    changed_at = Column(TIMESTAMP, default=func.now(), nullable=True)
+
+    __table_args__ = (
+        # Deltas are range scans: WHERE locale_id = ? AND version > ? ORDER BY version, seq
+        Index('idx_locale_version', 'locale_id', 'version', 'seq'),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, TIMESTAMP, func
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+class SyncVersion(Base):
+    """Per-locale catalog version; bumped under a row lock in the transaction that logs the changes."""
+    __tablename__ = 'sync_versions'
+
+    locale_id = Column(BigInteger, primary_key=True, autoincrement=False, comment='language_locales.id')
+    version = Column(BigInteger, nullable=False, default=0)
+    reset_version = Column(BigInteger, nullable=False, default=0, comment='clients older than this get the whole catalog')
+    catalog_version = Column(BigInteger, nullable=False, default=0, comment='highest version the PO file is known to hold')
+    updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, BigInteger, String, CHAR, Integer, TIMESTAMP, Text, func
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+class TranslationJob(Base):
+    __tablename__ = 'translation_jobs'
+
+    id = Column(CHAR(32), primary_key=True)
+    targets = Column(Text, nullable=False, comment='JSON list of [language, language_code]')
+    packed = Column(Integer, nullable=False, default=1)
+    status = Column(String(16), nullable=False, default='queued', index=True)
+    total = Column(BigInteger, nullable=False, default=0)
+    processed = Column(BigInteger, nullable=False, default=0)
+    failed = Column(BigInteger, nullable=False, default=0)
+    from_memory = Column(BigInteger, nullable=False, default=0)
+    error = Column(Text)
+    # Process running the job; its lease is renewed at every checkpoint
+    owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(TIMESTAMP, nullable=True)
+    created_at = Column(TIMESTAMP, default=func.now(), nullable=True)
+    updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
+    finished_at = Column(TIMESTAMP, nullable=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, BigInteger, String, CHAR, TIMESTAMP, Text, Index, func
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+class TranslationMemory(Base):
+    __tablename__ = 'translation_memory'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    msgid_hash = Column(CHAR(64), nullable=False, comment='sha256 of the normalized msgid')
+    language_code = Column(String(48), nullable=False)
+    prompt_version = Column(CHAR(16), nullable=False, comment='hash of model + system prompt')
+    msgid = Column(String(512, collation="utf8mb4_bin"), nullable=False)
+    translated_text = Column(Text(collation="utf8mb4_general_ci"), nullable=False)
+    last_update = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('unique_memory', 'msgid_hash', 'language_code', 'prompt_version', unique=True),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, BigInteger, Integer, TIMESTAMP, Text, Index, func
+from sqlalchemy.ext.declarative import declarative_base
+
+Base = declarative_base()
+
+TRANSLATION_PENDING = 0
+TRANSLATION_DONE = 1
+
+class Translation(Base):
+    """One row per (string, locale); replaces the per-language flag columns when enabled."""
+    __tablename__ = 'translations'
+
+    string_id = Column(BigInteger, primary_key=True, comment='language_strings.id')
+    locale_id = Column(BigInteger, primary_key=True, comment='language_locales.id')
+    text = Column(Text(collation="utf8mb4_general_ci"))
+    status = Column(Integer, nullable=False, default=TRANSLATION_PENDING, comment='0 pending, 1 translated')
+    updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        # Pending work for a locale in string order, and changes since a watermark
+        Index('idx_locale_status', 'locale_id', 'status', 'string_id'),
+        Index('idx_locale_updated', 'locale_id', 'updated_at'),
+    )
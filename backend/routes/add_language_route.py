@@ -8,8 +8,9 @@ from controllers.add_language import add_language_locale
 
 router = APIRouter()
 
+# Runs in the threadpool: adding a column is blocking DDL on the sync session
 @router.post("/add-language")
-async def add_language_endpoint(
+def add_language_endpoint(
     locale_data: LanguageLocaleCreate,
     db: Session = Depends(get_db)
 ):
@@ -17,10 +18,13 @@ async def add_language_endpoint(
         print("///////////////////////////////")
         print(locale_data)
         result = add_language_locale(db, locale_data)
+        if result is None:
+            raise RuntimeError("Failed to create language locale")
         return {
-            "message": "Language locale and column added successfully",
+            "message": "Language locale and column added successfully" if result["column_added"]
+            else "Language locale added successfully",
             "locale_id": result["id"],  # Access dictionary key
-            "new_column": result["language_code"]
+            "new_column": result["language_code"] if result["column_added"] else None
         }
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
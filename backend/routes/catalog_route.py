@@ -0,0 +1,42 @@
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from controllers.catalog_dist import ARTIFACT_FORMS, etag_matches, resolve_artifact
+from controllers.sync_controller import accepted_encodings
+from controllers.translation_controller import get_language_code_by_name
+
+router = APIRouter()
+
+
+@router.get("/catalogs/{language}/{form}")
+async def download_catalog(language: str, form: str, request: Request):
+    """
+    The catalog as published by the last compile, in PO, MO or JSON form.
+    Served precompressed when the client accepts it; conditional requests
+    with a current ETag get 304 without reading the file.
+    """
+    if form not in ARTIFACT_FORMS:
+        raise HTTPException(status_code=400, detail=f"Unsupported form '{form}'. Use po, mo or json")
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    artifact = resolve_artifact(lang_code, form, accepted)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"No published catalog for {language}; compile it first")
+
+    headers = {"ETag": artifact.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), artifact.etags):
+        return Response(status_code=304, headers=headers)
+
+    if not os.path.isfile(artifact.path):
+        # Replaced by a compile since the manifest was cached
+        artifact = resolve_artifact(lang_code, form, accepted, refresh=True)
+        if artifact is None or not os.path.isfile(artifact.path):
+            raise HTTPException(status_code=404, detail=f"No published catalog for {language}; compile it first")
+        headers["ETag"] = artifact.etag
+
+    if artifact.encoding:
+        headers["Content-Encoding"] = artifact.encoding
+    return FileResponse(artifact.path, media_type=artifact.media_type, filename=artifact.filename, headers=headers)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.config import Config
+from config.database import get_async_db
+from config.logger import logger
+from controllers.duplicate_controller import duplicate_report
+
+router = APIRouter()
+
+
+@router.get("/duplicates")
+async def get_duplicates(threshold: float = Config.NEAR_DUPLICATE_THRESHOLD, db: AsyncSession = Depends(get_async_db)):
+    """
+    Duplicate msgid clusters for cleanup: `exact` ones differ only in
+    whitespace, case or final punctuation and share translations during
+    translation runs; `near` ones have a character 3-gram similarity of at
+    least `threshold`.
+    """
+    try:
+        return await duplicate_report(db, threshold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Duplicate report error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,72 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse, HTMLResponse
-from sqlalchemy.orm import Session
-from config.database import get_db
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from config.logger import logger
-from models.language_strings_model import LanguageString
+from controllers.export_controller import (
+    EXPORT_FORMATS,
+    PACK_FORMATS,
+    PACK_STATUSES,
+    encode_pack,
+    encode_rows,
+    stream_msgid_rows,
+    stream_translator_pack
+)
+from controllers.translation_controller import get_language_code_by_name
+from controllers.string_status import has_status
 from datetime import datetime
-import pandas as pd
-import os
-import io
 
 router = APIRouter()
 
-# @router.get("/export")
-# async def export_language_strings(db: Session = Depends(get_db)):
-#     try:
-#         # Query all msgid values
-#         results = db.query(LanguageString.msgid).all()
-        
-#         # Create DataFrame with msgid and empty msgstr column
-#         df = pd.DataFrame(results, columns=['msgid'])
-#         df['msgstr'] = ""  # Add empty msgstr column
-        
-#         # Generate filename with timestamp
-#         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-#         filename = f"language_strings_{timestamp}.xlsx"
-        
-#         # Save to Excel
-#         df.to_excel(filename, index=False, engine='openpyxl')
-        
-#         # Return file response
-#         return FileResponse(
-#             filename,
-#             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-#             filename=filename
-#         )
-#     except Exception as e:
-#         raise HTTPException(status_code=500, detail=str(e))
-#     finally:
-#         # Clean up temporary file
-#         if os.path.exists(filename):
-#             os.remove(filename)
 
 @router.get("/export")
-async def export_language_strings(db: Session = Depends(get_db)):
+async def export_language_strings(format: str = "xlsx"):
+    """Stream every msgid with an empty msgstr column as XLSX (default) or CSV."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use xlsx or csv")
+
+    try:
+        filename = f"language_strings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+        return StreamingResponse(
+            encode_rows(stream_msgid_rows(), format),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    except Exception as e:
+        logger.error(f"Export error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export/{language}")
+async def export_translator_pack(
+    language: str,
+    status: str = "pending",
+    last_update: Optional[datetime] = None,
+    format: str = "xlsx"
+):
+    """
+    Stream a translator pack for one language: the strings matching the status
+    filter (pending, done or all), optionally only those updated at or after
+    `last_update`, with msgstr pre-filled from the locale's PO file.
+    """
+    if format not in PACK_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'. Use xlsx, csv or po")
+    if status not in PACK_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unsupported status '{status}'. Use pending, done or all")
+
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+    if not has_status(lang_code):
+        raise HTTPException(status_code=400, detail=f"Invalid language column: {lang_code}")
+
     try:
-        # Query only msgid column
-        results = db.query(LanguageString.msgid).all()
-        msgids = [r[0] for r in results]
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            "msgid": msgids,
-            "msgstr": [""] * len(msgids)  # Empty column
-        })
-        
-        # Create in-memory Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Translations')
-        
-        # Prepare for streaming
-        output.seek(0)
-        filename = f"language_strings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
+        filename = f"{lang_code}_{status}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+        rows = stream_translator_pack(lang_code, status, last_update)
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            encode_pack(rows, format, language, lang_code),
+            media_type=PACK_FORMATS[format],
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.error(f"Export error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,5 @@
-from fastapi import APIRouter , Depends, HTTPException, status
+from fastapi import APIRouter, HTTPException, status
 from controllers.get_languages import get_all_languages
-from config.database import get_db
-from sqlalchemy.orm import Session
 from config.logger import logger
 from typing import List
 
@@ -9,11 +7,11 @@ router = APIRouter()
 
 
 @router.get("/get_all_languages", response_model=List[str])
-def read_languages(db: Session = Depends(get_db)) -> List[str]:
+async def read_languages() -> List[str]:
 
-    # Retrieve all unique language codes from the language_locales table.
+    # Retrieve all unique language names from the language_locales table.
     try:
-        languages = get_all_languages(db)
+        languages = await get_all_languages()
         # Ensure result is a list of strings
         if not isinstance(languages, list):
             raise ValueError("Invalid return type from get_all_languages, expected list[str]")
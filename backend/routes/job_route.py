@@ -0,0 +1,52 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_async_db, AsyncSessionLocal
+from config.logger import logger
+from controllers.job_manager import job_manager
+
+router = APIRouter()
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_endpoint(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    progress = await job_manager.progress(db, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return progress
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events_endpoint(job_id: str):
+    """Server-sent events with the job's progress until it finishes."""
+    async with AsyncSessionLocal() as db:
+        if await job_manager.progress(db, job_id) is None:
+            raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+    async def events():
+        while True:
+            async with AsyncSessionLocal() as db:
+                progress = await job_manager.progress(db, job_id)
+            yield f"data: {json.dumps(progress)}\n\n"
+            if progress["status"] in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(1)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job_endpoint(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    try:
+        if not await job_manager.cancel(db, job_id):
+            raise HTTPException(status_code=404, detail=f"No active job '{job_id}'")
+        return {"message": f"Job {job_id} cancelled", "job_id": job_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Job cancel error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from config.config import Config
+from config.logger import logger
+from controllers.locale_registry import locale_registry
+from controllers.runtime_lookup import get_catalog, lookup_many
+from schemas.translation import LookupRequest
+from utils.mo_reader import MOCatalog, MOReadError
+
+router = APIRouter()
+
+
+async def _catalog_for(language: str) -> MOCatalog:
+    lang_code = await locale_registry.code_for(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+    try:
+        catalog = get_catalog(lang_code)
+    except (OSError, MOReadError) as e:
+        logger.error(f"Cannot map catalog for {lang_code}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Catalog for {language} is unreadable")
+    if catalog is None:
+        raise HTTPException(status_code=404, detail=f"No compiled catalog for {language}; compile it first")
+    return catalog
+
+
+@router.get("/t/{language}")
+async def lookup_translation(language: str, msgid: str = Query(..., min_length=1), msgctxt: Optional[str] = None):
+    """Translation of one msgid from the compiled MO catalog; msgstr is null when untranslated."""
+    catalog = await _catalog_for(language)
+    return {"language": language, "msgid": msgid, "msgstr": catalog.gettext(msgid, msgctxt)}
+
+
+@router.post("/t/{language}")
+async def lookup_translations(language: str, request: LookupRequest):
+    """Translations of many msgids in one call; untranslated ones are listed under `missing`."""
+    if len(request.msgids) > Config.LOOKUP_MAX_MSGIDS:
+        raise HTTPException(status_code=400, detail=f"At most {Config.LOOKUP_MAX_MSGIDS} msgids per request")
+    catalog = await _catalog_for(language)
+
+    found = lookup_many(catalog, request.msgids, request.msgctxt)
+    translations = {msgid: msgstr for msgid, msgstr in found.items() if msgstr is not None}
+    return {
+        "language": language,
+        "translations": translations,
+        "missing": [msgid for msgid, msgstr in found.items() if msgstr is None]
+    }
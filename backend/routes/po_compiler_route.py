@@ -1,10 +1,9 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pathlib import Path
 import os
-from controllers.po_compiler import POCompilerController
+from controllers.po_compiler import POCompilerController, compile_all_locales
 from config.logger import logger
-from sqlalchemy.orm import Session
-from config.database import get_db
 from controllers.translation_controller import get_language_code_by_name
 
 # # Configuration
@@ -20,10 +19,9 @@ from controllers.translation_controller import get_language_code_by_name
 router = APIRouter()
 
 @router.post("/compile-po/{language}")
-async def compile_po_endpoint(language: str,
-    db: Session = Depends(get_db)):
+async def compile_po_endpoint(language: str):
     try:
-        lang_code = get_language_code_by_name(db, language)
+        lang_code = await get_language_code_by_name(language)
         if not lang_code:
             error_msg = f"Language '{language}' not found"
             logger.error(error_msg)
@@ -40,4 +38,15 @@ async def compile_po_endpoint(language: str,
     except Exception as e:
         logger.error(f"PO generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e)) 
-    return controller.compile_po()
\ No newline at end of file
+    # CPU-bound; keep it off the event loop
+    return await run_in_threadpool(controller.compile_po)
+
+
+@router.post("/compile-all")
+async def compile_all_endpoint(force: bool = False):
+    """Compile every locale whose PO file changed since its last successful compile."""
+    try:
+        return await compile_all_locales(force=force)
+    except Exception as e:
+        logger.error(f"Compile-all error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
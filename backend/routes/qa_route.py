@@ -0,0 +1,58 @@
+import json
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from config.logger import logger
+from controllers.qa_controller import qa_report_path, run_qa, validate_rules
+from controllers.translation_controller import get_language_code_by_name
+from schemas.translation import MultiTargetRequest
+
+router = APIRouter()
+
+
+@router.post("/qa")
+async def run_qa_endpoint(request: Optional[MultiTargetRequest] = None, rules: Optional[List[str]] = Query(None)):
+    """
+    Run the QA rules (all, or those given with ?rules=) over the catalogs of
+    the requested languages, or of every locale. Returns per-locale counts;
+    the full reports are written as JSON.
+    """
+    try:
+        validate_rules(rules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    lang_codes = None
+    if request and request.languages:
+        lang_codes = []
+        for language in request.languages:
+            lang_code = await get_language_code_by_name(language)
+            if not lang_code:
+                raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+            lang_codes.append(lang_code)
+
+    try:
+        return await run_qa(lang_codes, rules)
+    except Exception as e:
+        logger.error(f"QA error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/qa/{language}")
+async def get_qa_report(language: str, rule: Optional[str] = None):
+    """The last QA report of a language, optionally only the issues of one rule."""
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+
+    def load():
+        with open(qa_report_path(lang_code), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    try:
+        report = await run_in_threadpool(load)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"No QA report for {language}; run POST /qa first")
+    if rule:
+        report["issues"] = [issue for issue in report["issues"] if issue["rule"] == rule]
+    return report
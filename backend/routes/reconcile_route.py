@@ -0,0 +1,49 @@
+import os
+from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_async_db
+from config.logger import logger
+from controllers.job_manager import ActiveJobError, job_manager
+from controllers.reconcile_controller import DEFAULT_APPLY_KINDS, reconcile_catalog
+from controllers.translation_controller import get_language_code_by_name, spool_upload
+from utils.po_file import POSyntaxError
+
+router = APIRouter()
+
+
+@router.post("/reconcile/{language}")
+async def reconcile_endpoint(
+    language: str,
+    file: UploadFile = File(...),
+    apply: List[str] = Query(list(DEFAULT_APPLY_KINDS)),
+    dry_run: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Diff a corrected PO file (e.g. CORRECTED/salesplaypos.po) against the
+    language's catalog. With dry_run=false the change kinds listed in
+    `apply` are written to the catalog and the database in one go.
+    """
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+    if not file.filename.lower().endswith(".po"):
+        raise HTTPException(status_code=400, detail="Upload a .po file")
+
+    path = await spool_upload(file, "po")
+    try:
+        if not dry_run:
+            await job_manager.lock_languages(db, [lang_code])
+        return await reconcile_catalog(db, lang_code, path, apply, dry_run)
+    except ActiveJobError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
+    except (ValueError, POSyntaxError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Reconcile error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.remove(path)
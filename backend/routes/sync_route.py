@@ -0,0 +1,37 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from config.config import Config
+from config.logger import logger
+from controllers.sync_controller import build_sync_payload, encode_sync_payload
+from controllers.translation_controller import get_language_code_by_name
+
+router = APIRouter()
+
+
+@router.get("/sync/{language}")
+async def sync_catalog(
+    language: str,
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(Config.SYNC_PAGE_SIZE, ge=1, le=Config.SYNC_PAGE_SIZE)
+):
+    """
+    Catalog changes since the client's version. Clients store the returned
+    version, apply `changed` and `removed`, and call again while `more` is set.
+    Omit `since` to get the whole catalog.
+    """
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+
+    try:
+        payload = await build_sync_payload(lang_code, since, limit)
+    except Exception as e:
+        logger.error(f"Sync error for {language}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    body, encoding = encode_sync_payload(payload, request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding", "X-Catalog-Version": str(payload["version"])}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,86 +1,92 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File,status
-from sqlalchemy.orm import Session
-from config.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_async_db
 from config.logger import logger
 from controllers.translation_controller import (
-    get_zero_msgids,
-    translate_msgids,
-    generate_po_content,
     get_language_code_by_name,
-    update_po_content,
-    process_uploaded_translations,read_csv_file,
-    read_excel_file,extract_translations_from_rows
+    po_header_entry,
+    UPLOAD_EXTENSIONS,
+    spool_upload,
+    ingest_uploaded_translations,
+    get_enabled_targets
 )
+from controllers.job_manager import ActiveJobError, job_manager
+from controllers.translations_store import regenerate_catalog
+from controllers.string_status import has_status
+from schemas.translation import MultiTargetRequest
 import os
 from config.config import Config
-import csv
-from io import StringIO
 
 router = APIRouter()
     
-@router.post("/generate-po/{language}")
+@router.post("/generate-po/{language}", status_code=202)
 async def generate_po_endpoint(
     language: str,
-    db: Session = Depends(get_db)
+    packed: bool = True,
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        lang_code = get_language_code_by_name(db, language)
+        lang_code = await get_language_code_by_name(language)
         if not lang_code:
             error_msg = f"Language '{language}' not found"
             logger.error(error_msg)
             raise HTTPException(status_code=404, detail=error_msg)
         
-        msgids = get_zero_msgids(db, lang_code)
-        if not msgids:
-            return {"message": "No translations needed"}
-        
-        translations = await translate_msgids(db, msgids, language, lang_code)
-        # translations = translate_msgids(db, msgids, language, lang_code)
-        po_dir = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES")
-        os.makedirs(po_dir, exist_ok=True)
-        po_path = os.path.join(po_dir, "salesplaypos.po")
-        
-        # Check if PO file exists
-        if os.path.exists(po_path):
-            # Update existing PO file
-            with open(po_path, "r", encoding="utf-8") as f:
-                existing_content = f.read()
-            
-            # Parse existing content and add new translations
-            updated_content = update_po_content(
-                existing_content, 
-                language, 
-                msgids, 
-                translations
-            )
-            
-            with open(po_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
-            action = "updated"
-        else:
-            # Create new PO file
-            po_content = generate_po_content(language,lang_code, msgids, translations)
-            with open(po_path, "w", encoding="utf-8") as f:
-                f.write(po_content)
-            action = "created"
+        if not has_status(lang_code):
+            error_msg = f"Invalid language column: {lang_code}"
+            logger.error(error_msg)
+            raise HTTPException(status_code=400, detail=error_msg)
         
-        return {"message": f"PO file {action} for {language}"}
+        job_id = await job_manager.submit(db, [(language, lang_code)], packed=packed)
+        return {"message": f"Translation job started for {language}", "job_id": job_id}
     
+    except HTTPException:
+        raise
+    except ActiveJobError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
     except Exception as e:
         logger.error(f"PO generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 
+@router.post("/generate-po-multi", status_code=202)
+async def generate_po_multi_endpoint(
+    request: MultiTargetRequest = MultiTargetRequest(),
+    packed: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        targets = await get_enabled_targets(request.languages)
+        if not targets:
+            error_msg = "No enabled languages found"
+            logger.error(error_msg)
+            raise HTTPException(status_code=404, detail=error_msg)
+
+        job_id = await job_manager.submit(db, targets, packed=packed)
+        return {
+            "message": f"Translation job started for {len(targets)} languages",
+            "job_id": job_id
+        }
+
+    except HTTPException:
+        raise
+    except ActiveJobError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
+    except Exception as e:
+        logger.error(f"PO generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/upload-translations/{language}")
 async def upload_translations(
     language: str,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # Validate language
-        lang_code = get_language_code_by_name(db, language)
+        lang_code = await get_language_code_by_name(language)
         if not lang_code:
             error_msg = f"Language '{language}' not found"
             logger.error(error_msg)
@@ -95,58 +101,58 @@ async def upload_translations(
             )
         
         ext = filename.rsplit('.', 1)[1]
-        
-        # Read file content
-        content = await file.read()
-        
-        # Process based on file type
-        if ext == 'csv':
-            decoded_content = read_csv_file(content)
-            csv_file = StringIO(decoded_content)
-            reader = csv.reader(csv_file)
-            rows = list(reader)
-            msgids, translations = extract_translations_from_rows(rows)
-            
-        elif ext in ['xlsx', 'xls']:
-            rows = read_excel_file(content, ext)
-            msgids, translations = extract_translations_from_rows(rows)
-            
-        else:
+        if ext not in UPLOAD_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
                 detail="Unsupported file type. Use CSV, XLSX, or XLS"
             )
         
-        # Validate we have translations
-        if not msgids:
-            raise HTTPException(
-                status_code=400,
-                detail="No translations found in file"
-            )
-        
-        # Update database
-        process_uploaded_translations(db, lang_code, msgids, translations)
-        
-        # Generate PO file path
-        po_dir = os.path.join(Config.LOCALES_DIR, lang_code, "LC_MESSAGES")
-        os.makedirs(po_dir, exist_ok=True)
-        po_path = os.path.join(po_dir, "salesplaypos.po")
-        
-        # Generate PO content
-        po_content = generate_po_content(language, lang_code, msgids, translations)
-        
-        # Write PO file
-        with open(po_path, "w", encoding="utf-8") as f:
-            f.write(po_content)
+        # Spool to disk, then parse and apply the rows chunk by chunk
+        path = await spool_upload(file, ext)
+        try:
+            await job_manager.lock_languages(db, [lang_code])
+            result = await ingest_uploaded_translations(db, language, lang_code, path, ext)
+        finally:
+            os.remove(path)
         
         return {
             "message": f"Translations uploaded successfully for {language}",
-            "translations_processed": len(msgids),
-            "po_file_path": po_path
+            "translations_processed": result["processed"],
+            "strings_created": result["created"],
+            "chunks": result["chunks"],
+            "catalog_changes": result["changed"],
+            "po_file_path": result["po_file_path"]
         }
     
     except HTTPException as he:
         raise he
+    except ActiveJobError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
     except Exception as e:
         logger.exception(f"Translation upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/regenerate-po/{language}")
+async def regenerate_po_endpoint(language: str, db: AsyncSession = Depends(get_async_db)):
+    """Rebuild a locale's PO file from the normalized translations table."""
+    if not Config.NORMALIZED_TRANSLATIONS:
+        raise HTTPException(status_code=400, detail="Normalized translations are not enabled")
+
+    lang_code = await get_language_code_by_name(language)
+    if not lang_code:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+
+    try:
+        await job_manager.lock_languages(db, [lang_code])
+        po_path, count = await regenerate_catalog(db, language, lang_code, po_header_entry(language, lang_code))
+        return {
+            "message": f"PO file regenerated for {language}",
+            "entries": count,
+            "po_file_path": po_path
+        }
+    except ActiveJobError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": e.job_id})
+    except Exception as e:
+        logger.exception(f"PO regeneration error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from controllers.upload_file import handle_file_upload
 from controllers.upload_file import insert_new_strings_from_file
-from sqlalchemy.orm import Session
-from config.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_async_db
 from config.logger import logger
 
 router = APIRouter()
@@ -10,11 +10,11 @@ router = APIRouter()
 @router.post("/upload")
 async def upload_and_insert_strings(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         await handle_file_upload(file)
-        result = insert_new_strings_from_file(db)  
+        result = await insert_new_strings_from_file(db)  
 
         return {
             "message" : f"Inserted {result["inserted_count"]} new strings",
@@ -31,10 +31,10 @@ async def upload_and_insert_strings(
 
 @router.get("/upload-strings")
 async def upload_strings_file(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        count = insert_new_strings_from_file(db)
+        count = await insert_new_strings_from_file(db)
         return {"message": f"Inserted {count} new strings"}
     
     except Exception as e:
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, constr, validator
+from typing import List, Optional
 import re
 
 class LanguageLocaleCreate(BaseModel):
@@ -15,4 +16,12 @@ class LanguageLocaleCreate(BaseModel):
     
 class UploadFile(BaseModel):
     filename: str
-    content_type: str
\ No newline at end of file
+    content_type: str
+
+class MultiTargetRequest(BaseModel):
+    # Language names; all enabled languages when omitted
+    languages: Optional[List[str]] = None
+
+class LookupRequest(BaseModel):
+    msgids: List[str]
+    msgctxt: Optional[str] = None
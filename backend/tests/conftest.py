@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The backend imports its packages top-level (from utils..., from config...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Config builds the database URLs at import; the engines never connect in these tests
+os.environ.setdefault("MYSQL_HOST", "localhost")
+os.environ.setdefault("MYSQL_PORT", "3306")
+os.environ.setdefault("MYSQL_USER", "test")
+os.environ.setdefault("MYSQL_DB", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,86 @@
+import gettext
+import io
+import struct
+
+import pytest
+
+from utils.mo_file import MOCompileError, compile_mo, hash_string, hash_table_size
+from utils.mo_reader import MOCatalog
+from utils.po_file import POEntry
+
+HEADER = POEntry(msgid="", msgstr="Content-Type: text/plain; charset=UTF-8\nPlural-Forms: nplurals=2; plural=(n != 1);\n")
+
+
+def _entries(count):
+    return [HEADER] + [POEntry(msgid=f"message {i}", msgstr=f"translation {i}") for i in range(count)]
+
+
+def _hash_table(data):
+    _, _, count, _, _, size, offset = struct.unpack_from("<7I", data)
+    return count, list(struct.unpack_from(f"<{size}I", data, offset))
+
+
+def test_hash_string_matches_gettext():
+    assert hash_string(b"") == 0
+    assert hash_string(b"a") == 97
+    assert hash_string(b"ab") == (97 << 4) + 98
+    # Long keys fold the high nibble back in and stay 32-bit
+    assert 0 <= hash_string(("x" * 100).encode()) < 2 ** 32
+
+
+def test_hash_table_size_is_gettexts_prime():
+    assert hash_table_size(0) == 3
+    assert hash_table_size(3) == 5
+    assert hash_table_size(100) == 137
+
+
+def test_every_message_sits_once_in_the_hash_table():
+    count, table = _hash_table(compile_mo(_entries(500)))
+    assert count == 501
+    assert sorted(number for number in table if number) == list(range(1, count + 1))
+
+
+def test_lookups_through_the_hash_table(tmp_path):
+    entries = _entries(500) + [
+        POEntry(msgid="Open", msgctxt="menu", msgstr="Ouvrir"),
+        POEntry(msgid="One file", msgid_plural="%d files", msgstr_plural={0: "Un fichier", 1: "%d fichiers"}),
+    ]
+    path = tmp_path / "catalog.mo"
+    path.write_bytes(compile_mo(entries))
+
+    catalog = MOCatalog(str(path))
+    try:
+        for i in range(500):
+            assert catalog.gettext(f"message {i}") == f"translation {i}"
+        assert catalog.gettext("Open", msgctxt="menu") == "Ouvrir"
+        assert catalog.gettext("Open") is None
+        assert catalog.gettext("One file") == "Un fichier"
+        assert catalog.gettext("missing") is None
+    finally:
+        catalog.close()
+
+
+def test_output_is_readable_by_gettext():
+    entries = _entries(3) + [
+        POEntry(msgid="One file", msgid_plural="%d files", msgstr_plural={0: "Un fichier", 1: "%d fichiers"}),
+    ]
+    translations = gettext.GNUTranslations(io.BytesIO(compile_mo(entries)))
+    assert translations.gettext("message 1") == "translation 1"
+    assert translations.ngettext("One file", "%d files", 2) == "%d fichiers"
+
+
+def test_untranslated_fuzzy_and_obsolete_entries_are_left_out():
+    entries = [
+        HEADER,
+        POEntry(msgid="kept", msgstr="gardé"),
+        POEntry(msgid="untranslated"),
+        POEntry(msgid="fuzzy", msgstr="flou", flags=["fuzzy"]),
+        POEntry(msgid="obsolete", msgstr="obsolète", obsolete=True),
+    ]
+    count, _ = _hash_table(compile_mo(entries))
+    assert count == 2
+
+
+def test_duplicate_definitions_are_an_error():
+    with pytest.raises(MOCompileError):
+        compile_mo([POEntry(msgid="a", msgstr="1"), POEntry(msgid="a", msgstr="2")])
@@ -0,0 +1,36 @@
+from utils.near_duplicates import adapt_translation, split_surface, surface_key
+
+
+def test_surface_key_ignores_whitespace_case_and_final_punctuation():
+    assert surface_key("  Save   File: ") == surface_key("save file") == "save file"
+    assert surface_key("Save file?") == surface_key("SAVE FILE")
+    assert surface_key("Save file") != surface_key("Save files")
+
+
+def test_split_surface():
+    assert split_surface("  Hello world!\n") == ("  ", "Hello world", "!", "\n")
+    assert split_surface("...") == ("", "", "...", "")
+
+
+def test_identical_source_keeps_the_translation():
+    assert adapt_translation("Save", "Enregistrer", "Save") == "Enregistrer"
+
+
+def test_outer_whitespace_and_punctuation_follow_the_target():
+    assert adapt_translation("Save file", "Enregistrer le fichier", " Save file: ") == " Enregistrer le fichier: "
+    assert adapt_translation("Save file.", "Enregistrer le fichier.", "Save file") == "Enregistrer le fichier"
+
+
+def test_translation_keeps_its_own_mark_when_the_sources_agree():
+    # Both sources end in "."; the Hindi danda stays
+    assert adapt_translation("Save file.", "फ़ाइल सहेजें।", " Save file. ") == " फ़ाइल सहेजें। "
+
+
+def test_casing_follows_the_target():
+    assert adapt_translation("save file", "enregistrer le fichier", "Save file") == "Enregistrer le fichier"
+    assert adapt_translation("Save file", "Enregistrer le fichier", "SAVE FILE") == "ENREGISTRER LE FICHIER"
+    assert adapt_translation("Save file", "Enregistrer le fichier", "save file") == "enregistrer le fichier"
+
+
+def test_scripts_without_case_are_left_alone():
+    assert adapt_translation("save", "حفظ", "SAVE") == "حفظ"
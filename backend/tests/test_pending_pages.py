@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+from controllers import translation_pipeline
+from controllers.translation_pipeline import TranslationPipeline
+
+# Pending (id, msgid) rows per language, as the keyset scans return them
+PENDING = {
+    "fr": [(1, "s1"), (2, "s2"), (5, "s5"), (8, "s8"), (9, "s9")],
+    "de": [(2, "s2"), (3, "s3"), (4, "s4"), (5, "s5"), (6, "s6"), (7, "s7")],
+    "ar": [],
+}
+
+
+async def _fake_pages(db, lang_code, page_size, after_id=0):
+    rows = PENDING[lang_code]
+    for i in range(0, len(rows), page_size):
+        yield rows[i:i + page_size]
+
+
+def _pages(monkeypatch, codes, page_size):
+    monkeypatch.setattr(translation_pipeline, "iter_pending_pages", _fake_pages)
+    pipeline = SimpleNamespace(targets=[(code.upper(), code) for code in codes], page_size=page_size)
+
+    async def collect():
+        return [page async for page in TranslationPipeline._pending_pages(pipeline, None)]
+
+    return asyncio.run(collect())
+
+
+def test_streams_are_merged_by_id(monkeypatch):
+    pages = _pages(monkeypatch, ["fr", "de", "ar"], page_size=2)
+    rows = [row for page in pages for row in page]
+    assert rows == [
+        (1, "s1", ["fr"]),
+        (2, "s2", ["fr", "de"]),
+        (3, "s3", ["de"]),
+        (4, "s4", ["de"]),
+        (5, "s5", ["fr", "de"]),
+        (6, "s6", ["de"]),
+        (7, "s7", ["de"]),
+        (8, "s8", ["fr"]),
+        (9, "s9", ["fr"]),
+    ]
+
+
+def test_an_id_is_emitted_once_whatever_the_page_size(monkeypatch):
+    expected = None
+    for page_size in (1, 2, 3, 100):
+        pages = _pages(monkeypatch, ["fr", "de"], page_size)
+        rows = [row for page in pages for row in page]
+        assert [row[0] for row in rows] == sorted({row[0] for row in rows})
+        assert all(page for page in pages)
+        expected = expected or rows
+        assert rows == expected
+
+
+def test_no_pending_work(monkeypatch):
+    assert _pages(monkeypatch, ["ar"], page_size=10) == []
@@ -0,0 +1,82 @@
+import os
+
+from utils.po_catalog import INDEX_SUFFIX, IncrementalPOCatalog, POCatalogIndex, entry_key
+from utils.po_file import POEntry, dump_po, read_po
+
+HEADER = POEntry(msgid="", msgstr="Content-Type: text/plain; charset=UTF-8\n")
+
+
+def _write_catalog(path, msgids):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dump_po([HEADER] + [POEntry(msgid=msgid, msgstr=msgid.upper()) for msgid in msgids]) + "\n")
+
+
+def _msgids(path):
+    return [entry.msgid for entry in read_po(str(path)) if not entry.is_header]
+
+
+def test_append_skips_known_msgids(tmp_path):
+    po_path = tmp_path / "catalog.po"
+    _write_catalog(po_path, ["a", "b"])
+    catalog = IncrementalPOCatalog(str(po_path))
+    try:
+        assert catalog.append([POEntry(msgid="b"), POEntry(msgid="c"), POEntry(msgid="c")]) == 1
+        assert catalog.append([POEntry(msgid="c")]) == 0
+    finally:
+        catalog.close()
+    assert _msgids(po_path) == ["a", "b", "c"]
+    assert os.path.exists(str(po_path) + INDEX_SUFFIX)
+
+
+def test_index_is_reused_while_the_catalog_is_unchanged(tmp_path):
+    po_path = tmp_path / "catalog.po"
+    _write_catalog(po_path, ["a"])
+    POCatalogIndex(str(po_path)).close()
+    index = POCatalogIndex(str(po_path))
+    try:
+        assert not index.refresh()
+        assert entry_key("a") in index and entry_key("z") not in index
+    finally:
+        index.close()
+
+
+def test_stale_index_is_rebuilt_on_open(tmp_path):
+    po_path = tmp_path / "catalog.po"
+    _write_catalog(po_path, ["a"])
+    POCatalogIndex(str(po_path)).close()
+    _write_catalog(po_path, ["a", "b"])
+
+    index = POCatalogIndex(str(po_path))
+    try:
+        assert entry_key("b") in index
+    finally:
+        index.close()
+
+
+def test_catalog_replaced_behind_an_open_writer(tmp_path):
+    # An upload swaps in a new file while the pipeline's appender is open
+    po_path = tmp_path / "catalog.po"
+    _write_catalog(po_path, ["a", "b"])
+    catalog = IncrementalPOCatalog(str(po_path))
+    try:
+        _write_catalog(po_path, ["a"])
+        assert catalog.append([POEntry(msgid="b", msgstr="B")]) == 1
+        assert catalog.append([POEntry(msgid="b", msgstr="B")]) == 0
+    finally:
+        catalog.close()
+    assert _msgids(po_path) == ["a", "b"]
+
+
+def test_patch_header_in_place(tmp_path):
+    po_path = tmp_path / "catalog.po"
+    header = POEntry(msgid="", msgstr="PO-Revision-Date: 2024-01-01 00:00+0000\n")
+    with open(po_path, "w", encoding="utf-8") as f:
+        f.write(dump_po([header, POEntry(msgid="a", msgstr="A")]) + "\n")
+    catalog = IncrementalPOCatalog(str(po_path))
+    try:
+        assert catalog.patch_header({"PO-Revision-Date": "2026-10-18 12:00+0000"})
+        assert not catalog.patch_header({"PO-Revision-Date": "too short"})
+        assert not catalog.index.refresh()
+    finally:
+        catalog.close()
+    assert "2026-10-18 12:00+0000" in next(read_po(str(po_path))).msgstr
@@ -0,0 +1,112 @@
+from utils.po_diff import apply_changes, diff_catalogs, merge_translations
+from utils.po_file import POEntry
+
+HEADER = POEntry(msgid="", msgstr="Content-Type: text/plain; charset=UTF-8\n")
+
+
+def _kinds(changes):
+    return {change.msgid: change.kind for change in changes}
+
+
+def test_diff_classifies_every_key():
+    old = [
+        HEADER,
+        POEntry(msgid="same", msgstr="S"),
+        POEntry(msgid="changed", msgstr="old"),
+        POEntry(msgid="spaced", msgstr="a b"),
+        POEntry(msgid="removed", msgstr="R"),
+    ]
+    new = [
+        HEADER,
+        POEntry(msgid="same", msgstr="S"),
+        POEntry(msgid="changed", msgstr="new"),
+        POEntry(msgid="spaced", msgstr=" a  b"),
+        POEntry(msgid="added", msgstr="A"),
+    ]
+    changes, unchanged = diff_catalogs(old, new)
+    assert unchanged == 1
+    assert _kinds(changes) == {"changed": "changed", "spaced": "whitespace", "added": "added", "removed": "removed"}
+    removed = next(change for change in changes if change.kind == "removed")
+    assert (removed.old, removed.new) == ("R", None)
+
+
+def test_diff_matches_msgids_corrected_in_whitespace():
+    changes, _ = diff_catalogs([POEntry(msgid="Save  file", msgstr="X")], [POEntry(msgid="Save file", msgstr="Y")])
+    assert len(changes) == 1
+    change = changes[0]
+    assert (change.kind, change.msgid, change.old_msgid) == ("changed", "Save file", "Save  file")
+    assert change.old_key == (None, "Save  file")
+
+
+def test_diff_keys_include_the_context():
+    old = [POEntry(msgid="Open", msgctxt="menu", msgstr="Ouvrir")]
+    new = [POEntry(msgid="Open", msgctxt="menu", msgstr="Ouvrir"), POEntry(msgid="Open", msgstr="Ouvert")]
+    changes, unchanged = diff_catalogs(old, new)
+    assert unchanged == 1
+    assert [(change.kind, change.msgctxt) for change in changes] == [("added", None)]
+
+
+def test_diff_treats_fuzzy_as_untranslated_and_ignores_obsolete():
+    old = [POEntry(msgid="a", msgstr="A", flags=["fuzzy"]), POEntry(msgid="gone", msgstr="G", obsolete=True)]
+    new = [POEntry(msgid="a", msgstr="A")]
+    changes, _ = diff_catalogs(old, new)
+    assert [(change.kind, change.old, change.new) for change in changes] == [("changed", "", "A")]
+
+
+def test_apply_changes_keeps_positions():
+    old = [HEADER, POEntry(msgid="a", msgstr="A"), POEntry(msgid="b", msgstr="B"), POEntry(msgid="c", msgstr="C")]
+    new = [HEADER, POEntry(msgid="c", msgstr="C2"), POEntry(msgid="a", msgstr="A"), POEntry(msgid="d", msgstr="D")]
+    changes, _ = diff_catalogs(old, new)
+    # Apply everything but the removal of "b"
+    selected = [change for change in changes if change.kind != "removed"]
+    applied = [(entry.msgid, entry.msgstr) for entry in apply_changes(old, selected)]
+    assert applied == [("", HEADER.msgstr), ("a", "A"), ("b", "B"), ("c", "C2"), ("d", "D")]
+
+
+def _merge(old_entries, translations):
+    changed = {}
+    merged = list(merge_translations(old_entries, dict(translations), changed))
+    return merged, changed
+
+
+def test_merge_keeps_entries_missing_from_the_upload():
+    old = [HEADER, POEntry(msgid="a", msgstr="A"), POEntry(msgid="b", msgstr="B")]
+    merged, changed = _merge(old, {"b": "B2"})
+    assert [(entry.msgid, entry.msgstr) for entry in merged] == [("", HEADER.msgstr), ("a", "A"), ("b", "B2")]
+    assert changed == {"b": "B2"}
+
+
+def test_merge_appends_unknown_msgids():
+    merged, changed = _merge([HEADER, POEntry(msgid="a", msgstr="A")], {"new": "NEW"})
+    assert merged[-1] == POEntry(msgid="new", msgstr="NEW")
+    assert changed == {"new": "NEW"}
+
+
+def test_merge_reports_only_real_changes():
+    old = [HEADER, POEntry(msgid="a", msgstr="A"), POEntry(msgid="b", msgstr="B", flags=["fuzzy"])]
+    merged, changed = _merge(old, {"a": "A", "b": "B"})
+    # The same text clears a fuzzy flag, which is a change; an identical pair is not
+    assert changed == {"b": "B"}
+    assert merged[1] is old[1]
+    assert merged[2].flags == [] and merged[2].msgstr == "B"
+
+
+def test_merge_leaves_context_plural_and_obsolete_entries_alone():
+    old = [
+        HEADER,
+        POEntry(msgid="a", msgctxt="menu", msgstr="ctx"),
+        POEntry(msgid="a", msgid_plural="as", msgstr_plural={0: "p0", 1: "p1"}),
+        POEntry(msgid="a", msgstr="old", obsolete=True),
+    ]
+    merged, changed = _merge(old, {"a": "plain"})
+    assert merged[:4] == old
+    assert merged[4] == POEntry(msgid="a", msgstr="plain")
+    assert changed == {"a": "plain"}
+
+
+def test_merge_keeps_comments_and_consumes_the_upload():
+    entry = POEntry(msgid="a", msgstr="A", references=["app.py:1"], translator_comments=["keep"])
+    translations = {"a": "A2"}
+    merged = list(merge_translations([entry], translations, {}))
+    assert merged[0].references == ["app.py:1"] and merged[0].translator_comments == ["keep"]
+    assert translations == {}
@@ -0,0 +1,92 @@
+import io
+
+from utils.po_file import POEntry, dump_po, parse_po, read_po, translation_map, write_po
+
+CATALOG = r'''# Translator comment
+#
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\n"
+
+#. Extracted comment
+#: src/app.py:10 src/app.py:12
+#, python-format
+msgid "Hello %s"
+msgstr "Bonjour %s"
+
+msgctxt "menu"
+msgid "Open"
+msgstr "Ouvrir"
+
+msgid ""
+"Line one\n"
+"Line two"
+msgstr ""
+"Ligne un\n"
+"Ligne deux"
+
+#, fuzzy
+#| msgid "Old text"
+msgid "Quote \" and tab\t and backslash \\"
+msgstr "Guillemet \" et tab\t et barre \\"
+
+msgid "One file"
+msgid_plural "%d files"
+msgstr[0] "Un fichier"
+msgstr[1] "%d fichiers"
+
+#~ msgid "Gone"
+#~ msgstr "Parti"
+'''
+
+
+def test_parse_reads_every_field():
+    header, hello, menu, multiline, fuzzy, plural, obsolete = parse_po(CATALOG)
+
+    assert header.is_header
+    assert header.translator_comments == ["Translator comment", ""]
+    assert "charset=UTF-8" in header.msgstr
+    assert hello.extracted_comments == ["Extracted comment"]
+    assert hello.references == ["src/app.py:10", "src/app.py:12"]
+    assert hello.flags == ["python-format"]
+    assert menu.msgctxt == "menu"
+    assert multiline.msgid == "Line one\nLine two"
+    assert multiline.msgstr == "Ligne un\nLigne deux"
+    assert fuzzy.fuzzy and fuzzy.previous == ['msgid "Old text"']
+    assert fuzzy.msgid == 'Quote " and tab\t and backslash \\'
+    assert plural.msgid_plural == "%d files"
+    assert plural.msgstr_plural == {0: "Un fichier", 1: "%d fichiers"}
+    assert obsolete.obsolete and obsolete.msgstr == "Parti"
+
+
+def test_round_trip_is_lossless():
+    entries = parse_po(CATALOG)
+    assert parse_po(dump_po(entries)) == entries
+    # Our own output is a fixed point
+    assert dump_po(parse_po(dump_po(entries))) == dump_po(entries)
+
+
+def test_round_trip_through_a_file(tmp_path):
+    entries = parse_po(CATALOG)
+    path = tmp_path / "catalog.po"
+    with open(path, "w", encoding="utf-8") as f:
+        assert write_po(f, entries) == len(entries)
+    assert list(read_po(str(path))) == entries
+
+
+def test_append_starts_with_a_separator():
+    out = io.StringIO()
+    write_po(out, [POEntry(msgid="a", msgstr="b")])
+    write_po(out, [POEntry(msgid="c", msgstr="d")], append=True)
+    assert [entry.msgid for entry in parse_po(out.getvalue())] == ["a", "c"]
+
+
+def test_non_ascii_and_line_separators_survive():
+    entry = POEntry(msgid="Café\u2028next", msgstr="مقهى")
+    assert parse_po(dump_po([entry])) == [entry]
+
+
+def test_translation_map_keeps_usable_translations_only():
+    translations = translation_map(parse_po(CATALOG))
+    assert translations == {"Hello %s": "Bonjour %s", "Line one\nLine two": "Ligne un\nLigne deux"}
@@ -0,0 +1,89 @@
+"""
+Content-addressed, precompressed copies of files for HTTP distribution.
+
+publish() stores each file in a distribution directory under a name that
+includes its content hash, together with gzip and brotli variants, and records them in
+`manifest.json`:
+
+    {"salesplaypos.mo": {"etag": "<sha256>", "file": "salesplaypos.mo.<hash>",
+                         "size": 1234, "encodings": {"gzip": 456, "br": 401}}, ...}
+
+Stored files are never modified, only replaced by new names, and the
+manifest is swapped in last, so whatever a reader took from the manifest
+matches the bytes it sends. A variant is kept only when it is smaller than
+the original.
+"""
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+import brotli
+
+MANIFEST_FILE = "manifest.json"
+
+# Preferred first when a client accepts several
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def _compress(data: bytes, encoding: str) -> Optional[bytes]:
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(dist_dir: str) -> Dict[str, dict]:
+    try:
+        with open(os.path.join(dist_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish(dist_dir: str, files: Dict[str, bytes]) -> Dict[str, dict]:
+    """Publish files (name -> content) with their compressed variants. Unchanged files are left alone."""
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest = load_manifest(dist_dir)
+    replaced = []
+
+    for name, data in files.items():
+        etag = hashlib.sha256(data).hexdigest()
+        previous = manifest.get(name)
+        if previous and previous.get("etag") == etag and os.path.isfile(os.path.join(dist_dir, previous["file"])):
+            continue
+
+        stored = f"{name}.{etag[:16]}"
+        path = os.path.join(dist_dir, stored)
+        _write_atomic(path, data)
+        encodings = {}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            compressed = _compress(data, encoding)
+            if compressed is not None and len(compressed) < len(data):
+                _write_atomic(path + suffix, compressed)
+                encodings[encoding] = len(compressed)
+        manifest[name] = {"etag": etag, "file": stored, "size": len(data), "encodings": encodings}
+        if previous and previous.get("file") != stored:
+            replaced.append(previous["file"])
+
+    _write_atomic(
+        os.path.join(dist_dir, MANIFEST_FILE),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    )
+    # Readers that still hold the old manifest reload it when these are gone
+    for stored in replaced:
+        for suffix in ("", *ENCODING_SUFFIXES.values()):
+            try:
+                os.remove(os.path.join(dist_dir, stored + suffix))
+            except FileNotFoundError:
+                pass
+    return manifest
@@ -0,0 +1,144 @@
+"""
+In-process PO -> MO compiler.
+
+Writes the GNU MO layout exactly as `msgfmt` does with its defaults
+(native little-endian, revision 0, alignment 1, hash table included):
+
+    header (28 bytes)
+    original string descriptors   (length, offset) * N
+    translation string descriptors (length, offset) * N
+    hash table                    uint32 * S
+    original strings, NUL-terminated, in strcmp order
+    translations, NUL-terminated, same order
+
+Like msgfmt, fuzzy entries (except the header), untranslated entries and
+obsolete entries are left out, and duplicate definitions are an error.
+"""
+import struct
+from typing import Iterable, List, Tuple
+
+from .po_file import POEntry
+
+MO_MAGIC = 0x950412DE
+_HEADER = struct.Struct("<7I")
+
+
+class MOCompileError(ValueError):
+    pass
+
+
+def hash_string(key: bytes) -> int:
+    """The hashpjw variant gettext uses for MO hash tables (__hash_string)."""
+    hval = 0
+    for byte in key:
+        hval = (hval << 4) + byte
+        g = hval & 0xF0000000
+        if g:
+            hval ^= (g >> 24) ^ g
+    return hval & 0xFFFFFFFF
+
+
+def _is_prime(candidate: int) -> bool:
+    # Same trial division as gettext's next_prime(), quirks included (3 is "not prime")
+    divisor = 3
+    square = divisor * divisor
+    while square < candidate and candidate % divisor != 0:
+        divisor += 1
+        square += 4 * divisor
+        divisor += 1
+    return candidate % divisor != 0
+
+
+def _next_prime(seed: int) -> int:
+    seed |= 1
+    while not _is_prime(seed):
+        seed += 2
+    return seed
+
+
+def hash_table_size(count: int) -> int:
+    size = _next_prime(count * 4 // 3)
+    return size if size > 2 else 3
+
+
+def _message(entry: POEntry) -> Tuple[bytes, bytes]:
+    key = entry.msgid if entry.msgctxt is None else f"{entry.msgctxt}\x04{entry.msgid}"
+    original = key.encode("utf-8")
+    if entry.msgid_plural is not None:
+        original += b"\0" + entry.msgid_plural.encode("utf-8")
+        count = max(entry.msgstr_plural) + 1 if entry.msgstr_plural else 0
+        translation = b"\0".join(entry.msgstr_plural.get(i, "").encode("utf-8") for i in range(count))
+    else:
+        translation = entry.msgstr.encode("utf-8")
+    return original, translation
+
+
+def _included(entry: POEntry) -> bool:
+    if entry.obsolete:
+        return False
+    if entry.fuzzy and not entry.is_header:
+        return False
+    if entry.msgid_plural is not None:
+        return bool(entry.msgstr_plural.get(0))
+    return bool(entry.msgstr)
+
+
+def compile_mo(entries: Iterable[POEntry]) -> bytes:
+    """Build the MO file contents for the given PO entries."""
+    messages = {}
+    for entry in entries:
+        if not _included(entry):
+            continue
+        original, translation = _message(entry)
+        key = original.split(b"\0", 1)[0]
+        if key in messages:
+            line = entry.linenos.get("msgid", 0)
+            raise MOCompileError(f"duplicate message definition for {entry.msgid!r} (line {line})")
+        messages[key] = (original, translation)
+
+    # strcmp order of the (context-qualified) msgid
+    keys = sorted(messages)
+    count = len(keys)
+    table_size = hash_table_size(count)
+
+    originals_offset = _HEADER.size
+    translations_offset = originals_offset + count * 8
+    hash_offset = translations_offset + count * 8
+    offset = hash_offset + table_size * 4
+
+    original_descriptors: List[int] = []
+    translation_descriptors: List[int] = []
+    strings: List[bytes] = []
+    for key in keys:
+        original = messages[key][0]
+        original_descriptors += [len(original), offset]
+        strings.append(original + b"\0")
+        offset += len(original) + 1
+    for key in keys:
+        translation = messages[key][1]
+        translation_descriptors += [len(translation), offset]
+        strings.append(translation + b"\0")
+        offset += len(translation) + 1
+
+    table = [0] * table_size
+    for number, key in enumerate(keys, start=1):
+        hval = hash_string(key)
+        index = hval % table_size
+        if table[index]:
+            increment = 1 + hval % (table_size - 2)
+            while table[index]:
+                if index >= table_size - increment:
+                    index -= table_size - increment
+                else:
+                    index += increment
+        table[index] = number
+
+    header = _HEADER.pack(MO_MAGIC, 0, count, originals_offset, translations_offset, table_size, hash_offset)
+    return b"".join([
+        header,
+        struct.pack(f"<{2 * count}I", *original_descriptors),
+        struct.pack(f"<{2 * count}I", *translation_descriptors),
+        struct.pack(f"<{table_size}I", *table),
+        *strings,
+    ])
+
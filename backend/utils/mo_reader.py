@@ -0,0 +1,100 @@
+"""
+Read-only access to compiled MO catalogs without loading them.
+
+The file is memory-mapped and messages are found through the MO hash
+table (the same probing gettext itself does), so a lookup touches a few
+pages of the file and costs O(1) regardless of catalog size. Catalogs
+without a hash table fall back to a binary search over the sorted
+originals.
+"""
+import mmap
+import struct
+from typing import Optional
+
+from .mo_file import MO_MAGIC, hash_string
+
+
+class MOReadError(ValueError):
+    pass
+
+
+class MOCatalog:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise MOReadError(f"{path}: empty file")
+        if len(self._map) < 28:
+            raise MOReadError(f"{path}: truncated header")
+
+        magic = struct.unpack_from("<I", self._map, 0)[0]
+        if magic == MO_MAGIC:
+            order = "<"
+        elif magic == struct.unpack(">I", struct.pack("<I", MO_MAGIC))[0]:
+            order = ">"
+        else:
+            raise MOReadError(f"{path}: bad magic number")
+        (
+            _, revision, self.count, self._originals, self._translations, self._hash_size, self._hash_offset
+        ) = struct.unpack_from(f"{order}7I", self._map, 0)
+        if revision >> 16:
+            raise MOReadError(f"{path}: unsupported revision {revision}")
+        if self._originals + self.count * 8 > len(self._map) or self._translations + self.count * 8 > len(self._map):
+            raise MOReadError(f"{path}: descriptor table out of range")
+        self._pair = struct.Struct(f"{order}2I")
+        self._slot = struct.Struct(f"{order}I")
+
+    def _original(self, index: int) -> bytes:
+        length, offset = self._pair.unpack_from(self._map, self._originals + index * 8)
+        return self._map[offset:offset + length]
+
+    def _translation(self, index: int) -> bytes:
+        length, offset = self._pair.unpack_from(self._map, self._translations + index * 8)
+        return self._map[offset:offset + length]
+
+    def _matches(self, index: int, key: bytes) -> bool:
+        length, offset = self._pair.unpack_from(self._map, self._originals + index * 8)
+        # Plural originals are "msgid\0msgid_plural"; only the msgid is the key
+        if length < len(key) or (length > len(key) and self._map[offset + len(key)] != 0):
+            return False
+        return self._map[offset:offset + len(key)] == key
+
+    def _find(self, key: bytes) -> Optional[int]:
+        size = self._hash_size
+        if size > 2:
+            hval = hash_string(key)
+            index = hval % size
+            increment = 1 + hval % (size - 2)
+            for _ in range(size):
+                number = self._slot.unpack_from(self._map, self._hash_offset + index * 4)[0]
+                if number == 0:
+                    return None
+                if number <= self.count and self._matches(number - 1, key):
+                    return number - 1
+                index = index - (size - increment) if index >= size - increment else index + increment
+            return None
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            original = self._original(middle).split(b"\0", 1)[0]
+            if original == key:
+                return middle
+            if original < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def gettext(self, msgid: str, msgctxt: Optional[str] = None) -> Optional[str]:
+        """The translation of msgid (singular form for plurals), or None when absent."""
+        key = msgid if msgctxt is None else f"{msgctxt}\x04{msgid}"
+        index = self._find(key.encode("utf-8"))
+        if index is None:
+            return None
+        return self._translation(index).split(b"\0", 1)[0].decode("utf-8")
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,210 @@
+"""
+Duplicate and near-duplicate detection for msgids.
+
+Two levels:
+
+    surface_key()       msgids that differ only in whitespace, case or
+                        final punctuation share a key; a translation of
+                        one can be reused for the others with
+                        adapt_translation()
+    NearDuplicateIndex  MinHash signatures of character 3-grams with LSH
+                        banding, for msgids that are merely similar
+                        (typos, a word added); used for cleanup reports
+                        only, never for reuse
+
+The MinHash is one-permutation hashing: every shingle is hashed once and
+the hash picks one of SIGNATURE_BINS bins, which keeps the minimum. Empty
+bins borrow from the next filled one. Candidates that share a band are
+verified with the exact Jaccard similarity of their shingle sets.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SHINGLE_SIZE = 3
+SIGNATURE_BINS = 32
+BAND_ROWS = 4
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_FINAL_PUNCTUATION = ".:!?…;,。！？：；，।॥។៕۔؟;"
+
+
+def split_surface(text: str) -> Tuple[str, str, str, str]:
+    """(leading whitespace, core, final punctuation, trailing whitespace)"""
+    stripped = text.lstrip()
+    lead = text[:len(text) - len(stripped)]
+    body = stripped.rstrip()
+    trail = stripped[len(body):]
+    core = body.rstrip(_FINAL_PUNCTUATION + " \t")
+    return lead, core, body[len(core):], trail
+
+
+def surface_key(msgid: str) -> str:
+    """Normalized form: NFC, single spaces, case-folded, without final punctuation."""
+    core = split_surface(unicodedata.normalize("NFC", msgid))[1]
+    return _WHITESPACE_RE.sub(" ", core).casefold()
+
+
+def _case(text: str) -> Optional[str]:
+    if text.upper() == text.lower():
+        return None
+    if text == text.upper() and sum(ch.isalpha() for ch in text) > 1:
+        return "upper"
+    first = next((ch for ch in text if ch.isalpha()), "")
+    return "capitalized" if first.isupper() else "lower"
+
+
+def _apply_case(text: str, case: Optional[str]) -> str:
+    if case == "upper":
+        return text.upper()
+    index = next((i for i, ch in enumerate(text) if ch.isalpha()), None)
+    if index is None or case is None:
+        return text
+    first = text[index].upper() if case == "capitalized" else text[index].lower()
+    return text[:index] + first + text[index + 1:]
+
+
+def adapt_translation(source: str, translation: str, target: str) -> str:
+    """
+    Turn the translation of `source` into one for `target`, a msgid with the
+    same surface_key: target's outer whitespace and final punctuation, and
+    its casing where the translation's script has case.
+    """
+    if source == target:
+        return translation
+    _, source_core, source_punct, _ = split_surface(source)
+    target_lead, target_core, target_punct, target_trail = split_surface(target)
+    _, core, punct, _ = split_surface(translation)
+
+    # Keep the translation's own mark (e.g. "।" for ".") when the sources agree
+    if source_punct.strip() != target_punct.strip():
+        punct = target_punct
+    source_case, target_case = _case(source_core), _case(target_core)
+    if source_case != target_case and _case(core) is not None:
+        core = _apply_case(core, target_case)
+    return target_lead + core + punct + target_trail
+
+
+@lru_cache(maxsize=1 << 16)
+def _gram_hash(gram: str) -> int:
+    return int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(key: str) -> Set[int]:
+    padded = f" {key} "
+    return {_gram_hash(padded[i:i + SHINGLE_SIZE]) for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+
+
+def signature(hashes: Iterable[int]) -> Tuple[int, ...]:
+    bins: List[Optional[int]] = [None] * SIGNATURE_BINS
+    for value in hashes:
+        slot, rest = value % SIGNATURE_BINS, value // SIGNATURE_BINS
+        if bins[slot] is None or rest < bins[slot]:
+            bins[slot] = rest
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return tuple([0] * SIGNATURE_BINS)
+    # Densify: an empty bin takes the value of the next filled bin to its right
+    result = list(bins)
+    for i in range(SIGNATURE_BINS):
+        if result[i] is None:
+            j = next((f for f in filled if f > i), filled[0])
+            result[i] = bins[j] + (j - i) % SIGNATURE_BINS
+    return tuple(result)
+
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class NearDuplicateIndex:
+    """Groups msgids by surface_key and finds near-duplicate groups with MinHash LSH."""
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.groups: Dict[str, List[str]] = {}
+        self._shingles: Dict[str, Set[int]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self.groups.values())
+
+    def add(self, msgid: str):
+        key = surface_key(msgid)
+        members = self.groups.get(key)
+        if members is not None:
+            members.append(msgid)
+            return
+        self.groups[key] = [msgid]
+        hashes = shingles(key)
+        self._shingles[key] = hashes
+        sig = signature(hashes)
+        for band in range(0, SIGNATURE_BINS, BAND_ROWS):
+            self._buckets[(band, sig[band:band + BAND_ROWS])].append(key)
+
+    def add_all(self, msgids: Iterable[str]) -> "NearDuplicateIndex":
+        for msgid in msgids:
+            self.add(msgid)
+        return self
+
+    def _near_pairs(self) -> Iterable[Tuple[str, str, float]]:
+        checked = set()
+        for keys in self._buckets.values():
+            if len(keys) < 2:
+                continue
+            for i, first in enumerate(keys):
+                for second in keys[i + 1:]:
+                    pair = (first, second) if first < second else (second, first)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    score = jaccard(self._shingles[first], self._shingles[second])
+                    if score >= self.threshold:
+                        yield first, second, score
+
+    def clusters(self) -> List[dict]:
+        """
+        Duplicate clusters, largest first. `exact` clusters share a
+        surface_key; `near` clusters join keys whose similarity reaches
+        the threshold (their members are listed per key).
+        """
+        parent = {}
+
+        def find(key):
+            while parent.get(key, key) != key:
+                parent[key] = parent.get(parent[key], parent[key])
+                key = parent[key]
+            return key
+
+        scores = defaultdict(float)
+        for first, second, score in self._near_pairs():
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[root_second] = root_first
+            scores[first] = max(scores[first], score)
+            scores[second] = max(scores[second], score)
+
+        joined = defaultdict(list)
+        for key in self._shingles:
+            joined[find(key)].append(key)
+
+        clusters = []
+        for keys in joined.values():
+            if len(keys) == 1:
+                members = self.groups[keys[0]]
+                if len(members) > 1:
+                    clusters.append({"kind": "exact", "key": keys[0], "msgids": members})
+            else:
+                clusters.append({
+                    "kind": "near",
+                    "keys": sorted(keys),
+                    "msgids": [msgid for key in sorted(keys) for msgid in self.groups[key]],
+                    "min_similarity": round(min(scores[key] for key in keys), 3),
+                })
+        clusters.sort(key=lambda cluster: -len(cluster["msgids"]))
+        return clusters
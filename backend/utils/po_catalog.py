@@ -0,0 +1,293 @@
+"""
+Incremental, append-only updates of PO catalogs.
+
+Next to every catalog we keep `<catalog>.idx`, a compact index of 64-bit
+msgid hashes:
+
+    header (40 bytes) | sorted hashes (8 bytes each) | appended hashes
+
+The sorted part is memory-mapped and binary searched; hashes of entries
+appended since the last merge live in the short unsorted tail. The header
+records the catalog's size, mtime and a CRC of its last bytes, so an index
+that no longer matches its catalog (edited by hand, rewritten by an upload,
+a crash between the two writes) is rebuilt with one streaming pass.
+
+Adding entries only appends to the catalog and the index, and the header
+revision date is patched in place, so the cost of an update is proportional
+to the number of new entries rather than to the size of the catalog. The
+catalog is rewritten in full only when that is unavoidable (see compact()).
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .po_file import POEntry, read_po, write_po
+
+INDEX_SUFFIX = ".idx"
+_INDEX_MAGIC = b"POIX"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<4sHHQQQI4x")
+_KEY_SIZE = 8
+# Bytes at the end of the catalog covered by the staleness CRC
+_TAIL_BYTES = 256
+# The header entry is expected within the first block of the file
+_HEADER_SCAN_BYTES = 64 * 1024
+
+
+def entry_key(msgid: str, msgctxt: Optional[str] = None) -> int:
+    """64-bit hash identifying an entry by context and msgid."""
+    text = msgid if msgctxt is None else f"{msgctxt}\x04{msgid}"
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=_KEY_SIZE).digest(), "little")
+
+
+def _catalog_state(po_path: str):
+    stat = os.stat(po_path)
+    with open(po_path, "rb") as f:
+        f.seek(max(0, stat.st_size - _TAIL_BYTES))
+        tail_crc = zlib.crc32(f.read())
+    return stat.st_size, stat.st_mtime_ns, tail_crc
+
+
+class POCatalogIndex:
+    """Sorted-plus-tail msgid hash index stored in `<po_path>.idx`."""
+
+    def __init__(self, po_path: str, merge_threshold: int = 1024):
+        self.po_path = po_path
+        self.path = po_path + INDEX_SUFFIX
+        self.merge_threshold = merge_threshold
+        self.sorted_count = 0
+        self.tail = set()
+        # Catalog (size, mtime, tail CRC) the index was last written for
+        self.state = None
+        self._file = None
+        self._map = None
+        self._sorted = None
+        self._load()
+
+    def _load(self):
+        if not self._read_index():
+            self.rebuild()
+
+    def _read_index(self) -> bool:
+        try:
+            state = _catalog_state(self.po_path)
+            with open(self.path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return False
+                magic, version, _, po_size, po_mtime, sorted_count, tail_crc = _INDEX_HEADER.unpack(header)
+                if magic != _INDEX_MAGIC or version != _INDEX_VERSION or (po_size, po_mtime, tail_crc) != state:
+                    return False
+                f.seek(_INDEX_HEADER.size + sorted_count * _KEY_SIZE)
+                tail = array("Q")
+                tail.frombytes(f.read())
+        except (OSError, ValueError):
+            return False
+
+        self._close_map()
+        self.sorted_count = sorted_count
+        self.tail = set(tail)
+        self.state = state
+        if sorted_count:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            end = _INDEX_HEADER.size + sorted_count * _KEY_SIZE
+            self._sorted = memoryview(self._map)[_INDEX_HEADER.size:end].cast("Q")
+        return True
+
+    def _close_map(self):
+        if self._sorted is not None:
+            self._sorted.release()
+            self._sorted = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_map()
+
+    def __contains__(self, key: int) -> bool:
+        if key in self.tail:
+            return True
+        if not self.sorted_count:
+            return False
+        position = bisect.bisect_left(self._sorted, key)
+        return position < self.sorted_count and self._sorted[position] == key
+
+    def __len__(self) -> int:
+        return self.sorted_count + len(self.tail)
+
+    def _write(self, keys: List[int]):
+        """Write a fully sorted index for the catalog's current state."""
+        self._close_map()
+        keys = sorted(set(keys))
+        state = _catalog_state(self.po_path)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, 0, state[0], state[1], len(keys), state[2]))
+            f.write(array("Q", keys).tobytes())
+        os.replace(tmp_path, self.path)
+        self._read_index()
+
+    def rebuild(self):
+        """Re-index the catalog with one streaming pass over it."""
+        keys = [
+            entry_key(entry.msgid, entry.msgctxt)
+            for entry in read_po(self.po_path)
+            if not entry.is_header and not entry.obsolete
+        ]
+        self._write(keys)
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the index if the catalog changed since the index was last
+        written (rewritten by an upload, edited by hand). Call it before
+        writing to the catalog; returns True when a rebuild was needed.
+        """
+        if _catalog_state(self.po_path) == self.state:
+            return False
+        self.rebuild()
+        return True
+
+    def merge(self):
+        """Fold the appended tail into the sorted part."""
+        keys = list(self._sorted) if self.sorted_count else []
+        self._write(keys + list(self.tail))
+
+    def add(self, keys: Iterable[int]):
+        """
+        Record keys of entries that were just appended to the catalog.
+        Must be called after the catalog write, and refresh() before it, so
+        the stored state matches the catalog the keys were checked against.
+        """
+        keys = [key for key in keys if key not in self]
+        if len(self.tail) + len(keys) > max(self.merge_threshold, self.sorted_count // 8):
+            self.tail.update(keys)
+            self.merge()
+            return
+
+        state = _catalog_state(self.po_path)
+        with open(self.path, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            f.write(array("Q", keys).tobytes())
+            f.seek(0)
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, 0, state[0], state[1], self.sorted_count, state[2]))
+        self.tail.update(keys)
+        self.state = state
+
+
+class IncrementalPOCatalog:
+    """
+    Append-only writer for an existing PO catalog.
+
+    Entries whose msgid is already in the catalog are skipped using the
+    sidecar index; new ones are appended to the end of the file.
+    """
+
+    def __init__(self, po_path: str):
+        self.po_path = po_path
+        self.index = POCatalogIndex(po_path)
+
+    def close(self):
+        self.index.close()
+
+    def __contains__(self, entry: POEntry) -> bool:
+        return entry_key(entry.msgid, entry.msgctxt) in self.index
+
+    def append(self, entries: Iterable[POEntry]) -> int:
+        """Append the entries that are not in the catalog yet; returns how many were written."""
+        self.index.refresh()
+        new_entries = []
+        keys = set()
+        for entry in entries:
+            key = entry_key(entry.msgid, entry.msgctxt)
+            if entry.is_header or key in keys or key in self.index:
+                continue
+            keys.add(key)
+            new_entries.append(entry)
+        if not new_entries:
+            return 0
+
+        # Make sure the new entries start after a blank line
+        with open(self.po_path, "rb") as f:
+            f.seek(max(0, os.path.getsize(self.po_path) - 2))
+            tail = f.read()
+        separator = "" if tail.endswith(b"\n\n") or not tail else "\n" if tail.endswith(b"\n") else "\n\n"
+        with open(self.po_path, "a", encoding="utf-8") as f:
+            f.write(separator)
+            write_po(f, new_entries)
+
+        self.index.add(keys)
+        return len(new_entries)
+
+    def patch_header(self, fields: Dict[str, str], comments: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Replace header values in place, e.g. {"PO-Revision-Date": "..."} and
+        the '# date: ...' comment via comments={"date": "..."}.
+
+        Only same-length replacements can be done in place; returns False
+        (and changes nothing) when any value would change length.
+        """
+        self.index.refresh()
+        with open(self.po_path, "rb") as f:
+            head = f.read(_HEADER_SCAN_BYTES)
+        header_end = head.find(b'msgid ""')
+        header_end = head.find(b"\n\n", header_end) if header_end >= 0 else -1
+        if header_end < 0:
+            return False
+
+        patches = []
+        patterns = [(rb'"' + re.escape(name.encode()) + rb': ([^"\\]*)\\n"', value) for name, value in fields.items()]
+        patterns += [(rb'(?m)^# ' + re.escape(name.encode()) + rb': (.*)$', value) for name, value in (comments or {}).items()]
+        for pattern, value in patterns:
+            match = re.search(pattern, head[:header_end])
+            if match is None:
+                return False
+            value = value.encode("utf-8")
+            if len(value) != match.end(1) - match.start(1):
+                return False
+            patches.append((match.start(1), value))
+
+        # Keep the index valid across the in-place write; its state covers size and tail only
+        with open(self.po_path, "r+b") as f:
+            for offset, value in patches:
+                f.seek(offset)
+                f.write(value)
+        self.index.add([])
+        return True
+
+    def compact(self, transform: Optional[Callable[[POEntry], Optional[POEntry]]] = None):
+        """
+        Rewrite the whole catalog: duplicate msgids are dropped (first one wins)
+        and `transform` may modify or drop (return None) each entry.
+        The index is rebuilt afterwards.
+        """
+        seen = set()
+
+        def entries():
+            for entry in read_po(self.po_path):
+                if transform is not None:
+                    entry = transform(entry)
+                    if entry is None:
+                        continue
+                if not entry.is_header and not entry.obsolete:
+                    key = entry_key(entry.msgid, entry.msgctxt)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                yield entry
+
+        tmp_path = self.po_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            write_po(f, entries())
+        os.replace(tmp_path, self.po_path)
+        self.index.rebuild()
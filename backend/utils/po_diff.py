@@ -0,0 +1,177 @@
+"""
+Entry-level diff of two PO catalogs.
+
+Entries are keyed by (msgctxt, msgid) in hash maps, so a diff is linear
+in the size of both catalogs. Every key is classified as
+
+    added       only in the new catalog
+    removed     only in the old catalog
+    changed     msgstr differs
+    whitespace  msgstr differs only in whitespace
+
+A msgid corrected only in whitespace is matched with its old spelling and
+classified by its msgstr like any other pair; old_msgid is then set.
+
+Unchanged entries are only counted. The header and obsolete entries are
+ignored. apply_changes() then streams the old catalog with a chosen subset
+of the changes applied, keeping the entries in place; merge_translations()
+does the same for plain msgid -> msgstr pairs, such as an upload.
+"""
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .po_file import POEntry
+
+CHANGE_KINDS = ("added", "removed", "changed", "whitespace")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+Key = Tuple[Optional[str], str]
+
+
+@dataclass
+class POChange:
+    kind: str
+    msgid: str
+    msgctxt: Optional[str]
+    old: Optional[str]
+    new: Optional[str]
+    line: int
+    old_msgid: Optional[str] = None
+    # The entry from the new catalog (None for removals)
+    entry: Optional[POEntry] = None
+
+    @property
+    def old_key(self) -> Key:
+        return (self.msgctxt, self.old_msgid if self.old_msgid is not None else self.msgid)
+
+    def as_dict(self) -> dict:
+        return {
+            key: value for key, value in self.__dict__.items()
+            if key != "entry" and (value is not None or key in ("old", "new"))
+        }
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _translation(entry: POEntry) -> str:
+    if entry.fuzzy:
+        return ""
+    if entry.msgid_plural is not None:
+        return "\0".join(entry.msgstr_plural.get(i, "") for i in range(max(entry.msgstr_plural, default=0) + 1))
+    return entry.msgstr
+
+
+def _index(entries: Iterable[POEntry]) -> Dict[Key, POEntry]:
+    index = {}
+    for entry in entries:
+        if entry.is_header or entry.obsolete:
+            continue
+        # Like msgfmt and our loaders, the first definition wins
+        index.setdefault((entry.msgctxt, entry.msgid), entry)
+    return index
+
+
+def diff_catalogs(old_entries: Iterable[POEntry], new_entries: Iterable[POEntry]) -> Tuple[List[POChange], int]:
+    """Compare two catalogs. Returns (changed, added and then removed entries; unchanged count)."""
+    old = _index(old_entries)
+    changes: List[POChange] = []
+    added: List[POEntry] = []
+    unchanged = 0
+    seen = set()
+
+    for key, entry in _index(new_entries).items():
+        seen.add(key)
+        previous = old.get(key)
+        if previous is None:
+            added.append(entry)
+            continue
+        before, after = _translation(previous), _translation(entry)
+        if before == after:
+            unchanged += 1
+            continue
+        kind = "whitespace" if _normalize(before) == _normalize(after) else "changed"
+        changes.append(POChange(kind, entry.msgid, entry.msgctxt, before, after, entry.linenos.get("msgid", 0), entry=entry))
+
+    removed = {key: entry for key, entry in old.items() if key not in seen}
+
+    # An added msgid that matches a removed one up to whitespace is a corrected msgid
+    removed_by_text = {}
+    for (msgctxt, msgid), entry in removed.items():
+        removed_by_text.setdefault((msgctxt, _normalize(msgid)), entry)
+    for entry in added:
+        previous = removed_by_text.pop((entry.msgctxt, _normalize(entry.msgid)), None)
+        line = entry.linenos.get("msgid", 0)
+        if previous is None:
+            changes.append(POChange("added", entry.msgid, entry.msgctxt, None, _translation(entry), line, entry=entry))
+            continue
+        del removed[(previous.msgctxt, previous.msgid)]
+        before, after = _translation(previous), _translation(entry)
+        kind = "whitespace" if _normalize(before) == _normalize(after) else "changed"
+        changes.append(POChange(
+            kind, entry.msgid, entry.msgctxt, before, after, line, old_msgid=previous.msgid, entry=entry
+        ))
+
+    for entry in removed.values():
+        changes.append(POChange("removed", entry.msgid, entry.msgctxt, _translation(entry), None, entry.linenos.get("msgid", 0)))
+    return changes, unchanged
+
+
+def apply_changes(old_entries: Iterable[POEntry], changes: Iterable[POChange]) -> Iterator[POEntry]:
+    """
+    The old catalog with the changes applied: replaced entries keep their
+    position, removed ones are dropped and added ones are appended.
+    """
+    replaced: Dict[Key, POEntry] = {}
+    removed = set()
+    added = []
+    for change in changes:
+        if change.kind == "removed":
+            removed.add(change.old_key)
+        elif change.kind == "added":
+            added.append(change.entry)
+        else:
+            replaced[change.old_key] = change.entry
+
+    for entry in old_entries:
+        key = (entry.msgctxt, entry.msgid)
+        if entry.is_header or entry.obsolete:
+            yield entry
+        elif key in removed:
+            removed.discard(key)
+        elif key in replaced:
+            yield replaced.pop(key)
+        else:
+            yield entry
+    yield from added
+
+
+def merge_translations(
+    old_entries: Iterable[POEntry],
+    translations: Dict[str, str],
+    changed: Dict[str, str]
+) -> Iterator[POEntry]:
+    """
+    The old catalog with msgid -> msgstr translations merged in: an entry
+    with a new translation takes it in place (and loses its fuzzy flag),
+    every other entry is kept and unknown msgids are appended. Nothing is
+    removed. Pairs that differ from the catalog are added to `changed`.
+    `translations` is consumed.
+    """
+    for entry in old_entries:
+        plain = not entry.is_header and not entry.obsolete and entry.msgctxt is None and entry.msgid_plural is None
+        msgstr = translations.pop(entry.msgid, None) if plain else None
+        if msgstr is None:
+            yield entry
+        elif msgstr == entry.msgstr and not entry.fuzzy:
+            yield entry
+        else:
+            changed[entry.msgid] = msgstr
+            yield replace(entry, msgstr=msgstr, flags=[flag for flag in entry.flags if flag != "fuzzy"])
+    for msgid, msgstr in translations.items():
+        changed[msgid] = msgstr
+        yield POEntry(msgid=msgid, msgstr=msgstr)
+    translations.clear()
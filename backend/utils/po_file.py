@@ -0,0 +1,271 @@
+"""
+Streaming reader and writer for gettext PO catalogs.
+
+The parser is a single pass over lines and yields one POEntry at a time, so
+callers can work through large catalogs without holding them in memory. It
+understands multi-line strings, C escapes, all comment kinds, msgctxt,
+plurals and obsolete (#~) entries. The writer emits the same layout we
+generate elsewhere: one entry per block, blocks separated by a blank line.
+
+Only the standard library is used so the standalone scripts can import it too.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+_UNESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\",
+    "a": "\a", "b": "\b", "f": "\f", "v": "\v",
+}
+_ESCAPE_RE = re.compile(r'\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)', re.DOTALL)
+_NEEDS_ESCAPE_RE = re.compile(r'[\\"\n\t\r\a\b\f\v]')
+_ESCAPES = {value: "\\" + key for key, value in _UNESCAPES.items()}
+_PLURAL_RE = re.compile(r'msgstr\[(\d+)\]')
+
+
+class POSyntaxError(ValueError):
+    def __init__(self, message: str, lineno: int):
+        super().__init__(f"line {lineno}: {message}")
+        self.lineno = lineno
+
+
+@dataclass
+class POEntry:
+    msgid: str
+    msgstr: str = ""
+    msgctxt: Optional[str] = None
+    msgid_plural: Optional[str] = None
+    msgstr_plural: Dict[int, str] = field(default_factory=dict)
+    translator_comments: List[str] = field(default_factory=list)
+    extracted_comments: List[str] = field(default_factory=list)
+    references: List[str] = field(default_factory=list)
+    flags: List[str] = field(default_factory=list)
+    previous: List[str] = field(default_factory=list)
+    obsolete: bool = False
+    # Source line of each keyword (msgid, msgstr, msgstr[0], ...), for reports
+    linenos: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def is_header(self) -> bool:
+        return self.msgid == "" and self.msgctxt is None
+
+    @property
+    def fuzzy(self) -> bool:
+        return "fuzzy" in self.flags
+
+    @property
+    def translated(self) -> bool:
+        if self.msgid_plural is not None:
+            return bool(self.msgstr_plural) and all(self.msgstr_plural.values())
+        return bool(self.msgstr)
+
+
+def unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+
+    def replace(match):
+        token = match.group(1)
+        if token[0] == "x":
+            return chr(int(token[1:], 16))
+        if token[0] in "01234567":
+            return chr(int(token, 8))
+        return _UNESCAPES.get(token, token)
+
+    return _ESCAPE_RE.sub(replace, value)
+
+
+def escape(value: str) -> str:
+    if not _NEEDS_ESCAPE_RE.search(value):
+        return value
+    return _NEEDS_ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(0)], value)
+
+
+def _quoted(text: str, lineno: int) -> str:
+    text = text.strip()
+    if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+        raise POSyntaxError(f"expected a quoted string, got {text!r}", lineno)
+    return text[1:-1]
+
+
+def iter_po(lines: Iterable[str]) -> Iterator[POEntry]:
+    """
+    Parse PO lines and yield entries as soon as each one is complete.
+    `lines` can be an open file, so the catalog is never fully loaded.
+    """
+    entry = None
+    # Field that continuation lines ("...") are appended to
+    target = None
+    parts: List[str] = []
+    has_msgstr = False
+    comments = POEntry(msgid="")
+
+    def finish_field():
+        if target is None:
+            return
+        value = unescape("".join(parts))
+        if isinstance(target, int):
+            entry.msgstr_plural[target] = value
+        else:
+            setattr(entry, target, value)
+
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        obsolete = False
+        if line.startswith("#~"):
+            obsolete = True
+            line = line[2:].lstrip()
+            if line.startswith("|"):
+                line = "#" + line
+
+        if not line:
+            continue
+
+        first = line[0]
+        if first == '"':
+            if target is None:
+                raise POSyntaxError("string continuation without a keyword", lineno)
+            parts.append(_quoted(line, lineno))
+            continue
+
+        if first == "#":
+            # A comment after msgstr begins the next entry
+            if entry is not None and has_msgstr:
+                finish_field()
+                yield entry
+                entry, target, parts, has_msgstr = None, None, [], False
+            kind = line[1:2]
+            if kind == ",":
+                comments.flags.extend(f.strip() for f in line[2:].split(",") if f.strip())
+            elif kind == ":":
+                comments.references.extend(line[2:].split())
+            elif kind == ".":
+                comments.extracted_comments.append(line[2:].strip())
+            elif kind == "|":
+                comments.previous.append(line[2:].strip())
+            else:
+                comments.translator_comments.append(line[2:] if kind == " " else line[1:])
+            continue
+
+        keyword, _, rest = line.partition(" ")
+        finish_field()
+        target = None
+        # msgctxt always opens an entry; msgid does unless it follows that entry's msgctxt
+        if keyword == "msgctxt" or keyword == "msgid" and (entry is None or "msgid" in entry.linenos):
+            if entry is not None:
+                yield entry
+            entry = comments
+            entry.obsolete = obsolete
+            comments = POEntry(msgid="")
+            has_msgstr = False
+
+        if entry is None:
+            raise POSyntaxError(f"{keyword} before msgid", lineno)
+
+        if keyword in ("msgctxt", "msgid", "msgid_plural", "msgstr"):
+            target = keyword
+            has_msgstr = has_msgstr or keyword == "msgstr"
+        else:
+            match = _PLURAL_RE.fullmatch(keyword)
+            if not match:
+                raise POSyntaxError(f"unknown keyword {keyword!r}", lineno)
+            target = int(match.group(1))
+            has_msgstr = True
+        entry.linenos[keyword] = lineno
+        parts = [_quoted(rest, lineno)]
+
+    finish_field()
+    if entry is not None:
+        yield entry
+
+
+def parse_po(content: str) -> List[POEntry]:
+    # str.splitlines() would also break on characters such as U+2028 inside strings
+    return list(iter_po(content.split("\n")))
+
+
+def read_po(path: str) -> Iterator[POEntry]:
+    """Stream the entries of a PO file."""
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_po(f)
+
+
+def _format_string(keyword: str, value: str, prefix: str) -> str:
+    # Values with embedded newlines are split after each \n, like msgcat does
+    if "\n" in value[:-1]:
+        pieces = [piece + "\n" for piece in value.split("\n")]
+        pieces[-1] = pieces[-1][:-1]
+        if not pieces[-1]:
+            pieces.pop()
+        lines = [f'{prefix}{keyword} ""']
+        lines.extend(f'{prefix}"{escape(piece)}"' for piece in pieces)
+        return "\n".join(lines) + "\n"
+    return f'{prefix}{keyword} "{escape(value)}"\n'
+
+
+def format_entry(entry: POEntry) -> str:
+    """Serialize one entry, without the blank separator line."""
+    out = []
+    for comment in entry.translator_comments:
+        out.append(f"# {comment}\n" if comment else "#\n")
+    for comment in entry.extracted_comments:
+        out.append(f"#. {comment}\n")
+    if entry.references:
+        out.append(f"#: {' '.join(entry.references)}\n")
+    if entry.flags:
+        out.append(f"#, {', '.join(entry.flags)}\n")
+    prefix = "#~ " if entry.obsolete else ""
+    for previous in entry.previous:
+        out.append(f"{prefix}#| {previous}\n")
+    if entry.msgctxt is not None:
+        out.append(_format_string("msgctxt", entry.msgctxt, prefix))
+    out.append(_format_string("msgid", entry.msgid, prefix))
+    if entry.msgid_plural is not None:
+        out.append(_format_string("msgid_plural", entry.msgid_plural, prefix))
+        for index in sorted(entry.msgstr_plural):
+            out.append(_format_string(f"msgstr[{index}]", entry.msgstr_plural[index], prefix))
+    else:
+        out.append(_format_string("msgstr", entry.msgstr, prefix))
+    return "".join(out)
+
+
+def write_po(fp: IO[str], entries: Iterable[POEntry], append: bool = False) -> int:
+    """
+    Stream entries to an open text file and return how many were written.
+    With append=True the first entry is also preceded by a blank line.
+    """
+    count = 0
+    for entry in entries:
+        if count or append:
+            fp.write("\n")
+        fp.write(format_entry(entry))
+        count += 1
+    return count
+
+
+def translation_map(entries: Iterable[POEntry]) -> Dict[str, str]:
+    """
+    msgid -> msgstr of the usable translations: no header, obsolete, fuzzy,
+    context, plural or empty entries. The first definition of a msgid wins.
+    """
+    translations = {}
+    for entry in entries:
+        if entry.is_header or entry.obsolete or entry.fuzzy or entry.msgctxt is not None:
+            continue
+        if entry.msgid_plural is None and entry.msgstr:
+            translations.setdefault(entry.msgid, entry.msgstr)
+    return translations
+
+
+def dump_po(entries: Iterable[POEntry]) -> str:
+    return "\n".join(format_entry(entry) for entry in entries)
+
+
+def header_fields(header: POEntry) -> Dict[str, str]:
+    """Parse the 'Key: value' lines of the header entry's msgstr."""
+    fields = {}
+    for line in header.msgstr.split("\n"):
+        key, sep, value = line.partition(":")
+        if sep:
+            fields[key.strip()] = value.strip()
+    return fields
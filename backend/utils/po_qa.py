@@ -0,0 +1,214 @@
+"""
+Rule-based QA checks for PO catalogs.
+
+A rule is a function (source, target) -> message or None, registered
+with @rule("name"). It is called once per translated pair: (msgid, msgstr)
+for plain entries, and (msgid, msgstr[0]) plus (msgid_plural, msgstr[n])
+for plural ones. The target is "" when the entry is untranslated. The
+header and obsolete entries are skipped.
+
+check_po() makes one streaming pass over a file and applies every
+selected rule to every pair; write_qa_report() also saves the full report
+as JSON, for the API and the command-line checker alike.
+"""
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .po_file import POEntry, read_po
+
+Rule = Callable[[str, str], Optional[str]]
+
+RULES: Dict[str, Rule] = {}
+
+
+def rule(name: str):
+    def register(func: Rule) -> Rule:
+        RULES[name] = func
+        return func
+    return register
+
+
+_WHITESPACE = " \t\u00a0\u3000"
+_DOUBLE_SPACE_RE = re.compile(r"\S {2,}(?=\S)")
+# printf-style (%s, %d, %1$s, %(name)s, %.2f) and brace-style ({0}, {name}) placeholders
+_PLACEHOLDER_RE = re.compile(r"%(?:\d+\$|\([^)]+\))?[-+ #0]*\d*(?:\.\d+)?[sdifuxXeEgGcr%]|\{[A-Za-z0-9_.]*\}")
+# Group and decimal separators: ASCII, Arabic (U+066B, U+066C) and the
+# no-break spaces French and others group thousands with (U+00A0, U+202F)
+_NUMBER_RE = re.compile(r"\d+(?:[.,\u066b\u066c\u00a0\u202f]\d+)*")
+
+# Sentence-final punctuation; scripts with their own marks map onto the same class
+_PUNCTUATION_CLASSES = {
+    ".": "period", "。": "period", "।": "period", "។": "period", "۔": "period",
+    "?": "question", "？": "question", "؟": "question", "\u037e": "question",
+    "!": "exclamation", "！": "exclamation",
+    ":": "colon", "：": "colon",
+    "…": "ellipsis",
+}
+_QUOTE_PAIRS = (("“", "”"), ("‘", "’"), ("«", "»"), ("「", "」"))
+
+
+def _final_punctuation(text: str) -> Optional[str]:
+    text = text.rstrip(_WHITESPACE)
+    if text.endswith("...") or text.endswith("…"):
+        return "ellipsis"
+    return _PUNCTUATION_CLASSES.get(text[-1:]) if text else None
+
+
+def _numbers(text: str) -> Counter:
+    # \d matches any script's digits; comparing values lets "3" equal "៣",
+    # and dropping separators lets "1,000" equal "1.000"
+    values = Counter()
+    for match in _NUMBER_RE.finditer(_PLACEHOLDER_RE.sub(" ", text)):
+        values["".join(str(unicodedata.digit(ch)) for ch in match.group() if ch.isdigit())] += 1
+    return values
+
+
+@rule("untranslated")
+def untranslated(source: str, target: str) -> Optional[str]:
+    if source and not target:
+        return "no translation"
+    return None
+
+
+@rule("trailing-whitespace")
+def trailing_whitespace(source: str, target: str) -> Optional[str]:
+    for key, value in (("msgid", source), ("msgstr", target)):
+        trail = len(value) - len(value.rstrip(_WHITESPACE))
+        if trail:
+            return f"{key} ends with {trail} whitespace character(s)"
+    return None
+
+
+@rule("leading-whitespace")
+def leading_whitespace(source: str, target: str) -> Optional[str]:
+    for key, value in (("msgid", source), ("msgstr", target)):
+        lead = len(value) - len(value.lstrip(_WHITESPACE))
+        if lead:
+            return f"{key} starts with {lead} whitespace character(s)"
+    return None
+
+
+@rule("double-space")
+def double_space(source: str, target: str) -> Optional[str]:
+    for key, value in (("msgid", source), ("msgstr", target)):
+        if _DOUBLE_SPACE_RE.search(value):
+            return f"{key} contains repeated spaces"
+    return None
+
+
+@rule("placeholder-mismatch")
+def placeholder_mismatch(source: str, target: str) -> Optional[str]:
+    if not target:
+        return None
+    expected = Counter(_PLACEHOLDER_RE.findall(source))
+    found = Counter(_PLACEHOLDER_RE.findall(target))
+    if expected == found:
+        return None
+    missing = sorted((expected - found).elements())
+    extra = sorted((found - expected).elements())
+    parts = ([f"missing {', '.join(missing)}"] if missing else []) + ([f"unexpected {', '.join(extra)}"] if extra else [])
+    return "placeholders differ: " + "; ".join(parts)
+
+
+@rule("number-mismatch")
+def number_mismatch(source: str, target: str) -> Optional[str]:
+    if not target:
+        return None
+    expected, found = _numbers(source), _numbers(target)
+    if expected == found:
+        return None
+    return f"numbers differ: {sorted(expected.elements())} vs {sorted(found.elements())}"
+
+
+@rule("punctuation-mismatch")
+def punctuation_mismatch(source: str, target: str) -> Optional[str]:
+    if not target:
+        return None
+    expected, found = _final_punctuation(source), _final_punctuation(target)
+    if expected == found:
+        return None
+    if expected and not found:
+        return f"final {expected} dropped"
+    if found and not expected:
+        return f"final {found} added"
+    return f"final {expected} became {found}"
+
+
+@rule("unbalanced-quotes")
+def unbalanced_quotes(source: str, target: str) -> Optional[str]:
+    if not target:
+        return None
+    if target.count('"') % 2:
+        return 'odd number of " quotes'
+    for opening, closing in _QUOTE_PAIRS:
+        if target.count(opening) != target.count(closing):
+            return f"unbalanced {opening}{closing} quotes"
+    return None
+
+
+def _pairs(entry: POEntry) -> Iterator[Tuple[str, str, str]]:
+    """(target key, source, target) for every translatable form of an entry."""
+    if entry.msgid_plural is None:
+        yield "msgstr", entry.msgid, "" if entry.fuzzy else entry.msgstr
+        return
+    forms = max(entry.msgstr_plural, default=0) + 1
+    for index in range(max(forms, 2)):
+        source = entry.msgid if index == 0 else entry.msgid_plural
+        yield f"msgstr[{index}]", source, "" if entry.fuzzy else entry.msgstr_plural.get(index, "")
+
+
+def check_entries(entries: Iterable[POEntry], rules: Optional[Iterable[str]] = None) -> Tuple[int, List[dict]]:
+    """Apply the rules (all by default) to the entries. Returns (entries checked, issues)."""
+    selected = [(name, RULES[name]) for name in (rules or RULES)]
+    checked = 0
+    issues = []
+    for entry in entries:
+        if entry.is_header or entry.obsolete:
+            continue
+        checked += 1
+        for key, source, target in _pairs(entry):
+            for name, check in selected:
+                message = check(source, target)
+                if message:
+                    issues.append({
+                        "line": entry.linenos.get(key, entry.linenos.get("msgid", 0)),
+                        "key": key,
+                        "msgid": source,
+                        "msgstr": target,
+                        "rule": name,
+                        "message": message,
+                    })
+    return checked, issues
+
+
+def check_po(path: str, rules: Optional[Iterable[str]] = None) -> dict:
+    """QA report for one PO file, in a single streaming pass."""
+    started = time.perf_counter()
+    checked, issues = check_entries(read_po(path), rules)
+    return {
+        "path": path,
+        "entries": checked,
+        "issue_count": len(issues),
+        "counts": dict(Counter(issue["rule"] for issue in issues)),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "issues": issues,
+    }
+
+
+def write_qa_report(po_path: str, rules: Optional[Iterable[str]], report_path: str) -> dict:
+    """
+    Check one catalog and write its JSON report atomically. Returns the
+    summary (the report without its issues). Safe to run in a pool process.
+    """
+    report = check_po(po_path, rules)
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, report_path)
+    report.pop("issues")
+    return report
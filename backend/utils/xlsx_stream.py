@@ -0,0 +1,181 @@
+"""
+Write-only XLSX and CSV writers that produce output incrementally.
+
+XlsxStreamWriter builds a minimal SpreadsheetML workbook (one sheet,
+inline strings, no shared-string table) inside a zip archive written with
+data descriptors, so every call hands back the compressed bytes produced
+so far and nothing is held in memory apart from the deflate window.
+"""
+import csv
+import io
+import re
+import zipfile
+from typing import Any, AsyncIterable, AsyncIterator, List, Sequence
+from xml.sax.saxutils import escape
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+class _Sink:
+    """Non-seekable file object collecting what zipfile writes."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data) -> int:
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def _cell(reference: str, value: Any) -> str:
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_RE.sub("", str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class XlsxStreamWriter:
+    """
+    Incremental single-sheet XLSX writer.
+
+        writer = XlsxStreamWriter("Translations")
+        yield writer.start()
+        for row in rows:
+            yield writer.add_row(row)   # often b"" until deflate emits a block
+        yield writer.close()
+    """
+
+    def __init__(self, sheet_name: str = "Sheet1"):
+        self.sheet_name = sheet_name[:31]
+        self.rows = 0
+        self._sink = _Sink()
+        self._zip = None
+        self._sheet = None
+        self._columns: List[str] = []
+
+    def start(self) -> bytes:
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        self._zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(self.sheet_name, {'"': "&quot;"})))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w")
+        self._sheet.write(_SHEET_START.encode("utf-8"))
+        return self._sink.drain()
+
+    def add_row(self, values: Sequence[Any]) -> bytes:
+        self.rows += 1
+        while len(self._columns) < len(values):
+            self._columns.append(_column_name(len(self._columns)))
+        cells = "".join(_cell(f"{self._columns[i]}{self.rows}", value) for i, value in enumerate(values))
+        self._sheet.write(f'<row r="{self.rows}">{cells}</row>'.encode("utf-8"))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._sheet.write(_SHEET_END.encode("utf-8"))
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.drain()
+
+
+async def _batched(rows: AsyncIterable[Sequence[Any]], batch_size: int) -> AsyncIterator[List[Sequence[Any]]]:
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_csv(rows: AsyncIterable[Sequence[Any]], batch_size: int = 500) -> AsyncIterator[bytes]:
+    """Encode rows as UTF-8 CSV (with a BOM so Excel detects the encoding), in batches."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    yield "\ufeff".encode("utf-8")
+    async for batch in _batched(rows, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def stream_xlsx(
+    rows: AsyncIterable[Sequence[Any]],
+    sheet_name: str = "Sheet1",
+    batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    """Encode rows as an XLSX workbook, one chunk per batch of rows."""
+    writer = XlsxStreamWriter(sheet_name)
+    yield writer.start()
+    async for batch in _batched(rows, batch_size):
+        chunk = b"".join(writer.add_row(row) for row in batch)
+        if chunk:
+            yield chunk
+    yield writer.close()
@@ -0,0 +1,80 @@
+"""
+Parse/serialize throughput of backend/utils/po_file.py.
+
+Usage: python benchmarks/po_benchmark.py [path/to/catalog.po] [repeats]
+
+Defaults to the repository's salesplaypos.po. Each stage is run `repeats`
+times and the best run is reported, in MB/s of UTF-8 PO text.
+"""
+import io
+import os
+import re
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+from backend.utils.po_file import dump_po, iter_po, parse_po, write_po
+
+po_file_path = os.path.join(project_root, 'salesplaypos.po')
+repeats = 5
+
+# The regex update_po_content used before the shared parser, for comparison
+LEGACY_RE = re.compile(r'msgid "(.*?)"\nmsgstr "(.*?)"\n', re.DOTALL)
+
+
+def best_of(fn, runs):
+    best = None
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(label, size, seconds, detail=""):
+    mb = size / (1024 * 1024)
+    print(f"{label:<28} {seconds * 1000:8.1f} ms  {mb / seconds:8.1f} MB/s  {detail}")
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else po_file_path
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else repeats
+
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    size = len(content.encode('utf-8'))
+    print(f"{path}: {size / 1024:.0f} KiB, {content.count(chr(10))} lines, best of {runs}\n")
+
+    seconds, entries = best_of(lambda: parse_po(content), runs)
+    report("parse (in memory)", size, seconds, f"{len(entries)} entries")
+
+    def parse_file():
+        with open(path, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in iter_po(f))
+
+    seconds, count = best_of(parse_file, runs)
+    report("parse (streaming file)", size, seconds, f"{count} entries")
+
+    seconds, output = best_of(lambda: dump_po(entries), runs)
+    report("serialize (string)", len(output.encode('utf-8')), seconds)
+
+    def serialize_stream():
+        buffer = io.StringIO()
+        write_po(buffer, entries)
+        return buffer
+
+    seconds, _ = best_of(serialize_stream, runs)
+    report("serialize (streaming)", len(output.encode('utf-8')), seconds)
+
+    seconds, matches = best_of(lambda: sum(1 for _ in LEGACY_RE.finditer(content)), runs)
+    report("legacy regex scan", size, seconds, f"{matches} matches")
+
+    same = parse_po(output) == entries
+    print(f"\nround trip preserves all entries: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Show what differs between two PO catalogs, e.g. the live one and a
+hand-corrected copy.
+
+Usage:
+    python check_issues/diff_catalogs.py salesplaypos.po CORRECTED/salesplaypos.po
+                                         [--kinds changed,whitespace] [--json diff.json]
+
+Prints a summary and one line per change (added, removed, changed or
+whitespace-only). Apply the changes with POST /api/reconcile/{language}.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+from backend.utils.po_diff import CHANGE_KINDS, diff_catalogs
+from backend.utils.po_file import read_po
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two PO catalogs entry by entry.')
+    parser.add_argument('old', help='live catalog')
+    parser.add_argument('new', help='corrected catalog')
+    parser.add_argument('--kinds', help=f"comma-separated subset of: {', '.join(CHANGE_KINDS)}")
+    parser.add_argument('--json', dest='json_path', help='also write the changes as JSON')
+    args = parser.parse_args(argv)
+
+    kinds = set(args.kinds.split(',')) if args.kinds else set(CHANGE_KINDS)
+    if kinds - set(CHANGE_KINDS):
+        parser.error(f"unknown kind(s): {', '.join(sorted(kinds - set(CHANGE_KINDS)))}")
+
+    started = time.perf_counter()
+    changes, unchanged = diff_catalogs(read_po(args.old), read_po(args.new))
+    elapsed = time.perf_counter() - started
+    changes = [change for change in changes if change.kind in kinds]
+
+    for change in changes:
+        label = change.msgid if change.old_msgid is None else f'{change.old_msgid!r} -> {change.msgid!r}'
+        print(f"{change.kind:<10} line {change.line}: {label}")
+        if change.kind in ('changed', 'whitespace'):
+            print(f"           - {change.old!r}\n           + {change.new!r}")
+
+    counts = {kind: sum(change.kind == kind for change in changes) for kind in CHANGE_KINDS if kind in kinds}
+    print(f"\n{unchanged} unchanged, " + ', '.join(f'{count} {kind}' for kind, count in counts.items()) + f" ({elapsed:.2f}s)")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'unchanged': unchanged, 'counts': counts, 'changes': [change.as_dict() for change in changes]},
+                      f, ensure_ascii=False, indent=1)
+        print(f"Changes written to {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
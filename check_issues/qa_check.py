@@ -0,0 +1,95 @@
+"""
+Run the PO QA rules over one or more catalogs in parallel.
+
+Usage:
+    python check_issues/qa_check.py [PO_FILE_OR_LOCALES_DIR ...] [--rules trailing-whitespace,double-space]
+                                    [--report-dir qa_reports] [--workers N] [--strict]
+
+Directories are searched for */LC_MESSAGES/salesplaypos.po; with no
+arguments the backend's locales directory is checked. Each catalog gets a
+JSON report in --report-dir. With --strict the exit status is 1 when any
+issue is found, so the check can gate a compile.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+from backend.utils.po_qa import RULES, write_qa_report
+
+DEFAULT_LOCALES_DIR = os.path.join(project_root, 'backend', 'locales')
+PO_FILE = 'salesplaypos.po'
+
+
+def find_catalogs(paths):
+    catalogs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for lang_code in sorted(os.listdir(path)):
+                po_path = os.path.join(path, lang_code, 'LC_MESSAGES', PO_FILE)
+                if os.path.isfile(po_path):
+                    catalogs.append((lang_code, po_path))
+        else:
+            parent = os.path.dirname(os.path.abspath(path))
+            if os.path.basename(parent) == 'LC_MESSAGES':
+                name = os.path.basename(os.path.dirname(parent))
+            else:
+                name = os.path.splitext(os.path.basename(path))[0]
+            catalogs.append((name, path))
+
+    # Reports are named after the catalogs, so keep the names unique
+    seen = {}
+    unique = []
+    for name, po_path in catalogs:
+        seen[name] = seen.get(name, 0) + 1
+        unique.append((name if seen[name] == 1 else f'{name}-{seen[name]}', po_path))
+    return unique
+
+
+def check_and_report(name, po_path, rules, report_dir):
+    report_path = os.path.join(report_dir, f'{name}.json')
+    report = write_qa_report(po_path, rules, report_path)
+    report['report'] = report_path
+    return name, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check PO catalogs for translation issues.')
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_LOCALES_DIR], help='PO files or locales directories')
+    parser.add_argument('--rules', help=f"comma-separated subset of: {', '.join(RULES)}")
+    parser.add_argument('--report-dir', default='qa_reports', help='where the JSON reports are written')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 when any issue is found')
+    args = parser.parse_args(argv)
+
+    rules = args.rules.split(',') if args.rules else None
+    unknown = sorted(set(rules or ()) - set(RULES))
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(unknown)}")
+
+    catalogs = find_catalogs(args.paths)
+    if not catalogs:
+        print('❌ No catalogs found')
+        sys.exit(1)
+    os.makedirs(args.report_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(check_and_report, name, po_path, rules, args.report_dir) for name, po_path in catalogs]
+        for future in futures:
+            name, report = future.result()
+            total += report['issue_count']
+            counts = ', '.join(f'{rule}: {count}' for rule, count in sorted(report['counts'].items())) or 'clean'
+            print(f"{name}: {report['entries']} entries, {report['issue_count']} issue(s) ({counts}) -> {report['report']}")
+
+    print(f"{'⚠️' if total else '✅'} {total} issue(s) in {len(catalogs)} catalog(s), {time.perf_counter() - started:.2f}s")
+    if args.strict and total:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
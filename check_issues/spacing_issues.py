@@ -1,31 +1,33 @@
-import re
 import os
 import sys
 from datetime import datetime
 
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+from backend.utils.po_file import escape, iter_po
+
 po_file_path     = 'salesplaypos.po'                     
 report_file_path = 'trailing_spaces_report.txt'         
 
-# Regex to match msgid/msgstr lines ending with one or more spaces before the closing quote
-TRAILING_SPACE_RE = re.compile(
-    r'^(?P<key>msg(?:id|str))\s+"(?P<body>.*?)(?P<trail>\s+)"\s*$'
-)
-
 def scan_po_content(po_content):
     """
-    Scan the .po content for trailing spaces in msgid/msgstr lines.
+    Scan the .po content for trailing spaces in msgid/msgstr values.
     Returns a list of dicts with: line_no, key, full_line, body, trail_len.
     """
     findings = []
-    for idx, line in enumerate(po_content.splitlines(), start=1):
-        m = TRAILING_SPACE_RE.match(line)
-        if m:
+    for entry in iter_po(po_content.split('\n')):
+        values = [('msgid', entry.msgid), ('msgstr', entry.msgstr)]
+        values += [(f'msgstr[{index}]', value) for index, value in sorted(entry.msgstr_plural.items())]
+        for key, value in values:
+            body = value.rstrip(' \t')
+            if body == value:
+                continue
             findings.append({
-                'line_no':  idx,
-                'key':       m.group('key'),
-                'full_line': line,
-                'body':      m.group('body'),
-                'trail_len': len(m.group('trail')),
+                'line_no':   entry.linenos.get(key, 0),
+                'key':       key,
+                'full_line': f'{key} "{escape(value)}"',
+                'body':      escape(body),
+                'trail_len': len(value) - len(body),
             })
     return findings
 
@@ -1,6 +1,7 @@
 // Configuration
 const API_BASE = "http://localhost:8000/api";
 const CONNECTION_CHECK_INTERVAL = 30000; // 30 seconds
+const JOB_POLL_INTERVAL = 2000; // 2 seconds
 
 // DOM Elements
 const elements = {
@@ -252,7 +253,21 @@ async function handleGeneratePO() {
 
     try {
         const response = await axios.post(`${API_BASE}/generate-po/${lang}`);
-        setStatusMessage(elements.selectMessage, response.data.message, 'success');
+        setStatusMessage(elements.selectMessage, response.data.message, 'info');
+        const job = await waitForJob(response.data.job_id, (progress) => {
+            const rate = progress.per_second ? ` (${progress.per_second}/s)` : '';
+            setStatusMessage(
+                elements.selectMessage,
+                `Translating: ${progress.processed}/${progress.total} done, ${progress.failed} failed${rate}`,
+                'info'
+            );
+        });
+
+        if (job.status === 'completed') {
+            setStatusMessage(elements.selectMessage, `PO file generated for ${lang}: ${job.processed} strings translated`, 'success');
+        } else {
+            setStatusMessage(elements.selectMessage, `Translation job ${job.status}${job.error ? ': ' + job.error : ''}`, 'error');
+        }
     } catch (error) {
         const msg = error.response?.data?.detail || 'Error generating PO file';
         setStatusMessage(elements.selectMessage, msg, 'error');
@@ -262,6 +277,19 @@ async function handleGeneratePO() {
     }
 }
 
+// Poll a background job until it finishes
+async function waitForJob(jobId, onProgress) {
+    while (true) {
+        const response = await axios.get(`${API_BASE}/jobs/${jobId}`);
+        const job = response.data;
+        if (['completed', 'failed', 'cancelled'].includes(job.status)) {
+            return job;
+        }
+        onProgress(job);
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+    }
+}
+
 async function handleGenerateMO() {
     const lang = elements.languageSelect.value;
     const btn = document.getElementById('mo-btn');